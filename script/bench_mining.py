@@ -0,0 +1,75 @@
+# bench_mining.py
+"""
+Compare the PyDriller and `git log` mining backends on one repository.
+
+Usage:
+    python script/bench_mining.py PATH_OR_URL
+    python script/bench_mining.py --synthetic 100000   # builds a throw-away repo
+"""
+
+import argparse
+import os
+import subprocess  # nosec B404 - only runs git with fixed arguments
+import tempfile
+import time
+
+from mining import BACKENDS, mine_repository
+
+
+def build_synthetic_repo(path, commits: int, authors: int = 2000) -> None:
+    """Create a repository with ``commits`` empty commits via git fast-import."""
+    subprocess.run(["git", "init", "-q", "--bare", str(path)], check=True)  # nosec B603 B607
+    lines = []
+    for i in range(commits):
+        a = i % authors
+        c = (i * 7) % authors
+        when = 1_500_000_000 + i * 60
+        message = f"commit {i}\n".encode()
+        lines.append(f"commit refs/heads/main\nmark :{i + 1}\n".encode())
+        lines.append(f"author Dev {a} <dev{a}@example.com> {when} +0000\n".encode())
+        lines.append(f"committer Dev {c} <dev{c}@example.com> {when} +0000\n".encode())
+        lines.append(f"data {len(message)}\n".encode() + message)
+        if i:
+            lines.append(f"from :{i}\n".encode())
+        lines.append(b"\n")
+    subprocess.run(  # nosec B603 B607
+        ["git", "-C", str(path), "fast-import", "--quiet"], input=b"".join(lines), check=True
+    )
+    subprocess.run(  # nosec B603 B607
+        ["git", "-C", str(path), "symbolic-ref", "HEAD", "refs/heads/main"], check=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("repo", nargs="?", help="repository path or URL")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="benchmark an N-commit repo")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    args = parser.parse_args()
+    if not args.repo and not args.synthetic:
+        parser.error("give a repository or --synthetic N")
+
+    with tempfile.TemporaryDirectory(prefix="bench-mining-") as tmp:
+        repo = args.repo
+        if args.synthetic:
+            repo = os.path.join(tmp, "synthetic.git")
+            start = time.perf_counter()
+            build_synthetic_repo(repo, args.synthetic)
+            print(f"Built {args.synthetic} commits in {time.perf_counter() - start:.1f} s")
+
+        results = {}
+        print(f"{'backend':>10} {'commits':>9} {'identities':>11} {'seconds':>8}")
+        for backend in args.backends:
+            start = time.perf_counter()
+            identities, commits = mine_repository(repo, backend=backend)
+            elapsed = time.perf_counter() - start
+            results[backend] = identities
+            print(f"{backend:>10} {commits:>9} {len(identities):>11} {elapsed:>8.2f}")
+
+        if len(results) > 1:
+            first, *rest = results.values()
+            print("Same identities and stats:", all(other == first for other in rest))
+
+
+if __name__ == "__main__":
+    main()
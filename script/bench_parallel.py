@@ -0,0 +1,59 @@
+# bench_parallel.py
+"""
+Scaling benchmark for parallel pair scoring on project1devs/devs.csv.
+
+Usage: python script/bench_parallel.py [--workers 1 2 4 8] [--repeat 3]
+"""
+
+import argparse
+import csv
+import os
+import time
+
+from identity_table import IdentityTable
+from parallel_scoring import iter_scored_chunks_parallel
+from scoring import chunk_rows
+
+
+def load_devs(path):
+    with open(path, "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile, delimiter=",")
+        next(reader)  # skip header
+        return list(reader)[1:]  # same rows as project1developers.py
+
+
+def run(table, workers, cutoff):
+    rows = []
+    for scores in iter_scored_chunks_parallel(table, cutoff=cutoff, workers=workers):
+        rows.extend(chunk_rows(table, scores))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--devs", default=os.path.join("project1devs", "devs.csv"))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cutoff", type=float, default=None)
+    args = parser.parse_args()
+
+    table = IdentityTable(load_devs(args.devs))
+    n = len(table)
+    print(f"Identities: {n}  pairs: {n * (n - 1) // 2}  CPUs: {os.cpu_count()}")
+
+    reference = None
+    base = None
+    print(f"{'workers':>8} {'best s':>8} {'speedup':>8}  identical")
+    for workers in args.workers:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            rows = run(table, workers, args.cutoff)
+            best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference, base = rows, best
+        print(f"{workers:>8} {best:>8.2f} {base / best:>8.2f}  {rows == reference}")
+
+
+if __name__ == "__main__":
+    main()
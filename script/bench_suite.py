@@ -0,0 +1,181 @@
+# bench_suite.py
+"""
+Stage benchmarks of the dedup pipeline on synthetic identities.
+
+Usage:
+    python script/bench_suite.py [--sizes 1000 10000 100000] [--output bench.json]
+                                 [--baseline old.json --tolerance 0.25]
+
+Stages: normalization (process() via IdentityTable), blocking, pair
+scoring (all pairs up to --all-pairs-limit identities, and blocked
+candidates), thresholding (writing the t=0.8 file), improved_rule and
+clustering. Results are saved as JSON; with --baseline, stages that got
+slower than the tolerance are reported and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess  # nosec B404 - only asks git for the current commit
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from blocking import BlockingIndex
+from clustering import UnionFind, cluster_ids
+from dedupe_utils import improved_rule_vectorized
+from identity_table import IdentityTable
+from pair_frame import IdentityCodes, pair_frame
+from pair_writer import max_score_key, write_pair_files
+from scoring import iter_scored_chunks, score_batch
+from synthetic_identities import generate_identities
+from tok_sim import tok_sim
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+ALL_PAIRS_LIMIT = 10_000
+RULE_ROWS = 1_000_000
+T = 0.8
+
+
+class Timer:
+    """Wall and CPU seconds of a with-block."""
+
+    def __enter__(self):
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+
+
+def run_size(n: int, seed: int, all_pairs_limit: int):
+    """Benchmark every stage on ``n`` synthetic identities; returns result dicts."""
+    results = []
+
+    def record(stage, timer, items):
+        results.append(
+            {
+                "size": n,
+                "stage": stage,
+                "wall_s": round(timer.wall, 4),
+                "cpu_s": round(timer.cpu, 4),
+                "items": int(items),
+            }
+        )
+        print(f"{n:>8} {stage:>18} {timer.wall:>9.3f} {int(items):>12}")
+
+    devs, _ = generate_identities(n, seed)
+
+    with Timer() as timer:
+        table = IdentityTable(devs)
+    record("normalization", timer, len(table))
+
+    with Timer() as timer:
+        left, right = BlockingIndex(table).candidate_arrays()  # default block cap
+    record("blocking", timer, len(left))
+
+    if n <= all_pairs_limit:
+        with Timer() as timer:
+            scored = sum(len(s["left"]) for s in iter_scored_chunks(table))
+        record("scoring_all_pairs", timer, scored)
+
+    with Timer() as timer:
+        chunks = list(iter_scored_chunks(table, (left, right)))
+    record("scoring_blocked", timer, len(left))
+
+    with tempfile.TemporaryDirectory(prefix="bench-suite-") as tmp:
+        with Timer() as timer:
+            _, kept = write_pair_files(table, iter(chunks), T, os.path.join(tmp, "t.csv"))
+        record("thresholding", timer, kept)
+
+    if chunks:
+        scores = {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+    else:  # no candidate pairs (tiny sizes): the empty columns score_batch() gives
+        scores = score_batch(table, left, right)
+    del chunks
+    rows = min(RULE_ROWS, len(left))
+    frame = pair_frame(IdentityCodes.from_table(table), scores, np.arange(len(left)) < rows)
+    with Timer() as timer:
+        frame["tok_sim"] = tok_sim(frame["name_1"], frame["name_2"], dtype=np.float64)
+    record("tok_sim", timer, rows)
+    with Timer() as timer:
+        improved_rule_vectorized(frame)
+    record("improved_rule", timer, rows)
+
+    accepted = max_score_key(scores) >= T
+    with Timer() as timer:
+        forest = UnionFind(n)
+        forest.union_many(scores["left"][accepted], scores["right"][accepted])
+        clusters = cluster_ids(forest.roots())
+    record("clustering", timer, clusters.max(initial=-1) + 1)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(results, baseline, tolerance: float):
+    """(size, stage, old s, new s) of every stage slower than baseline by > tolerance."""
+    old = {(r["size"], r["stage"]): r["wall_s"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        before = old.get((r["size"], r["stage"]))
+        if before and r["wall_s"] > before * (1 + tolerance):
+            regressions.append((r["size"], r["stage"], before, r["wall_s"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--all-pairs-limit", type=int, default=ALL_PAIRS_LIMIT)
+    parser.add_argument(
+        "--output", default=os.path.join("reports", "bench", "bench_suite.json"), metavar="JSON"
+    )
+    parser.add_argument("--baseline", metavar="JSON", help="earlier results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'stage':>18} {'seconds':>9} {'items':>12}")
+    results = []
+    for n in args.sizes:
+        results.extend(run_size(n, args.seed, args.all_pairs_limit))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=1)
+    print("Wrote:", args.output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for size, stage, before, after in regressions:
+            print(f"REGRESSION {stage} at {size}: {before:.3f} s -> {after:.3f} s")
+        if regressions:
+            sys.exit(1)
+        print(f"No stage slower than baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# blocking.py
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+from config import DEFAULT_MAX_BLOCK_SIZE
+from identity_table import IdentityTable
+from initials_index import index_for
+
+# Key families used to build the inverted indexes.
+# "domain" is available but not on by default: shared providers such as
+# gmail.com put hundreds of unrelated developers into one block.
+# "initials" pairs identities for which any c4..c7 check holds (see
+# initials_index.py); it is not an inverted index but is used the same way.
+KEY_FAMILIES = (
+    "prefix",
+    "domain",
+    "last",
+    "initial_last",
+    "name_qgram",
+    "prefix_qgram",
+    "first_qgram",
+    "initials",
+)
+DEFAULT_FAMILIES = (
+    "prefix",
+    "last",
+    "initial_last",
+    "name_qgram",
+    "prefix_qgram",
+    "first_qgram",
+)
+DEFAULT_Q = 3
+
+
+def qgrams(s: str, q: int = DEFAULT_Q) -> set[str]:
+    """
+    Character q-grams of ``s``; strings shorter than q are their own gram.
+
+    Short strings (at most 2*q characters) also get their bigrams, since a
+    single edit removes most of their q-grams ("maks" vs "markus").
+    """
+    if len(s) < q:
+        grams = {s}
+    else:
+        grams = {s[i : i + q] for i in range(len(s) - q + 1)}
+    if q > 2 and len(s) <= 2 * q:
+        grams.update("~" + s[i : i + 2] for i in range(len(s) - 1))
+    return grams
+
+
+def blocking_keys(table: IdentityTable, i: int, families=DEFAULT_FAMILIES, q: int = DEFAULT_Q):
+    """All blocking keys of identity ``i``, each tagged with its family."""
+    keys = set()
+    prefix = table.prefixes[i].casefold()
+    last = table.lasts[i]
+    if "prefix" in families:
+        keys.add("prefix:" + prefix)
+    if "domain" in families:
+        email = table.emails[i]
+        if "@" in email:
+            keys.add("domain:" + email.split("@", 1)[1].casefold())
+    if "last" in families and last:
+        keys.add("last:" + last)
+    if "initial_last" in families and last:
+        keys.add("initial_last:" + table.names[i][:1] + " " + last)
+    if "name_qgram" in families:
+        keys.update("name:" + g for g in qgrams(table.names[i], q))
+    if "prefix_qgram" in families:
+        keys.update("prefix_q:" + g for g in qgrams(prefix, q))
+    if "first_qgram" in families:
+        keys.update("first:" + g for g in qgrams(table.firsts[i], q))
+    return keys
+
+
+class BlockingIndex:
+    """
+    Inverted indexes (blocking key -> identity ids) over an IdentityTable.
+
+    Only identities that share at least one key become candidate pairs.
+    Blocks larger than ``max_block_size`` are skipped, since a key shared by
+    that many identities carries almost no signal and would bring back the
+    quadratic blow-up: uncapped, blocks grow with the corpus and so does the
+    share of all pairs they produce. ``None`` keeps every block.
+    """
+
+    def __init__(
+        self,
+        table: IdentityTable,
+        families=DEFAULT_FAMILIES,
+        q: int = DEFAULT_Q,
+        max_block_size: int | None = DEFAULT_MAX_BLOCK_SIZE,
+    ):
+        unknown = set(families) - set(KEY_FAMILIES)
+        if unknown:
+            raise ValueError(f"Unknown blocking key families: {sorted(unknown)}")
+        self.table = table
+        self.families = tuple(families)
+        self.q = q
+        self.max_block_size = max_block_size
+        self.blocks: dict[str, list[int]] = defaultdict(list)
+        for i in range(len(table)):
+            for key in blocking_keys(table, i, self.families, q):
+                self.blocks[key].append(i)
+        self.initials = index_for(table) if "initials" in self.families else None
+
+    def skipped_blocks(self) -> list[str]:
+        if self.max_block_size is None:
+            return []
+        return [k for k, ids in self.blocks.items() if len(ids) > self.max_block_size]
+
+    def candidate_arrays(self):
+        """Sorted, distinct (left, right) id arrays with left < right, in combinations() order."""
+        n = len(self.table)
+        codes = []
+        for ids in self.blocks.values():
+            if len(ids) < 2:
+                continue
+            if self.max_block_size is not None and len(ids) > self.max_block_size:
+                continue
+            ids = np.asarray(ids, dtype=np.int64)  # ascending: appended in id order
+            a, b = np.triu_indices(len(ids), 1)
+            codes.append(ids[a] * n + ids[b])
+        if self.initials is not None:
+            pairs = self.initials.candidate_pairs(self.max_block_size)
+            codes.append(np.asarray([a * n + b for a, b in pairs], dtype=np.int64))
+        return unique_pairs(codes, n)
+
+    def candidate_pairs(self) -> list[tuple[int, int]]:
+        """Sorted (a, b) id pairs with a < b, same order as combinations()."""
+        left, right = self.candidate_arrays()
+        return list(zip(left.tolist(), right.tolist()))
+
+
+def unique_pairs(codes, n: int):
+    """Sorted, distinct (left, right) arrays from a list of a*n + b code arrays."""
+    codes = np.sort(np.concatenate(codes or [np.zeros(0, dtype=np.int64)]))
+    # sort and compare neighbours: np.unique()'s hash table is much slower here
+    codes = codes[np.r_[True, codes[1:] != codes[:-1]][: len(codes)]]
+    return codes // n, codes % n
+
+
+def passes_threshold(row, t: float) -> bool:
+    """Same c1/c2/c3 check used to build the devs_similarity_t=*.csv files."""
+    c1, c2, c31, c32 = row[4], row[5], row[6], row[7]
+    return c1 >= t or c2 >= t or (c31 >= t and c32 >= t)
+
+
+def recall_report(table: IdentityTable, candidates, sim, t: float, labeled_tp=()):
+    """
+    Compare candidate pairs against the full combinations() enumeration.
+
+    ``labeled_tp`` is an iterable of (name_1, email_1, name_2, email_2) rows
+    labelled TP; they are matched order-independently.
+    Returns a dict with candidate/total counts, the reduction ratio and the
+    recall on threshold matches and on labelled TP pairs.
+    """
+    from identity_table import score_pair
+
+    n = len(table)
+    total = n * (n - 1) // 2
+    candidate_set = set(candidates)
+
+    matches = missed = 0
+    missed_pairs = []
+    for a, b in combinations(range(n), 2):
+        if passes_threshold(score_pair(table, a, b, sim), t):
+            matches += 1
+            if (a, b) not in candidate_set:
+                missed += 1
+                missed_pairs.append((a, b))
+
+    ids = {(table.raw_names[i], table.emails[i]): i for i in range(n)}
+    tp_found = tp_total = tp_missing_ids = 0
+    for name_1, email_1, name_2, email_2 in labeled_tp:
+        a, b = ids.get((name_1, email_1)), ids.get((name_2, email_2))
+        if a is None or b is None:
+            tp_missing_ids += 1
+            continue
+        tp_total += 1
+        if (min(a, b), max(a, b)) in candidate_set:
+            tp_found += 1
+
+    return {
+        "identities": n,
+        "total_pairs": total,
+        "candidate_pairs": len(candidate_set),
+        "reduction_ratio": 1 - len(candidate_set) / total if total else 0.0,
+        "threshold": t,
+        "threshold_matches": matches,
+        "threshold_recall": (matches - missed) / matches if matches else 1.0,
+        "missed_pairs": missed_pairs,
+        "labeled_tp": tp_total,
+        "labeled_tp_recall": tp_found / tp_total if tp_total else 1.0,
+        "labeled_tp_not_in_table": tp_missing_ids,
+    }
+
+
+def main():
+    """
+    Print a recall report of the default blocking on project1devs/devs.csv,
+    with the default block cap and without one, so the cap's recall cost shows.
+    """
+    import csv
+    import os
+
+    import pandas as pd
+    from Levenshtein import ratio as sim
+
+    devs_csv = os.path.join("project1devs", "devs.csv")
+    labeled_xlsx = os.path.join("project1devs", "devs_similarity_t=0.72_labeled.xlsx")
+
+    with open(devs_csv, "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile, delimiter=",")
+        next(reader)  # skip header
+        devs = list(reader)[1:]  # same rows as project1developers.py
+    table = IdentityTable(devs)
+
+    labeled_tp = []
+    if os.path.exists(labeled_xlsx):
+        lab = pd.read_excel(labeled_xlsx, engine="openpyxl")
+        is_tp = lab["label"].astype(str).str.upper().str.strip().eq("TP")
+        cols = ["name_1", "email_1", "name_2", "email_2"]
+        labeled_tp = lab.loc[is_tp, cols].astype(str).values.tolist()
+
+    for cap in (DEFAULT_MAX_BLOCK_SIZE, None):
+        index = BlockingIndex(table, max_block_size=cap)
+        candidates = index.candidate_pairs()
+        for t in (0.65, 0.72, 0.8):
+            report = recall_report(table, candidates, sim, t, labeled_tp)
+            missed = report.pop("missed_pairs")
+            print(f"--- t={t}, max_block_size={cap} ({len(index.skipped_blocks())} skipped) ---")
+            for key, value in report.items():
+                print(f"{key:25}: {value}")
+            for a, b in missed[:10]:
+                print("  missed:", devs[a], devs[b])
+            if len(missed) > 10:
+                print(f"  ... and {len(missed) - 10} more")
+
+
+if __name__ == "__main__":
+    main()
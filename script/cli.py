@@ -0,0 +1,356 @@
+# cli.py
+"""
+Command-line interface to the dedup pipeline (see pipeline.py).
+
+Usage:
+    python script/cli.py mine [--repo URL ...] [--backend gitlog]
+    python script/cli.py score [--thresholds 0.72 0.8] [--blocking] [--exact-prepass]
+    python script/cli.py threshold [--labels XLSX] [--thresholds T ...]
+    python script/cli.py evaluate [--labels XLSX]
+    python script/cli.py cluster [--pairs devs_similarity_t=0.8.csv] [--exact-matches]
+
+Only argparse is imported up front; each subcommand imports what it needs,
+so --help and argument errors come back without loading pandas or numpy.
+"""
+
+import argparse
+import os
+
+from config import (
+    BACKENDS,
+    DEFAULT_LSH_BANDS,
+    DEFAULT_LSH_ROWS,
+    DEFAULT_MAX_BLOCK_SIZE,
+    DEFAULT_THRESHOLD,
+    LABELED_XLSX,
+    OUTPUT_DIR,
+    REPO_URL,
+)
+
+
+def add_mining_arguments(parser) -> None:
+    parser.add_argument(
+        "--repo",
+        action="append",
+        default=[],
+        metavar="URL",
+        help=f"repository to mine (repeatable; default: {REPO_URL})",
+    )
+    parser.add_argument(
+        "--repos-file",
+        metavar="PATH",
+        help="text file with one repository URL/path per line",
+    )
+    parser.add_argument(
+        "--clone-cache",
+        metavar="DIR",
+        help="keep bare clones here and only fetch on later runs "
+        "(default: clones/ in the output directory)",
+    )
+    parser.add_argument(
+        "--mine-workers",
+        type=int,
+        default=8,
+        metavar="N",
+        help="mine up to N repositories at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="pydriller",
+        help="identity extractor: PyDriller or one streamed `git log` (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        dest="checkpoint",
+        action="store_false",
+        help="re-mine the whole history instead of resuming from the last checkpoint",
+    )
+
+
+def parse_lsh(text: str) -> tuple[int, int]:
+    """ "16x2" -> (16, 2)"""
+    bands, _, rows = text.partition("x")
+    try:
+        return int(bands), int(rows)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected BANDSxROWS, e.g. 16x2: {text!r}") from None
+
+
+def add_scoring_arguments(parser) -> None:
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="only score candidate pairs that share a blocking key (see blocking.py)",
+    )
+    parser.add_argument(
+        "--max-block-size",
+        type=int,
+        default=DEFAULT_MAX_BLOCK_SIZE,
+        metavar="N",
+        help="with --blocking, skip keys shared by more than N identities (default: "
+        "%(default)s; 0 keeps every block, and the candidates grow quadratically)",
+    )
+    parser.add_argument(
+        "--lsh",
+        nargs="?",
+        type=parse_lsh,
+        const=(DEFAULT_LSH_BANDS, DEFAULT_LSH_ROWS),
+        metavar="BxR",
+        help="score candidate pairs found by MinHash/LSH on names and email prefixes "
+        f"with B bands of R rows (default: {DEFAULT_LSH_BANDS}x{DEFAULT_LSH_ROWS}; "
+        "with --blocking, both candidate sets; see minhash_lsh.py)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only score pairs involving identities added since the last run "
+        "and patch the existing devs_similarity*.csv files",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        metavar="T",
+        help="score once and write devs_similarity_t=<T>.csv for every T "
+        f"(default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="score pairs in N worker processes (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--no-full-dump",
+        dest="full_dump",
+        action="store_false",
+        help="do not write the unfiltered devs_similarity.csv (much faster on large corpora)",
+    )
+    parser.add_argument(
+        "--pair-store",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="also write every scored pair to a columnar, memory-mapped store "
+        "(default DIR: pairs/ in the output directory; see pair_store.py)",
+    )
+    parser.add_argument(
+        "--exact-prepass",
+        action="store_true",
+        help="match identities sharing an exact email, GitHub noreply id/login or full name "
+        "first (devs_exact_matches.csv) and only score one representative per group",
+    )
+    parser.add_argument(
+        "--sim-cache",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="reuse Levenshtein scores of candidate pairs (--blocking/--lsh/--incremental, "
+        "serial scoring) from an SQLite cache and report its hit rate (default PATH: "
+        "state/sim_cache.sqlite in the output directory; see sim_cache.py)",
+    )
+
+
+def resolve_output_paths(args, output_dir) -> None:
+    """Point path options left at their default (None, or "" for a bare flag) into output_dir."""
+    defaults = {
+        "clone_cache": os.path.join(output_dir, "clones"),
+        "pair_store": os.path.join(output_dir, "pairs"),
+        "sim_cache": os.path.join(output_dir, "state", "sim_cache.sqlite"),
+    }
+    for option, path in defaults.items():
+        value = getattr(args, option, None)
+        if value == "" or (value is None and option == "clone_cache"):
+            setattr(args, option, path)
+
+
+def repo_list(args) -> list[str]:
+    repos = list(args.repo)
+    if args.repos_file:
+        from mining import read_repo_list
+
+        repos.extend(read_repo_list(args.repos_file))
+    return repos or [REPO_URL]
+
+
+def cmd_mine(args, metrics) -> None:
+    import pipeline
+
+    pipeline.mine(
+        repo_list(args),
+        args.output_dir,
+        args.checkpoint,
+        args.clone_cache,
+        args.mine_workers,
+        args.backend,
+        metrics,
+    )
+
+
+def cmd_score(args, metrics) -> None:
+    import pipeline
+
+    devs = pipeline.load_devs(args.output_dir, metrics)
+    if args.exact_prepass:
+        devs, _ = pipeline.exact_prepass(devs, args.output_dir, metrics)
+    pipeline.score(
+        devs,
+        args.output_dir,
+        args.thresholds,
+        blocking=args.blocking,
+        workers=args.workers,
+        full_dump=args.full_dump,
+        pair_store=args.pair_store,
+        incremental=args.incremental,
+        metrics=metrics,
+        sim_cache=args.sim_cache,
+        lsh=args.lsh,
+        exact_prepass=args.exact_prepass,
+        max_block_size=args.max_block_size or None,
+    )
+
+
+def cmd_threshold(args, metrics) -> None:
+    import pipeline
+
+    pipeline.sweep(args.thresholds, args.labels, args.output_dir, metrics)
+
+
+def cmd_evaluate(args, metrics) -> None:
+    import pipeline
+    from score_improved_rule import disagreements, print_evaluation
+
+    result, df = pipeline.evaluate(args.labels, metrics)
+    print_evaluation(result)
+    if args.disagreements:
+        disagreements(df).to_excel(args.disagreements, index=False)
+        print("Wrote:", args.disagreements)
+
+
+def cmd_cluster(args, metrics) -> None:
+    import pipeline
+
+    devs = pipeline.load_devs(args.output_dir, metrics)
+    pairs = args.pairs or pipeline.threshold_path(args.output_dir, DEFAULT_THRESHOLD)
+    exact = args.exact_matches
+    if exact == "":
+        exact = os.path.join(args.output_dir, "devs_exact_matches.csv")
+    weights = pipeline.commit_weights(devs, args.output_dir)
+    pipeline.cluster(
+        devs,
+        pairs,
+        args.output_dir,
+        weights=weights,
+        accept=args.accept,
+        metrics=metrics,
+        exact_matches=exact,
+        pair_store=args.pair_store,
+        threshold=args.threshold,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--output-dir",
+        default=OUTPUT_DIR,
+        metavar="DIR",
+        help="where devs.csv and the pair files live (default: %(default)s)",
+    )
+    common.add_argument(
+        "--metrics",
+        metavar="JSON",
+        help="write per-stage timings, peak memory and counts here",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Mine developers and apply the Bird heuristic."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    mine = commands.add_parser(
+        "mine", parents=[common], help="mine repositories into devs.csv (+ provenance, activity)"
+    )
+    add_mining_arguments(mine)
+    mine.set_defaults(func=cmd_mine)
+
+    score = commands.add_parser(
+        "score", parents=[common], help="score the pairs of devs.csv and write the pair files"
+    )
+    add_scoring_arguments(score)
+    score.set_defaults(func=cmd_score)
+
+    threshold = commands.add_parser(
+        "threshold",
+        parents=[common],
+        help="precision/recall/F1 per threshold on the labelled pairs",
+    )
+    threshold.add_argument("--labels", default=LABELED_XLSX, metavar="XLSX")
+    threshold.add_argument(
+        "--thresholds", type=float, nargs="+", metavar="T", help="default: 0.70 to 1.00 by 0.02"
+    )
+    threshold.set_defaults(func=cmd_threshold)
+
+    evaluate = commands.add_parser(
+        "evaluate", parents=[common], help="score improved_rule against the labelled pairs"
+    )
+    evaluate.add_argument("--labels", default=LABELED_XLSX, metavar="XLSX")
+    evaluate.add_argument(
+        "--disagreements", metavar="XLSX", help="write the pairs the rule gets wrong here"
+    )
+    evaluate.set_defaults(func=cmd_evaluate)
+
+    cluster = commands.add_parser(
+        "cluster", parents=[common], help="group identities linked by accepted pairs into people"
+    )
+    cluster.add_argument(
+        "--pairs",
+        metavar="CSV",
+        help=f"pair file (default: devs_similarity_t={DEFAULT_THRESHOLD}.csv in --output-dir)",
+    )
+    cluster.add_argument(
+        "--accept",
+        metavar="COLUMN",
+        help="only use pairs whose COLUMN is TP/True/1 (default: every pair in the file)",
+    )
+    cluster.add_argument(
+        "--exact-matches",
+        nargs="?",
+        const="",
+        metavar="CSV",
+        help="also link the pairs of an exact-match file, as written by score "
+        "--exact-prepass (default CSV: devs_exact_matches.csv in --output-dir)",
+    )
+    cluster.add_argument(
+        "--pair-store",
+        metavar="DIR",
+        help="read the pairs passing --threshold from this pair store (written by score "
+        "--pair-store) instead of parsing --pairs (ignored with --accept)",
+    )
+    cluster.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        metavar="T",
+        help="threshold for --pair-store pairs (default: %(default)s)",
+    )
+    cluster.set_defaults(func=cmd_cluster)
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    resolve_output_paths(args, args.output_dir)
+    from metrics import StageMetrics
+
+    metrics = StageMetrics()
+    args.func(args, metrics)
+    if args.metrics:
+        metrics.write_json(args.metrics)
+        print("Wrote:", args.metrics)
+
+
+if __name__ == "__main__":
+    main()
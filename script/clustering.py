@@ -0,0 +1,250 @@
+# clustering.py
+"""
+Group identities into people: connected components of the accepted pairs.
+
+Usage:
+    python script/clustering.py [--pairs devs_similarity_t=0.8.csv] [--accept rule_pred]
+"""
+
+import argparse
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+PAIR_KEY_COLUMNS = ["name_1", "email_1", "name_2", "email_2"]
+DEFAULT_CHUNK_SIZE = 1_000_000
+ACCEPTED_VALUES = ("TP", "TRUE", "1")
+
+
+class UnionFind:
+    """
+    Array-based union-find over identity ids 0..n-1. union() uses path
+    compression and union by rank. union_many() merges a whole batch of
+    edges with numpy and hooks by smallest root id instead: a batch needs
+    one fixed direction per edge so simultaneous hooks cannot form a cycle,
+    and every round ends fully compressed, so trees stay flat without rank.
+    Memory is two arrays of length n, whatever the number of edges.
+    """
+
+    def __init__(self, n: int):
+        self.parent = np.arange(n, dtype=np.int64)
+        self.rank = np.zeros(n, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:  # path compression
+            parent[x], x = root, parent[x]
+        return int(root)
+
+    def union(self, a: int, b: int) -> int:
+        """Merge the sets of ``a`` and ``b``; returns the new root."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.rank[ra] < self.rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if self.rank[ra] == self.rank[rb]:
+            self.rank[ra] += 1
+        return ra
+
+    def compress(self) -> None:
+        """Point every id straight at its root (pointer jumping)."""
+        parent = self.parent
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                return
+            parent[:] = grand
+
+    def union_many(self, left, right) -> None:
+        """
+        Merge every edge (left[i], right[i]).
+
+        Each round hooks the larger root of every still-split edge under the
+        smallest root it is linked to, then compresses; the number of rounds
+        is logarithmic in the component size, each round is O(n + edges).
+        Afterwards every tree has height <= 1, and the rank of every root
+        with members is raised to at least 1, so rank stays an upper bound
+        on height for later union() calls.
+        """
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        self.compress()
+        while len(left):
+            ra, rb = self.parent[left], self.parent[right]
+            split = ra != rb
+            left, right, ra, rb = left[split], right[split], ra[split], rb[split]
+            if not len(left):
+                break
+            high, low = np.maximum(ra, rb), np.minimum(ra, rb)
+            np.minimum.at(self.parent, high, low)  # roots only, so no cycles
+            self.compress()
+        members = self.parent[self.parent != np.arange(len(self.parent))]
+        self.rank[members] = np.maximum(self.rank[members], 1)
+
+    def roots(self) -> np.ndarray:
+        self.compress()
+        return self.parent.copy()
+
+
+def cluster_ids(roots) -> np.ndarray:
+    """Number components 0..k-1 in order of their smallest identity id."""
+    _, first, inverse = np.unique(roots, return_index=True, return_inverse=True)
+    order = np.empty(len(first), dtype=np.int64)
+    order[np.argsort(first, kind="stable")] = np.arange(len(first))
+    return order[inverse.reshape(-1)]
+
+
+def identity_index(devs) -> pd.MultiIndex:
+    """(name, email) -> identity id lookup for ``devs``."""
+    return pd.MultiIndex.from_tuples([tuple(dev) for dev in devs], names=["name", "email"])
+
+
+def accepted_mask(column) -> np.ndarray:
+    """Rows whose accept column says "match" (True, "TP", 1)."""
+    values = column.astype(str).str.upper().str.strip()
+    return values.isin(ACCEPTED_VALUES).to_numpy()
+
+
+def pair_ids(index: pd.MultiIndex, chunk, accept=None):
+    """(left ids, right ids) of the accepted pairs in a pair DataFrame chunk."""
+    if accept is not None:
+        chunk = chunk[accepted_mask(chunk[accept])]
+    cols = chunk[PAIR_KEY_COLUMNS].astype(str)
+    left = index.get_indexer(pd.MultiIndex.from_arrays([cols["name_1"], cols["email_1"]]))
+    right = index.get_indexer(pd.MultiIndex.from_arrays([cols["name_2"], cols["email_2"]]))
+    known = (left >= 0) & (right >= 0)  # pairs of identities not in ``devs`` are ignored
+    return left[known], right[known]
+
+
+def store_pair_ids(devs, store, t: float, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    (left ids, right ids) into ``devs`` of the pairs of a pair_store.PairStore
+    that pass the thresholding check at ``t``, chunk by chunk. Only the
+    left/right/c1..c3.2 columns are read; the store's identities are
+    matched to ``devs`` by (name, email).
+    """
+    from pair_writer import threshold_mask
+    from scoring import SCORE_COLUMNS
+
+    ids = identity_index(devs).get_indexer(pd.MultiIndex.from_arrays([store.names, store.emails]))
+    for start in range(0, len(store), chunk_size):
+        rows = slice(start, start + chunk_size)
+        keep = threshold_mask({c: store.column(c)[rows] for c in SCORE_COLUMNS}, t)
+        left = ids[store.column("left")[rows][keep]]
+        right = ids[store.column("right")[rows][keep]]
+        known = (left >= 0) & (right >= 0)
+        yield left[known], right[known]
+
+
+def cluster_pairs(devs, pair_chunks, accept=None, linked_chunks=(), id_chunks=()) -> np.ndarray:
+    """
+    Cluster id of every identity in ``devs`` given the accepted pairs, read
+    chunk by chunk from ``pair_chunks`` (DataFrames with name_1/email_1/
+    name_2/email_2 and, if ``accept`` is set, that yes/no column).
+    Pairs in ``linked_chunks`` (e.g. devs_exact_matches.csv) are always
+    accepted, and so are the (left ids, right ids) of ``id_chunks`` (e.g.
+    store_pair_ids()).
+    """
+    index = identity_index(devs)
+    forest = UnionFind(len(index))
+    for chunk in pair_chunks:
+        forest.union_many(*pair_ids(index, chunk, accept))
+    for left, right in id_chunks:
+        forest.union_many(left, right)
+    for chunk in linked_chunks:
+        forest.union_many(*pair_ids(index, chunk))
+    return cluster_ids(forest.roots())
+
+
+def read_pair_chunks(path, accept=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    usecols = PAIR_KEY_COLUMNS + ([accept] if accept else [])
+    if str(path).endswith(".xlsx"):
+        yield pd.read_excel(path, engine="openpyxl", usecols=usecols, dtype=str)
+        return
+    yield from pd.read_csv(
+        path, usecols=usecols, dtype=str, keep_default_na=False, chunksize=chunk_size
+    )
+
+
+def canonical_identities(devs, clusters, weights=None) -> pd.DataFrame:
+    """
+    Canonical name and email per cluster: the most frequent one among its
+    identities (weighted by ``weights``, e.g. commit counts), ties broken
+    alphabetically. Columns: cluster_id, name, email, size.
+    """
+    frame = pd.DataFrame(devs, columns=["name", "email"])
+    frame["cluster_id"] = clusters
+    frame["weight"] = 1 if weights is None else weights
+
+    def most_frequent(column):
+        totals = frame.groupby(["cluster_id", column], sort=False)["weight"].sum().reset_index()
+        totals = totals.sort_values(
+            ["cluster_id", "weight", column], ascending=[True, False, True], kind="stable"
+        )
+        return totals.drop_duplicates("cluster_id").set_index("cluster_id")[column]
+
+    result = pd.DataFrame({"name": most_frequent("name"), "email": most_frequent("email")})
+    result["size"] = frame.groupby("cluster_id").size()
+    return result.sort_index().reset_index()
+
+
+def write_clusters(output_dir, devs, clusters, weights=None):
+    """Write devs_clusters.csv and devs_cluster_canonical.csv; returns their paths."""
+    clusters_path = os.path.join(output_dir, "devs_clusters.csv")
+    with open(clusters_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile, delimiter=",", quotechar='"')
+        writer.writerow(["name", "email", "cluster_id"])
+        writer.writerows([*dev, cluster] for dev, cluster in zip(devs, clusters.tolist()))
+    canonical_path = os.path.join(output_dir, "devs_cluster_canonical.csv")
+    canonical_identities(devs, clusters, weights).to_csv(canonical_path, index=False)
+    return clusters_path, canonical_path
+
+
+def read_commit_weights(activity_csv, devs):
+    """Commit count per identity of ``devs`` from devs_activity.csv (1 if missing)."""
+    activity = pd.read_csv(activity_csv, dtype={"name": str, "email": str}, keep_default_na=False)
+    counts = pd.Series(
+        activity["commits"].to_numpy(), index=identity_index(activity[["name", "email"]].values)
+    )
+    return counts.reindex(identity_index(devs)).fillna(1).to_numpy()
+
+
+def main():
+    from incremental import read_devs
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--devs", default=os.path.join("project1devs", "devs.csv"))
+    parser.add_argument(
+        "--pairs", default=os.path.join("project1devs", "devs_similarity_t=0.8.csv")
+    )
+    parser.add_argument(
+        "--accept",
+        metavar="COLUMN",
+        help="only use pairs whose COLUMN is TP/True/1 (default: every pair in the file)",
+    )
+    parser.add_argument("--output-dir", default="project1devs")
+    args = parser.parse_args()
+
+    devs = read_devs(args.devs)
+    clusters = cluster_pairs(devs, read_pair_chunks(args.pairs, args.accept), args.accept)
+    activity_csv = os.path.join(os.path.dirname(args.devs), "devs_activity.csv")
+    weights = read_commit_weights(activity_csv, devs) if os.path.exists(activity_csv) else None
+    paths = write_clusters(args.output_dir, devs, clusters, weights)
+    sizes = np.bincount(clusters)
+    print(f"Identities: {len(devs)}  clusters: {len(sizes)}  largest: {sizes.max(initial=0)}")
+    for path in paths:
+        print("Wrote:", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+# config.py
+"""Default locations shared by the pipeline, the CLI and the analysis scripts."""
+
+import os
+
+REPO_URL = "https://github.com/public-apis/public-apis"
+OUTPUT_DIR = "project1devs"
+DEFAULT_THRESHOLD = 0.8
+# identity extractors of mining.py: PyDriller per commit, or one streamed `git log`
+BACKENDS = ("pydriller", "gitlog")
+LABELED_XLSX = os.path.join(OUTPUT_DIR, "devs_similarity_t=0.72_labeled.xlsx")
+LABEL_CACHE_DIR = os.path.join(OUTPUT_DIR, "state", "label_cache")
+# MinHash/LSH candidate search (minhash_lsh.py): bands x rows per band
+DEFAULT_LSH_BANDS = 16
+DEFAULT_LSH_ROWS = 2
+# blocking keys shared by more identities than this are skipped (blocking.py)
+DEFAULT_MAX_BLOCK_SIZE = 50
+SIM_CACHE_PATH = os.path.join(OUTPUT_DIR, "state", "sim_cache.sqlite")
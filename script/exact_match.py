@@ -0,0 +1,103 @@
+# exact_match.py
+"""
+Exact-key pre-pass: identities that share a key are the same person.
+
+Before the fuzzy stage, identities are grouped with hash maps by
+    email          the whole address, casefolded
+    noreply_id     the numeric GitHub id of NNN+login@users.noreply.github.com
+    noreply_login  the login of a GitHub noreply address (with or without id)
+    name           the process()-normalized name, when it has a first and a
+                   last name ("Daniel" alone is too common to decide anything)
+Each group is linked to its first identity and emitted directly as a match
+with its reason; the connected groups then collapse to one representative,
+so the quadratic fuzzy stage only sees the representatives.
+"""
+
+import csv
+import os
+import re
+
+import numpy as np
+from clustering import UnionFind
+from identity_table import IdentityTable
+
+EXACT_KEYS = ("email", "noreply_id", "noreply_login", "name")
+MATCH_COLUMNS = ["name_1", "email_1", "name_2", "email_2", "match_reason"]
+NOREPLY_RE = re.compile(r"^(?:(?P<id>\d+)\+)?(?P<login>[^@]+)@users\.noreply\.github\.com$")
+
+
+def exact_keys(table: IdentityTable, i: int, keys=EXACT_KEYS) -> dict[str, str]:
+    """{key family: key} of identity ``i`` (families without a key are left out)."""
+    email = table.emails[i].strip().casefold()
+    found = {}
+    if "email" in keys and "@" in email:
+        found["email"] = email
+    noreply = NOREPLY_RE.match(email)
+    if noreply:
+        if "noreply_id" in keys and noreply.group("id"):
+            found["noreply_id"] = noreply.group("id")
+        if "noreply_login" in keys:
+            found["noreply_login"] = noreply.group("login")
+    if "name" in keys and table.lasts[i]:
+        found["name"] = table.names[i]
+    return found
+
+
+class ExactMatches:
+    """
+    Exact-key matches of a developer list.
+
+    ``pairs`` maps (a, b), a < b, to the families that link them; every
+    identity of a key group is paired with the group's first identity.
+    ``groups`` gives each identity the smallest id of its connected group.
+    """
+
+    def __init__(self, devs, keys=EXACT_KEYS):
+        unknown = set(keys) - set(EXACT_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown exact key families: {sorted(unknown)}")
+        self.devs = [list(dev) for dev in devs]
+        table = IdentityTable(self.devs)
+        first: dict[tuple[str, str], int] = {}
+        self.pairs: dict[tuple[int, int], list[str]] = {}
+        for i in range(len(table)):
+            for family, key in exact_keys(table, i, keys).items():
+                a = first.setdefault((family, key), i)
+                if a != i:
+                    self.pairs.setdefault((a, i), []).append(family)
+
+        forest = UnionFind(len(table))
+        forest.union_many([a for a, _ in self.pairs], [b for _, b in self.pairs])
+        roots = forest.roots()
+        # smallest id of each group: roots are the smallest ids in union_many()
+        self.groups = roots
+        self.representatives = np.flatnonzero(roots == np.arange(len(table)))
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def collapsed(self) -> list[list[str]]:
+        """The representative identities, in their original order."""
+        return [self.devs[i] for i in self.representatives.tolist()]
+
+    def rows(self):
+        """[name_1, email_1, name_2, email_2, match_reason] per matched pair, sorted by id."""
+        for (a, b), families in sorted(self.pairs.items()):
+            yield [*self.devs[a], *self.devs[b], "+".join(families)]
+
+    def reason_counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(EXACT_KEYS, 0)
+        for families in self.pairs.values():
+            for family in families:
+                counts[family] += 1
+        return {family: n for family, n in counts.items() if n}
+
+
+def write_matches(path, matches: ExactMatches) -> int:
+    """Write devs_exact_matches.csv; returns the number of pairs written."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile, delimiter=",", quotechar='"')
+        writer.writerow(MATCH_COLUMNS)
+        writer.writerows(matches.rows())
+    return len(matches)
@@ -0,0 +1,167 @@
+# identity_table.py
+import string
+import unicodedata
+
+# Built once instead of on every process() call
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+
+
+# --- Helper: normalize a developer (name/email) ---
+def process(dev):
+    """
+    Takes a dev row [name, email] and returns:
+    normalized full name,
+    first name,
+    last name,
+    first initial,
+    last initial,
+    original email,
+    email prefix (before @)
+    """
+    name: str = dev[0]
+
+    # Remove punctuation
+    name = name.translate(_PUNCT_TABLE)
+
+    # Remove accents/diacritics
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join([c for c in name if not unicodedata.combining(c)])
+
+    # Lowercase
+    name = name.casefold()
+
+    # Collapse whitespace
+    name = " ".join(name.split())
+
+    # Split into first / last
+    parts = name.split(" ")
+    if len(parts) == 2:
+        first, last = parts
+    elif len(parts) == 1:
+        first, last = name, ""
+    else:
+        first, last = parts[0], " ".join(parts[1:])
+
+    # initials
+    i_first = first[0] if len(first) > 1 else ""
+    i_last = last[0] if len(last) > 1 else ""
+
+    # email + prefix
+    email: str = dev[1]
+    prefix = email.split("@")[0]
+
+    return name, first, last, i_first, i_last, email, prefix
+
+
+class IdentityTable:
+    """
+    Normalized view of the developer list, built in one pass.
+
+    Every field is stored as its own list (column) and indexed by the
+    integer id of the developer, i.e. its position in the input list, so
+    the scoring stage never has to call process() again.
+    """
+
+    __slots__ = (
+        "raw_names",
+        "names",
+        "firsts",
+        "lasts",
+        "i_firsts",
+        "i_lasts",
+        "emails",
+        "prefixes",
+        "initials",
+        "bounds",
+    )
+
+    def __init__(self, devs=()):
+        self.raw_names: list[str] = []
+        self.names: list[str] = []
+        self.firsts: list[str] = []
+        self.lasts: list[str] = []
+        self.i_firsts: list[str] = []
+        self.i_lasts: list[str] = []
+        self.emails: list[str] = []
+        self.prefixes: list[str] = []
+        self.initials = None  # initials_index.InitialsIndex, built on first use
+        self.bounds = None  # pruning.BoundsIndex, built on first use
+        for dev in devs:
+            self.append(dev)
+
+    def append(self, dev) -> int:
+        """Normalize one [name, email] row and return its integer id."""
+        name, first, last, i_first, i_last, email, prefix = process(dev)
+        self.raw_names.append(dev[0])
+        self.names.append(name)
+        self.firsts.append(first)
+        self.lasts.append(last)
+        self.i_firsts.append(i_first)
+        self.i_lasts.append(i_last)
+        self.emails.append(email)
+        self.prefixes.append(prefix)
+        return len(self.names) - 1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def row(self, i: int):
+        """Same tuple as process() for developer ``i``."""
+        return (
+            self.names[i],
+            self.firsts[i],
+            self.lasts[i],
+            self.i_firsts[i],
+            self.i_lasts[i],
+            self.emails[i],
+            self.prefixes[i],
+        )
+
+
+def initials_checks(table: IdentityTable, a: int, b: int):
+    """Boolean c4..c7 checks: do the email prefixes embed initials + names?"""
+    first_a, last_a = table.firsts[a], table.lasts[a]
+    first_b, last_b = table.firsts[b], table.lasts[b]
+    i_first_a, i_last_a = table.i_firsts[a], table.i_lasts[a]
+    i_first_b, i_last_b = table.i_firsts[b], table.i_lasts[b]
+    prefix_a, prefix_b = table.prefixes[a], table.prefixes[b]
+
+    c4 = c5 = c6 = c7 = False
+
+    # If we have enough info, check if email prefix embeds initials + lastname, etc.
+    if i_first_a != "" and last_a != "":
+        c4 = i_first_a in prefix_b and last_a in prefix_b
+    if i_last_a != "":
+        c5 = i_last_a in prefix_b and first_a in prefix_b
+    if i_first_b != "" and last_b != "":
+        c6 = i_first_b in prefix_a and last_b in prefix_a
+    if i_last_b != "":
+        c7 = i_last_b in prefix_a and first_b in prefix_a
+
+    return c4, c5, c6, c7
+
+
+def score_pair(table: IdentityTable, a: int, b: int, sim):
+    """
+    Bird-style similarity row for identities ``a`` and ``b`` of ``table``.
+
+    Returns [name_1, email_1, name_2, email_2, c1, c2, c3.1, c3.2, c4, c5, c6, c7]
+    using the ORIGINAL names/emails for labeling.
+    """
+    # Bird-style heuristic similarity signals
+    c1 = sim(table.names[a], table.names[b])  # full normalized name similarity
+    c2 = sim(table.prefixes[b], table.prefixes[a])  # email prefix similarity
+    c31 = sim(table.firsts[a], table.firsts[b])  # first name similarity
+    c32 = sim(table.lasts[a], table.lasts[b])  # last name similarity
+
+    return [
+        table.raw_names[a],
+        table.emails[a],
+        table.raw_names[b],
+        table.emails[b],
+        c1,
+        c2,
+        c31,
+        c32,
+        *initials_checks(table, a, b),
+    ]
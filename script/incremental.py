@@ -0,0 +1,152 @@
+# incremental.py
+import csv
+import heapq
+import json
+import os
+
+import numpy as np
+from identity_table import IdentityTable
+from pair_writer import PAIR_COLUMNS, select, threshold_mask
+from parallel_scoring import iter_scored_chunks_parallel
+from scoring import chunk_rows
+
+
+def read_devs(path):
+    """[name, email] rows of a devs CSV (header skipped)."""
+    with open(path, "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile, delimiter=",")
+        next(reader)  # skip header
+        return [row for row in reader]
+
+
+def write_devs(path, devs) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile, delimiter=",", quotechar='"')
+        writer.writerow(["name", "email"])
+        writer.writerows(devs)
+
+
+def read_run_state(path):
+    """The {"files": [...], "mode": {...}} of the last scoring run, or None without one."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_run_state(path, files, mode) -> None:
+    """Record the pair files (basenames) a scoring run wrote and how it chose its pairs."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"files": sorted(files), "mode": mode}, f, indent=2, sort_keys=True)
+
+
+def diff_identities(old_devs, new_devs):
+    """(added, removed) (name, email) identities between two developer lists."""
+    old = {tuple(dev) for dev in old_devs}
+    new = {tuple(dev) for dev in new_devs}
+    added = [tuple(dev) for dev in new_devs if tuple(dev) not in old]
+    removed = [tuple(dev) for dev in old_devs if tuple(dev) not in new]
+    return added, removed
+
+
+def new_pairs(n: int, new_ids):
+    """
+    Every pair (a, b), a < b, that involves at least one of ``new_ids``:
+    new x existing and new x new, each exactly once, in combinations() order.
+    """
+    new_ids = np.unique(np.asarray(new_ids, dtype=np.int64))
+    is_new = np.zeros(n, dtype=bool)
+    is_new[new_ids] = True
+    others = np.arange(n, dtype=np.int64)
+    left, right = [], []
+    for k in new_ids.tolist():
+        # new id paired with every other id; skip new x new duplicates (k > j)
+        partners = others[(others != k) & ~(is_new & (others < k))]
+        left.append(np.minimum(partners, k))
+        right.append(np.maximum(partners, k))
+    if not left:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    left, right = np.concatenate(left), np.concatenate(right)
+    order = np.lexsort((right, left))
+    return left[order], right[order]
+
+
+def _existing_rows(path, removed, position):
+    """Rows of ``path`` not involving a removed identity, keyed by pair position."""
+    with open(path, "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile, delimiter=",")
+        next(reader)  # skip header
+        for row in reader:
+            dev_a, dev_b = (row[0], row[1]), (row[2], row[3])
+            if dev_a in removed or dev_b in removed:
+                continue
+            yield (position[dev_a], position[dev_b]), row
+
+
+def patch_pair_file(path, new_rows, removed, position) -> int:
+    """
+    Rewrite ``path`` with the rows of removed identities dropped and
+    ``new_rows`` ((a, b), row) merged in at their combinations() position,
+    streaming both inputs. Returns the number of rows written.
+    """
+    tmp = path + ".tmp"
+    written = 0
+    with open(tmp, "w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out, delimiter=",", quotechar='"', lineterminator=os.linesep)
+        writer.writerow(PAIR_COLUMNS)
+        merged = heapq.merge(
+            _existing_rows(path, removed, position), new_rows, key=lambda item: item[0]
+        )
+        for _, row in merged:
+            writer.writerow(row)
+            written += 1
+    os.replace(tmp, path)
+    return written
+
+
+def incremental_update(
+    devs, previous_devs, pair_files, workers: int = 1, chunk_size=None, cache=None
+):
+    """
+    Bring pair files made from ``previous_devs`` up to date with ``devs``.
+
+    Only pairs involving an added identity are scored (O(k*n) for k new
+    identities instead of O(n^2)); rows of removed identities are dropped.
+    ``pair_files`` maps each file to its threshold (None for the unfiltered
+    dump). The files must come from an all-pairs run (no blocking or LSH)
+    and ``devs`` must be ordered like the full run orders it (sorted); then
+    the patched files are identical to a full re-run. ``cache`` is an
+    optional sim_cache.SimilarityCache for the new pairs.
+    Returns (added, removed, pairs scored).
+    """
+    added, removed = diff_identities(previous_devs, devs)
+    table = IdentityTable(devs)
+    position = {(table.raw_names[i], table.emails[i]): i for i in range(len(table))}
+
+    new_rows = {path: [] for path in pair_files}
+    scored = 0
+    if added:
+        pairs = new_pairs(len(table), [position[dev] for dev in added])
+        thresholds = [t for t in pair_files.values() if t is not None]
+        # the unfiltered dump needs every new pair, otherwise the lowest t is enough
+        cutoff = None if None in pair_files.values() or not thresholds else min(thresholds)
+        kwargs = {"chunk_size": chunk_size} if chunk_size else {}
+        for scores in iter_scored_chunks_parallel(
+            table, pairs, cutoff, workers=workers, cache=cache, **kwargs
+        ):
+            scored += len(scores["left"])
+            for path, t in pair_files.items():
+                passing = scores if t is None else select(scores, threshold_mask(scores, t))
+                keys = zip(passing["left"].tolist(), passing["right"].tolist())
+                new_rows[path].extend(
+                    (key, [str(value) for value in row])
+                    for key, row in zip(keys, chunk_rows(table, passing))
+                )
+
+    removed_set = set(removed)
+    for path in pair_files:
+        patch_pair_file(path, new_rows[path], removed_set, position)
+    return added, removed, scored
@@ -0,0 +1,214 @@
+# initials_index.py
+"""
+Precomputed matcher for the c4..c7 initials heuristics.
+
+c4..c7 ask whether one identity's email prefix embeds the other's first
+initial + last name (c4/c6) or last initial + first name (c5/c7). Instead
+of substring searches per pair, every distinct email prefix is scanned
+once for the first/last names that occur in it, and the characters of
+each prefix are recorded. A pair check is then two sorted-array lookups,
+and the identities matching a given one can be enumerated directly, which
+makes the heuristics usable as a blocking key.
+"""
+
+import numpy as np
+from identity_table import IdentityTable
+
+FLAG_COLUMNS = ("c4", "c5", "c6", "c7")
+_NONE = -1
+
+
+def _csr(keys, values, size):
+    """Group ``values`` by ``keys`` (0 <= key < size): (offsets, values sorted by key)."""
+    keys = np.asarray(keys, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+    return offsets, values[order]
+
+
+def _member(sorted_codes, codes):
+    """codes found in the sorted array ``sorted_codes``."""
+    if len(sorted_codes) == 0:
+        return np.zeros(len(codes), dtype=bool)
+    at = np.minimum(np.searchsorted(sorted_codes, codes), len(sorted_codes) - 1)
+    return sorted_codes[at] == codes
+
+
+class InitialsIndex:
+    """
+    c4..c7 of any pair of ``table`` without per-pair string work.
+
+    For identity x, "initial_last(x -> y)" means x's first initial and last
+    name both occur in y's email prefix, "initial_first(x -> y)" the same
+    for x's last initial and first name; then
+    c4 = initial_last(a -> b), c5 = initial_first(a -> b),
+    c6 = initial_last(b -> a), c7 = initial_first(b -> a),
+    exactly as identity_table.initials_checks() computes them.
+    """
+
+    def __init__(self, table: IdentityTable):
+        self.size = n = len(table)
+        prefix_ids: dict[str, int] = {}
+        self.prefix_of = np.fromiter(
+            (prefix_ids.setdefault(p, len(prefix_ids)) for p in table.prefixes),
+            dtype=np.int64,
+            count=n,
+        )
+        prefixes = list(prefix_ids)
+        needle_ids: dict[str, int] = {}
+        for word in (*table.lasts, *table.firsts):
+            if word:
+                needle_ids.setdefault(word, len(needle_ids))
+        self.num_needles = max(1, len(needle_ids))
+
+        def needle(word):
+            return needle_ids[word] if word else _NONE
+
+        # only characters that are someone's initial need indexing
+        char_ids: dict[str, int] = {}
+        for c in (*table.i_firsts, *table.i_lasts):
+            if c:
+                char_ids.setdefault(c, len(char_ids))
+
+        def char(c):
+            return char_ids[c] if c else _NONE
+
+        self.last_of = np.fromiter(map(needle, table.lasts), dtype=np.int64, count=n)
+        self.first_of = np.fromiter(map(needle, table.firsts), dtype=np.int64, count=n)
+        self.i_first_of = np.fromiter(map(char, table.i_firsts), dtype=np.int64, count=n)
+        self.i_last_of = np.fromiter(map(char, table.i_lasts), dtype=np.int64, count=n)
+        # the conditions initials_checks() tests before looking at the prefix
+        self.has_initial_last = (self.i_first_of != _NONE) & (self.last_of != _NONE)
+        self.has_initial_first = self.i_last_of != _NONE
+
+        # Every (prefix, first/last name occurring in it), and a bit per
+        # (prefix, initial character occurring in it)
+        lengths = sorted({len(w) for w in needle_ids})
+        contained_prefix, contained_needle = [], []
+        self._char_bits = np.zeros((len(prefixes), (len(char_ids) + 7) // 8), dtype=np.uint8)
+        for j, p in enumerate(prefixes):
+            found = set()
+            for length in lengths:
+                if length > len(p):
+                    break
+                for start in range(len(p) - length + 1):
+                    k = needle_ids.get(p[start : start + length])
+                    if k is not None:
+                        found.add(k)
+            contained_prefix.extend([j] * len(found))
+            contained_needle.extend(found)
+            for c in set(p):
+                k = char_ids.get(c)
+                if k is not None:
+                    self._char_bits[j, k >> 3] |= 1 << (k & 7)
+        contained_prefix = np.asarray(contained_prefix, dtype=np.int64)
+        contained_needle = np.asarray(contained_needle, dtype=np.int64)
+        self._contains = np.sort(contained_prefix * self.num_needles + contained_needle)
+
+        # Lookups for enumerating matches
+        num_prefixes = len(prefixes)
+        self._prefix_needles = _csr(contained_prefix, contained_needle, num_prefixes)
+        self._needle_prefixes = _csr(contained_needle, contained_prefix, self.num_needles)
+        ids = np.arange(n, dtype=np.int64)
+        self._prefix_members = _csr(self.prefix_of, ids, num_prefixes)
+        with_last = self.last_of != _NONE
+        self._last_members = _csr(self.last_of[with_last], ids[with_last], self.num_needles)
+        with_first = self.first_of != _NONE
+        self._first_members = _csr(self.first_of[with_first], ids[with_first], self.num_needles)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _in_prefix(self, prefix, word):
+        """Does prefix id ``prefix`` contain needle ``word`` (an empty word always does)?"""
+        found = _member(self._contains, prefix * self.num_needles + np.maximum(word, 0))
+        return found | (word == _NONE)
+
+    def _has_char(self, prefix, char):
+        """Does prefix id ``prefix`` contain initial character id ``char`` (>= 0)?"""
+        return (self._char_bits[prefix, char >> 3] >> (char & 7)) & 1 == 1
+
+    def _embedded(self, x, y, initial_of, word_of, applies):
+        """x's initial and word both occur in y's prefix, for id arrays x, y."""
+        result = np.zeros(len(x), dtype=bool)
+        # narrow down with the cheap checks first: most pairs fail early
+        rows = np.flatnonzero(applies[x])
+        x, py = x[rows], self.prefix_of[y[rows]]
+        keep = self._has_char(py, initial_of[x])
+        rows, x, py = rows[keep], x[keep], py[keep]
+        result[rows] = self._in_prefix(py, word_of[x])
+        return result
+
+    def _initial_last(self, x, y):
+        """initial_last(x -> y) for id arrays ``x``, ``y``."""
+        return self._embedded(x, y, self.i_first_of, self.last_of, self.has_initial_last)
+
+    def _initial_first(self, x, y):
+        return self._embedded(x, y, self.i_last_of, self.first_of, self.has_initial_first)
+
+    def flags(self, left, right):
+        """{c4: ..., c7: ...} bool arrays for the pairs (left[k], right[k])."""
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        return {
+            "c4": self._initial_last(left, right),
+            "c5": self._initial_first(left, right),
+            "c6": self._initial_last(right, left),
+            "c7": self._initial_first(right, left),
+        }
+
+    @staticmethod
+    def _group(csr, keys):
+        offsets, values = csr
+        keys = np.asarray(keys, dtype=np.int64)
+        if len(keys) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([values[offsets[k] : offsets[k + 1]] for k in keys.tolist()])
+
+    def matches(self, x: int) -> np.ndarray:
+        """Sorted ids y != x for which any of c4..c7 holds for the pair (x, y)."""
+        candidates = []
+        # x -> y: prefixes containing x's last/first name, then their identities.
+        # process() never gives an empty name part together with its initial.
+        words = []
+        if self.has_initial_last[x]:
+            words.append(self.last_of[x])
+        if self.has_initial_first[x]:
+            words.append(self.first_of[x])
+        prefixes = self._group(self._needle_prefixes, words)
+        candidates.append(self._group(self._prefix_members, np.unique(prefixes)))
+        # y -> x: identities whose last/first name occurs in x's prefix
+        words = self._group(self._prefix_needles, [self.prefix_of[x]])
+        candidates.append(self._group(self._last_members, words))
+        candidates.append(self._group(self._first_members, words))
+
+        ys = np.unique(np.concatenate(candidates))
+        ys = ys[ys != x]
+        xs = np.full(len(ys), x, dtype=np.int64)
+        hit = np.zeros(len(ys), dtype=bool)
+        for flag in self.flags(xs, ys).values():
+            hit |= flag
+        return ys[hit]
+
+    def candidate_pairs(self, max_matches: int | None = None) -> list[tuple[int, int]]:
+        """
+        Sorted (a, b) pairs, a < b, with any of c4..c7, i.e. the initials
+        heuristics as a blocking key. Identities matching more than
+        ``max_matches`` others are skipped, like oversized blocks.
+        """
+        pairs: set[tuple[int, int]] = set()
+        for x in range(self.size):
+            ys = self.matches(x)
+            if max_matches is not None and len(ys) > max_matches:
+                continue
+            pairs.update((x, y) for y in ys.tolist() if y > x)
+        return sorted(pairs)
+
+
+def index_for(table: IdentityTable) -> InitialsIndex:
+    """The table's InitialsIndex, (re)built when missing or identities were appended since."""
+    if table.initials is None or len(table.initials) != len(table):
+        table.initials = InitialsIndex(table)
+    return table.initials
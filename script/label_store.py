@@ -0,0 +1,169 @@
+# label_store.py
+"""
+Manual TP/FP labels keyed by an order-independent pair hash.
+
+The labelled xlsx is parsed once; the normalized table is cached as CSV in
+project1devs/state/label_cache/ and rebuilt only when the xlsx changes
+(size/mtime, then content hash). join_labels() attaches labels to any pair
+table (CSV, pair store frame, another threshold) with one hash lookup per row.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from config import LABEL_CACHE_DIR as CACHE_DIR
+from config import LABELED_XLSX
+from normalize import norm
+
+CACHE_VERSION = 1
+PAIR_KEY_COLUMNS = ["name_1", "email_1", "name_2", "email_2"]
+SCORE_COLUMNS = ["c1", "c2", "c3.1", "c3.2"]
+FLAG_COLUMNS = ["c4", "c5", "c6", "c7"]
+LABEL_NAMES = {"label", "labels", "labeled", "annotation"}
+# Also accept TRUE/FALSE or 1/0 in case booleans were used
+LABEL_ALIASES = {"TRUE": "TP", "FALSE": "FP", "1": "TP", "0": "FP"}
+
+
+def _side(name, email) -> str:
+    return " ".join(norm(name).split()) + "\x1f" + str(email).strip().lower()
+
+
+def pair_key(name_1, email_1, name_2, email_2) -> int:
+    """
+    Signed 64-bit hash of a pair of identities: names normalized (accents,
+    case, spacing), emails lowercased, and the two sides sorted, so
+    (a, b) and (b, a) get the same key.
+    """
+    sides = sorted((_side(name_1, email_1), _side(name_2, email_2)))
+    digest = hashlib.blake2b("\x1e".join(sides).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def pair_keys(frame: pd.DataFrame) -> np.ndarray:
+    """pair_key() of every row of a frame with name_1/email_1/name_2/email_2."""
+    columns = [frame[c].tolist() for c in PAIR_KEY_COLUMNS]
+    return np.fromiter((pair_key(*row) for row in zip(*columns)), dtype=np.int64, count=len(frame))
+
+
+def normalize_labels(s: pd.Series) -> pd.Series:
+    s = s.astype(str).str.upper().str.strip()
+    return s.replace(LABEL_ALIASES)
+
+
+def detect_label_column(frame: pd.DataFrame):
+    """The label column: by header name, else the one with the most TP/FP values."""
+    for c in frame.columns:
+        if str(c).strip().lower() in LABEL_NAMES:
+            return c
+    hits = {c: int(normalize_labels(frame[c]).isin(["TP", "FP"]).sum()) for c in frame.columns}
+    best = max(hits, key=hits.get, default=None)
+    return best if best is not None and hits[best] else None
+
+
+def build_label_table(path) -> pd.DataFrame:
+    """
+    Parse the labelled xlsx into name_1/email_1/name_2/email_2, scores,
+    label (TP/FP, "" if unlabelled), reason and pair_key columns.
+    """
+    raw = pd.read_excel(path, engine="openpyxl")
+    label_col = detect_label_column(raw)
+    if label_col is None:
+        raise ValueError(f"No TP/FP label column found in {path}")
+    # identity columns by name, else the first four columns
+    names = [c if c in raw.columns else raw.columns[i] for i, c in enumerate(PAIR_KEY_COLUMNS)]
+    table = raw[names].astype(str).set_axis(PAIR_KEY_COLUMNS, axis=1)
+    repeated_header = table["name_1"].eq("name_1") & table["email_1"].eq("email_1")
+    raw, table = raw[~repeated_header], table[~repeated_header].reset_index(drop=True)
+    for c in SCORE_COLUMNS:
+        if c in raw.columns:
+            table[c] = pd.to_numeric(raw[c], errors="coerce").to_numpy()
+    for c in FLAG_COLUMNS:
+        if c in raw.columns:
+            table[c] = normalize_labels(raw[c]).eq("TRUE").to_numpy()
+    labels = normalize_labels(raw[label_col])
+    table["label"] = labels.where(labels.isin(["TP", "FP"]), "").to_numpy()
+    if "reason" in raw.columns:
+        table["reason"] = raw["reason"].fillna("").astype(str).to_numpy()
+    table["pair_key"] = pair_keys(table)
+    return table
+
+
+def file_digest(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _cache_paths(path, cache_dir):
+    """Cache files of ``path``: its file name plus a hash of its absolute path."""
+    source = hashlib.blake2b(os.path.abspath(path).encode("utf-8"), digest_size=4).hexdigest()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(cache_dir, f"{stem}-{source}")
+    return base + ".csv", base + ".meta.json"
+
+
+def load_labels(path=LABELED_XLSX, cache_dir=CACHE_DIR) -> pd.DataFrame:
+    """
+    The label table of ``path``, from the cache when it is still valid.
+    The cache is trusted when size and mtime match; if only the mtime moved,
+    the content hash decides.
+    """
+    csv_path, meta_path = _cache_paths(path, cache_dir)
+    stat = os.stat(path)
+    meta = None
+    if os.path.exists(meta_path) and os.path.exists(csv_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if (
+            meta.get("version") != CACHE_VERSION
+            or meta.get("source") != os.path.abspath(path)
+            or meta.get("size") != stat.st_size
+        ):
+            meta = None
+    if meta is not None and meta.get("mtime_ns") != stat.st_mtime_ns:
+        if meta.get("sha256") != file_digest(path):
+            meta = None
+        else:  # touched but unchanged
+            meta["mtime_ns"] = stat.st_mtime_ns
+            _write_meta(meta_path, meta)
+    if meta is not None:
+        return pd.read_csv(
+            csv_path, dtype={c: str for c in PAIR_KEY_COLUMNS}, keep_default_na=False
+        )
+
+    table = build_label_table(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    table.to_csv(csv_path, index=False)
+    meta = {
+        "version": CACHE_VERSION,
+        "source": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_digest(path),
+    }
+    _write_meta(meta_path, meta)
+    return table
+
+
+def _write_meta(meta_path, meta) -> None:
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+
+
+def join_labels(pairs: pd.DataFrame, labels: pd.DataFrame, columns=("label", "reason")):
+    """
+    Copy of ``pairs`` with the label columns of matching pairs attached
+    ("" where a pair was never labelled), matched by pair_key in O(n).
+    """
+    keys = pair_keys(pairs)
+    last = labels.drop_duplicates("pair_key", keep="last").set_index("pair_key")
+    joined = pairs.copy()
+    for column in columns:
+        if column in last.columns:
+            joined[column] = last[column].reindex(keys).fillna("").to_numpy()
+    return joined
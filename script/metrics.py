@@ -0,0 +1,153 @@
+# metrics.py
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory in MB (None if unknown)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return round(getattr(info, "peak_wset", info.rss) / (1 << 20), 1)
+
+
+def children_cpu_s() -> float:
+    """CPU seconds of finished child processes (e.g. scoring workers)."""
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class StageMetrics:
+    """
+    Per-stage wall time, CPU time, memory and item counts of one run.
+
+        metrics = StageMetrics()
+        with metrics.stage("scoring") as counts:
+            ...
+            counts["pairs_scored"] = n
+
+    Memory is the process-wide RSS high-water mark, which never goes down:
+    each stage records it when it ends (process_peak_rss_mb) and how far the
+    stage raised it (peak_rss_growth_mb), which is what points at the stage
+    that used the memory. With ``trace_memory`` the peak Python allocation
+    of each stage is recorded too (tracemalloc; slows the run down noticeably).
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.stages = []
+        self.trace_memory = trace_memory
+        self.started = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        counts: dict[str, float] = {}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu, child_cpu = time.perf_counter(), time.process_time(), children_cpu_s()
+        peak_before = peak_rss_mb()
+        try:
+            yield counts
+        finally:
+            entry = {
+                "stage": name,
+                "wall_s": round(time.perf_counter() - wall, 4),
+                "cpu_s": round(time.process_time() - cpu, 4),
+                "children_cpu_s": round(children_cpu_s() - child_cpu, 4),
+            }
+            peak = peak_rss_mb()
+            entry["process_peak_rss_mb"] = peak
+            entry["peak_rss_growth_mb"] = None if peak is None else round(peak - peak_before, 1)
+            if self.trace_memory:
+                entry["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1 << 20), 1)
+            entry["counts"] = counts
+            self.stages.append(entry)
+
+    def close(self) -> None:
+        """Stop tracemalloc if this object started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def report(self) -> dict:
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self._start, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "cpus": os.cpu_count(),
+            "argv": sys.argv[1:],
+            "stages": self.stages,
+        }
+
+    def write_json(self, path) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+
+    def print_summary(self) -> None:
+        print(f"{'stage':>20} {'wall s':>8} {'cpu s':>8} {'peak MB':>8} {'+MB':>6}  counts")
+        for s in self.stages:
+            counts = " ".join(f"{k}={v}" for k, v in s["counts"].items())
+            peak, growth = s["process_peak_rss_mb"], s["peak_rss_growth_mb"]
+            rss = "" if peak is None else f"{peak:.1f}"
+            grew = "" if growth is None else f"{growth:.1f}"
+            print(
+                f"{s['stage']:>20} {s['wall_s']:>8.2f} {s['cpu_s']:>8.2f} {rss:>8} {grew:>6}  "
+                f"{counts}"
+            )
+
+
+def timed(iterable, counts, key: str):
+    """Yield from ``iterable``, recording the seconds spent waiting on it in counts[key]."""
+    total = 0.0
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            total += time.perf_counter() - start
+            counts[key] = round(total, 4)
+        yield item
+
+
+@contextmanager
+def profiled(path=None, top: int = 25):
+    """
+    Run the block under cProfile; dump the stats to ``path`` (if given,
+    e.g. for snakeviz) and print the ``top`` entries by cumulative time.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
@@ -0,0 +1,257 @@
+# minhash_lsh.py
+"""
+Approximate candidate pairs with MinHash signatures and banded LSH.
+
+Fuzzy name similarity (c1) has no exact blocking key. Here every identity
+gets a MinHash signature of the character q-grams (blocking.qgrams) of its
+normalized name and, separately, of its email prefix. A signature is cut
+into ``bands`` bands of ``rows`` values; identities whose band matches in
+any band of either field become candidate pairs, to be scored exactly.
+Two strings with q-gram Jaccard similarity s collide with probability
+1 - (1 - s**rows)**bands, so more bands raise recall and more rows cut
+the number of candidates.
+
+Usage (recall and speed against exhaustive scoring on devs.csv):
+    python script/minhash_lsh.py [--params 16x4 32x4 ...] [--output lsh_report.csv]
+"""
+
+import argparse
+import csv
+import time
+
+import numpy as np
+from blocking import DEFAULT_Q, qgrams, unique_pairs
+from config import DEFAULT_LSH_BANDS, DEFAULT_LSH_ROWS, OUTPUT_DIR
+from identity_table import IdentityTable
+
+LSH_FIELDS = ("name", "prefix")
+DEFAULT_PARAMS = ((8, 2), (16, 2), (16, 4), (32, 4), (32, 8))
+_PRIME = (1 << 31) - 1  # a*x + b stays below 2**63 for a, b, x < 2**31
+_CHUNK = 8192  # identities per signature block
+_EMPTY = np.iinfo(np.uint64).max
+
+
+def field_values(table: IdentityTable, field: str) -> list[str]:
+    if field == "name":
+        return table.names
+    if field == "prefix":
+        return [p.casefold() for p in table.prefixes]
+    raise ValueError(f"Unknown LSH field: {field!r}")
+
+
+def shingle_sets(values, q: int = DEFAULT_Q):
+    """(offsets, dense shingle ids) of the q-grams of every string; "" has none."""
+    ids: dict[str, int] = {}
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    tokens = []
+    for i, value in enumerate(values):
+        if value:
+            # sorted, so ids (and signatures) do not depend on set order
+            tokens.extend(ids.setdefault(g, len(ids)) for g in sorted(qgrams(value, q)))
+        offsets[i + 1] = len(tokens)
+    return offsets, np.asarray(tokens, dtype=np.uint64)
+
+
+def signatures(offsets, tokens, num_perm: int, seed: int = 0) -> np.ndarray:
+    """
+    (n, num_perm) MinHash signatures: the minimum of num_perm universal
+    hashes (a*x + b) mod p over each identity's shingles; identities
+    without shingles get the maximum value in every position.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+    n = len(offsets) - 1
+    sig = np.full((n, num_perm), _EMPTY, dtype=np.uint64)
+    for start in range(0, n, _CHUNK):
+        stop = min(start + _CHUNK, n)
+        lo, hi = offsets[start], offsets[stop]
+        if lo == hi:
+            continue
+        hashes = (tokens[lo:hi, None] * a + b) % _PRIME
+        counts = np.diff(offsets[start : stop + 1])
+        rows = np.flatnonzero(counts)
+        sig[start + rows] = np.minimum.reduceat(hashes, offsets[start + rows] - lo, axis=0)
+    return sig
+
+
+def bucket_pairs(keys, ids, max_bucket_size=None):
+    """(left, right) of every pair of ``ids`` sharing a key, skipping oversized buckets."""
+    order = np.argsort(keys, kind="stable")
+    keys, ids = keys[order], ids[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    keep = sizes >= 2
+    if max_bucket_size is not None:
+        keep &= sizes <= max_bucket_size
+    # members of a bucket are adjacent: pair each with the one k positions on,
+    # for as long as that is still in its bucket
+    ends = np.repeat(starts + sizes, sizes)
+    active = np.flatnonzero(np.repeat(keep, sizes))
+    left, right = [], []
+    k = 1
+    while True:
+        active = active[active + k < ends[active]]
+        if len(active) == 0:
+            break
+        left.append(ids[active])
+        right.append(ids[active + k])
+        k += 1
+    if not left:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(left), np.concatenate(right)
+
+
+class MinHashLSH:
+    """
+    Banded MinHash LSH over the normalized names and email prefixes of an
+    IdentityTable. ``max_bucket_size`` skips buckets shared by more
+    identities, like BlockingIndex's oversized blocks.
+    """
+
+    def __init__(
+        self,
+        table: IdentityTable,
+        bands: int = DEFAULT_LSH_BANDS,
+        rows: int = DEFAULT_LSH_ROWS,
+        fields=LSH_FIELDS,
+        q: int = DEFAULT_Q,
+        seed: int = 0,
+        max_bucket_size: int | None = None,
+    ):
+        if bands < 1 or rows < 1:
+            raise ValueError("bands and rows must be at least 1")
+        self.size = len(table)
+        self.bands, self.rows = bands, rows
+        self.fields = tuple(fields)
+        self.max_bucket_size = max_bucket_size
+        self.signatures = {
+            field: signatures(*shingle_sets(field_values(table, field), q), bands * rows, seed)
+            for field in self.fields
+        }
+        # random multipliers fold a band's rows into one 64-bit key
+        self._fold = np.random.default_rng(seed + 1).integers(
+            1, np.iinfo(np.int64).max, size=rows, dtype=np.uint64
+        )
+
+    def candidate_arrays(self):
+        """Sorted, distinct (left, right) id arrays with left < right."""
+        n = self.size
+        codes = []
+        for sig in self.signatures.values():
+            has_shingles = sig[:, 0] != _EMPTY
+            ids = np.flatnonzero(has_shingles)
+            for band in range(self.bands):
+                block = sig[ids, band * self.rows : (band + 1) * self.rows]
+                keys = (block * self._fold).sum(axis=1, dtype=np.uint64)  # wraps mod 2**64
+                left, right = bucket_pairs(keys, ids, self.max_bucket_size)
+                codes.append(np.minimum(left, right) * n + np.maximum(left, right))
+        return unique_pairs(codes, n)
+
+    def candidate_pairs(self) -> list[tuple[int, int]]:
+        """Sorted (a, b) id pairs with a < b, like BlockingIndex.candidate_pairs()."""
+        left, right = self.candidate_arrays()
+        return list(zip(left.tolist(), right.tolist()))
+
+
+def union_pairs(n: int, *pair_sets):
+    """Sorted, distinct (left, right) arrays of several (left, right) pair sets over n ids."""
+    codes = [np.asarray(left, dtype=np.int64) * n + np.asarray(right) for left, right in pair_sets]
+    return unique_pairs(codes, n)
+
+
+def collision_probability(s: float, bands: int, rows: int) -> float:
+    """Chance that two sets with Jaccard similarity ``s`` share a bucket."""
+    return 1 - (1 - s**rows) ** bands
+
+
+def threshold_pairs(table: IdentityTable, t: float) -> np.ndarray:
+    """Codes a*n + b of every pair passing the threshold check at ``t``, by exhaustive scoring."""
+    from scoring import iter_scored_chunks
+
+    n = len(table)
+    codes = [s["left"] * n + s["right"] for s in iter_scored_chunks(table, cutoff=t)]
+    return np.concatenate(codes) if codes else np.zeros(0, dtype=np.int64)
+
+
+def recall_speed_report(table: IdentityTable, params=DEFAULT_PARAMS, thresholds=(0.72, 0.8)):
+    """
+    One row per (bands, rows): candidate count, reduction ratio, seconds for
+    LSH and for scoring the candidates, and the recall of the pairs that
+    exhaustive scoring passes at every threshold. The exhaustive timing
+    is the first row.
+    """
+    from scoring import iter_scored_chunks
+
+    n = len(table)
+    total = n * (n - 1) // 2
+    thresholds = sorted(thresholds)
+    start = time.perf_counter()
+    expected = {thresholds[0]: threshold_pairs(table, thresholds[0])}
+    exhaustive_s = time.perf_counter() - start  # same cutoff as the LSH rows below
+    expected.update({t: threshold_pairs(table, t) for t in thresholds[1:]})
+    rows = [{"method": "exhaustive", "candidates": total, "score_s": round(exhaustive_s, 3)}]
+    for t in thresholds:
+        rows[0][f"recall_t={t}"] = 1.0
+
+    for bands, r in params:
+        start = time.perf_counter()
+        left, right = MinHashLSH(table, bands, r).candidate_arrays()
+        lsh_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in iter_scored_chunks(table, (left, right), cutoff=min(thresholds)):
+            pass
+        score_s = time.perf_counter() - start
+        row = {
+            "method": f"lsh {bands}x{r}",
+            "candidates": len(left),
+            "reduction_ratio": round(1 - len(left) / total, 4) if total else 0.0,
+            "lsh_s": round(lsh_s, 3),
+            "score_s": round(score_s, 3),
+        }
+        found = left * n + right
+        for t, codes in expected.items():
+            hit = np.isin(codes, found).sum()
+            row[f"recall_t={t}"] = round(hit / len(codes), 4) if len(codes) else 1.0
+        rows.append(row)
+    return rows
+
+
+def main():
+    from cli import parse_lsh
+    from pipeline import load_devs
+
+    parser = argparse.ArgumentParser(description="MinHash/LSH recall and speed on devs.csv.")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, metavar="DIR")
+    parser.add_argument(
+        "--params",
+        nargs="+",
+        type=parse_lsh,
+        default=list(DEFAULT_PARAMS),
+        metavar="BxR",
+        help="bands x rows settings to try (default: "
+        + " ".join(f"{b}x{r}" for b, r in DEFAULT_PARAMS)
+        + ")",
+    )
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.72, 0.8])
+    parser.add_argument("--output", metavar="CSV", help="also write the report here")
+    args = parser.parse_args()
+
+    rows = recall_speed_report(
+        IdentityTable(load_devs(args.output_dir)), args.params, args.thresholds
+    )
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    print("  ".join(f"{c:>16}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{row.get(c, ''):>16}" for c in columns))
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        print("Wrote:", args.output)
+
+
+if __name__ == "__main__":
+    main()
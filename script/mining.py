@@ -0,0 +1,322 @@
+# mining.py
+import json
+import os
+import subprocess  # nosec B404 - only runs git with fixed arguments
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from config import BACKENDS
+
+REMOTE_PREFIXES = ("http://", "https://", "git://", "ssh://", "git@", "file://")
+CHECKPOINT_VERSION = 2
+
+
+def is_remote(repo: str) -> bool:
+    return repo.startswith(REMOTE_PREFIXES)
+
+
+def git(path, *args) -> str:
+    """Run a git command in ``path`` and return its stdout."""
+    result = subprocess.run(  # nosec B603 B607
+        ["git", "-C", str(path), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    )
+    return result.stdout
+
+
+def repo_slug(repo: str) -> str:
+    """File-system friendly name for a repository URL/path."""
+    slug = repo.rstrip("/").removesuffix(".git")
+    slug = "".join(c if c.isalnum() or c in "-_." else "_" for c in slug)
+    return slug.strip("_")
+
+
+def clone_bare(repo: str, path) -> None:
+    subprocess.run(  # nosec B603 B607
+        ["git", "clone", "--quiet", "--bare", repo, str(path)],
+        check=True,
+        capture_output=True,
+    )
+
+
+def ensure_clone(repo: str, cache_dir) -> str:
+    """
+    Bare clone of ``repo`` inside ``cache_dir``: cloned on first use and
+    only fetched (branches, pruned) on later runs.
+    """
+    path = os.path.join(cache_dir, repo_slug(repo) + ".git")
+    if os.path.isdir(path):
+        git(path, "fetch", "--quiet", "--prune", "--force", "origin", "+refs/heads/*:refs/heads/*")
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        clone_bare(repo, path)
+    return path
+
+
+@contextmanager
+def local_repository(repo: str, cache_dir=None):
+    """
+    Yield a local path for ``repo``. Remote URLs are cloned into
+    ``cache_dir`` (kept between runs) or, without one, into a temp dir.
+    """
+    if not is_remote(repo):
+        yield repo
+        return
+    if cache_dir is not None:
+        yield ensure_clone(repo, cache_dir)
+        return
+    with tempfile.TemporaryDirectory(prefix="project1devs-") as tmp:
+        path = os.path.join(tmp, "repo.git")
+        clone_bare(repo, path)
+        yield path
+
+
+def commit_exists(path, sha: str) -> bool:
+    try:
+        git(path, "cat-file", "-e", f"{sha}^{{commit}}")
+    except subprocess.CalledProcessError:
+        return False
+    return True
+
+
+def new_commits(path, since: str | None = None) -> list[str]:
+    """
+    Hashes of the commits reachable from HEAD but not from ``since``,
+    oldest first (the order PyDriller traverses them in).
+    """
+    rev = f"{since}..HEAD" if since else "HEAD"
+    return git(path, "rev-list", "--reverse", rev).split()
+
+
+class IdentityStats:
+    """How often and when an identity shows up: commits, first/last seen (epoch s)."""
+
+    __slots__ = ("commits", "first_seen", "last_seen")
+
+    def __init__(self, commits: int = 0, first_seen=None, last_seen=None):
+        self.commits = commits
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+
+    def see(self, timestamp: int) -> None:
+        if self.first_seen is None or timestamp < self.first_seen:
+            self.first_seen = timestamp
+        if self.last_seen is None or timestamp > self.last_seen:
+            self.last_seen = timestamp
+
+    def merge(self, other: "IdentityStats") -> None:
+        self.commits += other.commits
+        for timestamp in (other.first_seen, other.last_seen):
+            if timestamp is not None:
+                self.see(timestamp)
+
+    def as_list(self):
+        return [self.commits, self.first_seen, self.last_seen]
+
+    def __eq__(self, other):
+        return isinstance(other, IdentityStats) and self.as_list() == other.as_list()
+
+    def __repr__(self):
+        return f"IdentityStats{tuple(self.as_list())}"
+
+
+def record_commit(stats, author, author_time, committer, committer_time) -> None:
+    """Count one commit for its author and committer (once if they are the same)."""
+    # author
+    stats.setdefault(author, IdentityStats()).see(author_time)
+    stats[author].commits += 1
+    # committer (can be different person)
+    stats.setdefault(committer, IdentityStats()).see(committer_time)
+    if committer != author:
+        stats[committer].commits += 1
+
+
+def pydriller_commits(path, shas):
+    """(author, author time, committer, committer time) of each commit via PyDriller."""
+    from pydriller import Git  # slow to import; only this backend needs it
+
+    repo_git = Git(path)
+    try:
+        for sha in shas:
+            commit = repo_git.get_commit(sha)
+            yield (
+                (commit.author.name, commit.author.email),
+                int(commit.author_date.timestamp()),
+                (commit.committer.name, commit.committer.email),
+                int(commit.committer_date.timestamp()),
+            )
+    finally:
+        repo_git.clear()
+
+
+# One NUL-terminated record per commit (-z), fields separated by NUL too
+GIT_LOG_FORMAT = "%an%x00%ae%x00%at%x00%cn%x00%ce%x00%ct"
+GIT_LOG_FIELDS = 6
+
+
+def git_log_commits(path, since: str | None = None, bufsize: int = 1 << 16):
+    """
+    Same tuples as pydriller_commits(), parsed on the fly from a single
+    streamed ``git log`` instead of building a Commit object per commit.
+    """
+    rev = f"{since}..HEAD" if since else "HEAD"
+    cmd = [
+        "git",
+        "-C",
+        str(path),
+        "log",
+        "-z",
+        "--no-mailmap",
+        "--encoding=UTF-8",
+        f"--format={GIT_LOG_FORMAT}",
+        rev,
+    ]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:  # nosec B603 B607
+        pending = b""
+        fields: list[bytes] = []
+        while True:
+            block = proc.stdout.read(bufsize)
+            if not block:
+                break
+            *complete, pending = (pending + block).split(b"\0")
+            for field in complete:
+                fields.append(field)
+                if len(fields) == GIT_LOG_FIELDS:
+                    an, ae, at, cn, ce, ct = (f.decode("utf-8", "replace") for f in fields)
+                    fields = []
+                    yield (an, ae), int(at), (cn, ce), int(ct)
+        if pending:
+            fields.append(pending)
+        if len(fields) == GIT_LOG_FIELDS:
+            an, ae, at, cn, ce, ct = (f.decode("utf-8", "replace") for f in fields)
+            yield (an, ae), int(at), (cn, ce), int(ct)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def iso_date(timestamp) -> str:
+    """Epoch seconds as an ISO-8601 UTC timestamp ("" if unknown)."""
+    if timestamp is None:
+        return ""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def checkpoint_path(checkpoint_dir, repo: str) -> str:
+    """One checkpoint file per repository, named after its URL/path."""
+    return os.path.join(checkpoint_dir, f"{repo_slug(repo)}.json")
+
+
+def load_checkpoint(path, repo: str):
+    """Return (last commit, identity stats) from ``path``, or (None, {})."""
+    if not path or not os.path.exists(path):
+        return None, {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CHECKPOINT_VERSION or data.get("repo") != repo:
+        return None, {}
+    identities = {
+        (name, email): IdentityStats(*counts) for name, email, *counts in data["identities"]
+    }
+    return data["last_commit"], identities
+
+
+def save_checkpoint(path, repo: str, last_commit: str, identities):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        "version": CHECKPOINT_VERSION,
+        "repo": repo,
+        "last_commit": last_commit,
+        "identities": sorted([*dev, *stats.as_list()] for dev, stats in identities.items()),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def mine_repository(repo: str, checkpoint_file=None, cache_dir=None, backend="pydriller"):
+    """
+    Collect the (name, email) identities of every commit in ``repo``, with
+    their commit count and first/last-seen times.
+
+    ``backend`` is "pydriller" (one Commit object per commit) or "gitlog"
+    (a single streamed ``git log``, much faster on large histories).
+
+    With a ``checkpoint_file``, only commits newer than the checkpointed one
+    are traversed and their identities are merged into the checkpointed set;
+    the checkpoint is then moved to the current HEAD. If the checkpointed
+    commit no longer exists (e.g. after a force push) the whole history is
+    mined again. Remote repositories are cloned into ``cache_dir`` if given.
+
+    Returns ({(name, email): IdentityStats}, number of commits traversed).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown mining backend {backend!r}; expected one of {BACKENDS}")
+    last_commit, identities = load_checkpoint(checkpoint_file, repo)
+    commits = 0
+    with local_repository(repo, cache_dir) as path:
+        if last_commit and not commit_exists(path, last_commit):
+            last_commit, identities = None, {}
+        head = git(path, "rev-parse", "HEAD").strip()
+        if head != last_commit:
+            if backend == "gitlog":
+                records = git_log_commits(path, last_commit)
+            else:
+                records = pydriller_commits(path, new_commits(path, last_commit))
+            for record in records:
+                record_commit(identities, *record)
+                commits += 1
+    if checkpoint_file:
+        save_checkpoint(checkpoint_file, repo, head, identities)
+    return identities, commits
+
+
+def read_repo_list(path) -> list[str]:
+    """Repository URLs/paths from a text file, one per line; # starts a comment."""
+    repos = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                repos.append(line)
+    return repos
+
+
+def mine_repositories(
+    repos, checkpoint_dir=None, cache_dir=None, workers: int = 8, backend="pydriller"
+):
+    """
+    Mine several repositories concurrently (mining is git/I-O bound, so a
+    thread pool is enough) and merge their identity sets.
+
+    Returns (stats, provenance, commit counts): stats maps every
+    (name, email) identity to its IdentityStats summed over all
+    repositories, provenance maps it to the sorted list of repositories it
+    was seen in, and commit counts maps each repository to the commits
+    traversed.
+    """
+    repos = list(dict.fromkeys(repos))  # drop duplicates, keep order
+
+    def mine(repo):
+        checkpoint_file = checkpoint_path(checkpoint_dir, repo) if checkpoint_dir else None
+        return mine_repository(repo, checkpoint_file, cache_dir, backend)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(mine, repos))
+
+    stats: dict[tuple[str, str], IdentityStats] = {}
+    provenance: dict[tuple[str, str], list[str]] = {}
+    commit_counts = {}
+    for repo, (identities, commits) in zip(repos, results):
+        commit_counts[repo] = commits
+        for identity, identity_stats in identities.items():
+            stats.setdefault(identity, IdentityStats()).merge(identity_stats)
+            provenance.setdefault(identity, []).append(repo)
+    for identity_repos in provenance.values():
+        identity_repos.sort()
+    return stats, provenance, commit_counts
@@ -0,0 +1,92 @@
+# normalize.py
+"""
+Name/email normalization shared by the dedupe scripts.
+
+Names and emails repeat across thousands of pairs, so every helper is
+memoized in a bounded LRU cache; cache_stats() reports hits and misses.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+CACHE_SIZE = 1 << 16
+
+NAME_SPLIT_RE = re.compile(r"[\s._\-\\]+")
+
+# Keywords that mark an address as automated/shared (matched as substrings)
+GENERIC_ALIAS_KEYWORDS = (
+    "noreply",
+    "users.noreply.github.com",
+    ".lan",
+    ".local",
+    "bot",
+    "ci",
+    "automation",
+)
+
+
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def norm(s: str) -> str:
+    """Lowercase, trimmed, with accents stripped ("ÁndrÉ " -> "andre")."""
+    s = str(s)
+    s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+    return s.strip().lower()
+
+
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def name_tokens(n: str) -> tuple[str, ...]:
+    return tuple(p for p in NAME_SPLIT_RE.split(norm(n)) if p)
+
+
+def split_name(n: str) -> list[str]:
+    return list(name_tokens(n))
+
+
+def surname(n: str) -> str:
+    parts = name_tokens(n)
+    return parts[-1] if parts else ""
+
+
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def raw_surname(n: str) -> str:
+    """Surname as improved_rule sees it: accents decomposed (NFKD) but kept."""
+    parts = [p for p in NAME_SPLIT_RE.split(unicodedata.normalize("NFKD", str(n).lower())) if p]
+    return parts[-1] if parts else ""
+
+
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def email_parts(e: str) -> tuple[str, str]:
+    """(prefix, domain), lowercased; ("", "") if there is no "@"."""
+    e = str(e)
+    if "@" not in e:
+        return ("", "")
+    p, d = e.split("@", 1)
+    return (p.lower(), d.lower())
+
+
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def generic_alias(e: str) -> bool:
+    """GitHub noreply or local-network address."""
+    e = str(e).lower()
+    return ("users.noreply.github.com" in e) or (e.endswith(".lan") or ".local" in e)
+
+
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def is_generic_alias(e: str) -> bool:
+    """Broader check used by improved_rule: any GENERIC_ALIAS_KEYWORDS substring."""
+    e = e.lower()
+    return any(kw in e for kw in GENERIC_ALIAS_KEYWORDS)
+
+
+CACHED = (norm, name_tokens, raw_surname, email_parts, generic_alias, is_generic_alias)
+
+
+def cache_stats() -> dict:
+    """{function name: CacheInfo(hits, misses, maxsize, currsize)}."""
+    return {fn.__name__: fn.cache_info() for fn in CACHED}
+
+
+def clear_caches() -> None:
+    for fn in CACHED:
+        fn.cache_clear()
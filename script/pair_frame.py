@@ -0,0 +1,79 @@
+# pair_frame.py
+"""
+Compact in-memory pair tables.
+
+A pair DataFrame here holds int32 identity ids (left/right), float32
+scores and bool c4..c7 flags. name_1/email_1/name_2/email_2 are pandas
+categoricals over the identity list, so a row carries small integer codes
+instead of four string references; the strings themselves exist once per
+identity. pandas writes categoricals as their values, so to_csv()/to_excel()
+expand the names only at write time.
+"""
+
+import numpy as np
+import pandas as pd
+from pair_writer import max_score_key
+from scoring import FLAG_COLUMNS, SCORE_COLUMNS, SCORE_DTYPE
+
+ID_DTYPE = np.dtype(np.int32)
+IDENTITY_COLUMNS = ("name_1", "email_1", "name_2", "email_2")
+
+
+class IdentityCodes:
+    """Category code of every identity's name and email, built once per identity list."""
+
+    def __init__(self, names, emails):
+        self.name_codes, self.names = pd.factorize(pd.Series(names, dtype=object))
+        self.email_codes, self.emails = pd.factorize(pd.Series(emails, dtype=object))
+
+    @classmethod
+    def from_table(cls, table):
+        return cls(table.raw_names, table.emails)
+
+    def column(self, ids, field: str) -> pd.Categorical:
+        """Names ("name") or emails ("email") of ``ids`` as a categorical."""
+        if field == "name":
+            return pd.Categorical.from_codes(self.name_codes[ids], categories=self.names)
+        return pd.Categorical.from_codes(self.email_codes[ids], categories=self.emails)
+
+
+def pair_frame(codes: IdentityCodes, scores, mask=None, score_dtype=SCORE_DTYPE) -> pd.DataFrame:
+    """
+    Compact DataFrame of a score dict (or of its rows where ``mask`` is True):
+    left/right ids, the identity columns as categoricals, scores as
+    ``score_dtype`` and c4..c7 if the dict has them.
+    """
+
+    def rows(values):
+        return values if mask is None else values[mask]
+
+    left = rows(np.asarray(scores["left"])).astype(ID_DTYPE, copy=False)
+    right = rows(np.asarray(scores["right"])).astype(ID_DTYPE, copy=False)
+    data = {
+        "left": left,
+        "right": right,
+        "name_1": codes.column(left, "name"),
+        "email_1": codes.column(left, "email"),
+        "name_2": codes.column(right, "name"),
+        "email_2": codes.column(right, "email"),
+    }
+    for column in SCORE_COLUMNS:
+        data[column] = rows(np.asarray(scores[column])).astype(score_dtype, copy=False)
+    for column in FLAG_COLUMNS:
+        if column in scores:
+            data[column] = rows(np.asarray(scores[column], dtype=bool))
+    return pd.DataFrame(data)
+
+
+def threshold_frame(frame: pd.DataFrame, t: float) -> pd.DataFrame:
+    """Rows of a pair frame passing the thresholding check at ``t``, via one mask."""
+    return frame[max_score_key({c: frame[c].to_numpy() for c in SCORE_COLUMNS}) >= t]
+
+
+def expand(frame: pd.DataFrame) -> pd.DataFrame:
+    """Copy with the identity columns as plain strings, e.g. for code that needs object dtype."""
+    expanded = frame.copy()
+    for column in IDENTITY_COLUMNS:
+        if column in expanded.columns:
+            expanded[column] = expanded[column].astype(object)
+    return expanded
@@ -0,0 +1,247 @@
+# pair_store.py
+"""
+Columnar, memory-mapped storage for identity and pair tables.
+
+A store is a directory of flat little-endian column files plus meta.json:
+
+    identities: names.bin/names.off, emails.bin/emails.off (UTF-8 blob + offsets)
+    pairs:      left.bin, right.bin (int32 identity ids), c1/c2/c3.1/c3.2 (float32
+                by default), flags.bin (uint8 with c4..c7 packed into bits 0..3)
+
+Readers memory-map only the columns they ask for, so loading the scores of
+millions of pairs does not parse any text. export_csv()/export_xlsx() write
+the familiar devs_similarity layout for manual labelling.
+"""
+
+import json
+import os
+from contextlib import ExitStack
+
+import numpy as np
+from pair_writer import PAIR_COLUMNS, open_pair_csv
+from scoring import FLAG_COLUMNS, SCORE_COLUMNS, add_initials_flags
+
+STORE_VERSION = 1
+ID_DTYPE = np.dtype("<i4")
+OFFSET_DTYPE = np.dtype("<i8")
+FLAG_DTYPE = np.dtype("u1")
+DEFAULT_SCORE_DTYPE = np.dtype("<f4")
+
+
+def _column_file(path, column: str) -> str:
+    return os.path.join(path, column + ".bin")
+
+
+def write_strings(path, name: str, values) -> None:
+    """Strings as one UTF-8 blob plus n+1 byte offsets."""
+    encoded = [str(v).encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=OFFSET_DTYPE)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    with open(os.path.join(path, name + ".bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    offsets.tofile(os.path.join(path, name + ".off"))
+
+
+def read_strings(path, name: str) -> np.ndarray:
+    offsets = np.fromfile(os.path.join(path, name + ".off"), dtype=OFFSET_DTYPE)
+    with open(os.path.join(path, name + ".bin"), "rb") as f:
+        blob = f.read()
+    values = [
+        blob[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    ]
+    return np.asarray(values, dtype=object)
+
+
+def pack_flags(scores) -> np.ndarray:
+    """c4..c7 of a score dict as one uint8 per pair (bit k = FLAG_COLUMNS[k])."""
+    packed = np.zeros(len(scores["left"]), dtype=FLAG_DTYPE)
+    for bit, column in enumerate(FLAG_COLUMNS):
+        packed |= np.asarray(scores[column], dtype=FLAG_DTYPE) << bit
+    return packed
+
+
+def _as_written(values) -> list:
+    """
+    Python values for CSV export. float32 scores are written in their own
+    shortest form (0.8, not 0.800000011920929); float64 ones exactly as the
+    pipeline writes them.
+    """
+    if values.dtype.itemsize < 8:
+        return values.astype(str).tolist()
+    return values.tolist()
+
+
+def unpack_flags(packed, columns=FLAG_COLUMNS):
+    return {c: (packed >> FLAG_COLUMNS.index(c)) & 1 == 1 for c in columns}
+
+
+class PairStoreWriter:
+    """
+    Append scored chunks (score dicts) to a new store at ``path``.
+
+        with PairStoreWriter(path, table) as store:
+            for scores in chunks:
+                store.append(scores)
+    """
+
+    def __init__(self, path, table, score_dtype=DEFAULT_SCORE_DTYPE):
+        self.path = str(path)
+        self.table = table
+        self.score_dtype = np.dtype(score_dtype).newbyteorder("<")
+        self.count = 0
+        self._files = {}
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta):
+            os.remove(meta)  # an unfinished store must not look complete
+        write_strings(self.path, "names", self.table.raw_names)
+        write_strings(self.path, "emails", self.table.emails)
+        for column in ("left", "right", *SCORE_COLUMNS, "flags"):
+            self._files[column] = open(_column_file(self.path, column), "wb")
+        return self
+
+    def append(self, scores) -> None:
+        if "c4" not in scores:
+            add_initials_flags(self.table, scores)
+        self._files["left"].write(np.asarray(scores["left"], dtype=ID_DTYPE).tobytes())
+        self._files["right"].write(np.asarray(scores["right"], dtype=ID_DTYPE).tobytes())
+        for column in SCORE_COLUMNS:
+            values = np.asarray(scores[column], dtype=self.score_dtype)
+            self._files[column].write(values.tobytes())
+        self._files["flags"].write(pack_flags(scores).tobytes())
+        self.count += len(scores["left"])
+
+    def __exit__(self, exc_type, exc, tb):
+        for f in self._files.values():
+            f.close()
+        if exc_type is not None:
+            return
+        meta = {
+            "version": STORE_VERSION,
+            "identities": len(self.table),
+            "pairs": self.count,
+            "dtypes": {
+                "left": ID_DTYPE.str,
+                "right": ID_DTYPE.str,
+                **{column: self.score_dtype.str for column in SCORE_COLUMNS},
+                "flags": FLAG_DTYPE.str,
+            },
+            "flag_bits": list(FLAG_COLUMNS),
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+
+
+class PairStore:
+    """Read-only view of a store; columns are memory-mapped on first use."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported pair store version in {self.path}")
+        self._names = self._emails = self._codes = None
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return self.meta["pairs"]
+
+    def column(self, column: str) -> np.ndarray:
+        """One pair column (left, right, c1..c3.2, c4..c7) without reading the others."""
+        if column in FLAG_COLUMNS:
+            return unpack_flags(self.column("flags"), [column])[column]
+        if column not in self._columns:
+            dtype = np.dtype(self.meta["dtypes"][column])
+            if len(self):
+                path = _column_file(self.path, column)
+                values = np.memmap(path, dtype=dtype, mode="r", shape=(len(self),))
+            else:
+                values = np.zeros(0, dtype=dtype)  # mmap cannot map an empty file
+            self._columns[column] = values
+        return self._columns[column]
+
+    def load(self, columns=("left", "right", *SCORE_COLUMNS)):
+        return {column: self.column(column) for column in columns}
+
+    @property
+    def names(self) -> np.ndarray:
+        if self._names is None:
+            self._names = read_strings(self.path, "names")
+        return self._names
+
+    @property
+    def emails(self) -> np.ndarray:
+        if self._emails is None:
+            self._emails = read_strings(self.path, "emails")
+        return self._emails
+
+    @property
+    def codes(self):
+        """pair_frame.IdentityCodes of the stored identities."""
+        if self._codes is None:
+            from pair_frame import IdentityCodes
+
+            self._codes = IdentityCodes(self.names, self.emails)
+        return self._codes
+
+    def to_frame(self, columns=PAIR_COLUMNS, mask=None):
+        """
+        pandas DataFrame of the requested columns; name_1/email_1/... are
+        categoricals over the stored identities (see pair_frame.py).
+        """
+        import pandas as pd
+
+        def rows(values):
+            return values if mask is None else values[mask]
+
+        data = {}
+        for column in columns:
+            if column in ("name_1", "email_1", "name_2", "email_2"):
+                ids = rows(self.column("left" if column.endswith("1") else "right"))
+                data[column] = self.codes.column(ids, column[:-2])
+            else:
+                data[column] = rows(self.column(column))
+        return pd.DataFrame(data)
+
+    def iter_rows(self, mask=None, chunk_size: int = 200_000):
+        """Rows in PAIR_COLUMNS order, as the CSV pair files have them."""
+        index = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        for start in range(0, len(index), chunk_size):
+            sel = index[start : start + chunk_size]
+            left, right = self.column("left")[sel], self.column("right")[sel]
+            scores = [_as_written(self.column(c)[sel]) for c in SCORE_COLUMNS]
+            flags = unpack_flags(self.column("flags")[sel])
+            yield from zip(
+                self.names[left],
+                self.emails[left],
+                self.names[right],
+                self.emails[right],
+                *scores,
+                *(flags[c].tolist() for c in FLAG_COLUMNS),
+            )
+
+    def export_csv(self, path, mask=None) -> int:
+        """Write the pairs (or those in ``mask``) as a devs_similarity CSV."""
+        written = 0
+        with ExitStack() as stack:
+            writer = open_pair_csv(stack, path)
+            for row in self.iter_rows(mask):
+                writer.writerow(row)
+                written += 1
+        return written
+
+    def export_xlsx(self, path, mask=None, labels=None) -> None:
+        """
+        Write the pairs (or those in ``mask``) as an xlsx for labelling. With
+        ``labels`` (a label_store.load_labels() table), pairs labelled before
+        come with their label and reason filled in.
+        """
+        frame = self.to_frame(mask=mask)
+        if labels is not None:
+            from label_store import join_labels
+
+            frame = join_labels(frame, labels)
+        frame.to_excel(path, index=False)
@@ -0,0 +1,103 @@
+# pair_writer.py
+import csv
+import os
+from contextlib import ExitStack
+
+import numpy as np
+from identity_table import IdentityTable
+from scoring import add_initials_flags, chunk_rows, passes
+
+PAIR_COLUMNS = [
+    "name_1",
+    "email_1",
+    "name_2",
+    "email_2",
+    "c1",
+    "c2",
+    "c3.1",
+    "c3.2",
+    "c4",
+    "c5",
+    "c6",
+    "c7",
+]
+
+
+def open_pair_csv(stack: ExitStack, path):
+    """
+    Open ``path`` for writing pair rows and write the header.
+
+    Uses the same quoting and line terminator as DataFrame.to_csv(), so the
+    files are byte-identical to the ones the DataFrame pipeline wrote.
+    """
+    csvfile = stack.enter_context(open(path, "w", newline="", encoding="utf-8"))
+    writer = csv.writer(csvfile, delimiter=",", quotechar='"', lineterminator=os.linesep)
+    writer.writerow(PAIR_COLUMNS)
+    return writer
+
+
+def select(scores, mask):
+    """Rows of a score dict where ``mask`` is True."""
+    return {key: values[mask] for key, values in scores.items()}
+
+
+def threshold_mask(scores, t: float):
+    # For manual labeling:
+    # Only keep strong similarity matches (c1/c2/c3),
+    # and IGNORE the looser heuristics c4..c7 here.
+    return passes(scores["c1"], scores["c2"], scores["c3.1"], scores["c3.2"], t)
+
+
+def max_score_key(scores):
+    """
+    The highest t a pair passes the thresholding check at:
+    max(c1, c2, min(c3.1, c3.2)), so threshold_mask(t) == (key >= t).
+    """
+    return np.maximum(
+        np.maximum(scores["c1"], scores["c2"]), np.minimum(scores["c3.1"], scores["c3.2"])
+    )
+
+
+def write_pair_files(table: IdentityTable, chunks, t: float, threshold_path, full_path=None):
+    """
+    Stream scored chunks to disk one chunk at a time.
+
+    Every pair goes to ``full_path`` (if given) and the pairs passing the
+    thresholding check go to ``threshold_path``, so memory stays bounded by
+    the chunk size no matter how many pairs there are.
+    Returns (pairs scored, pairs kept).
+    """
+    scored, kept = write_threshold_files(table, chunks, {t: threshold_path}, full_path)
+    return scored, kept[t]
+
+
+def write_threshold_files(
+    table: IdentityTable, chunks, threshold_paths, full_path=None, store=None
+):
+    """
+    write_pair_files() for several thresholds at once: ``threshold_paths``
+    maps each t to its file, and every chunk is scored once and split
+    between all of them (rows keep their order, so each file is identical
+    to a separate run at that t). Every pair is also appended to ``store``
+    (a pair_store.PairStoreWriter) if given.
+    Returns (pairs scored, {t: pairs kept}).
+    """
+    scored = 0
+    kept = dict.fromkeys(threshold_paths, 0)
+    with ExitStack() as stack:
+        full_writer = open_pair_csv(stack, full_path) if full_path else None
+        writers = {t: open_pair_csv(stack, path) for t, path in threshold_paths.items()}
+        for scores in chunks:
+            scored += len(scores["left"])
+            if full_writer is not None or store is not None:
+                add_initials_flags(table, scores)
+            if full_writer is not None:
+                full_writer.writerows(chunk_rows(table, scores))
+            if store is not None:
+                store.append(scores)
+            key = max_score_key(scores)
+            for t, writer in writers.items():
+                passing = select(scores, key >= t)
+                kept[t] += len(passing["left"])
+                writer.writerows(chunk_rows(table, passing))
+    return scored, kept
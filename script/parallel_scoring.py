@@ -0,0 +1,117 @@
+# parallel_scoring.py
+import multiprocessing as mp
+
+import numpy as np
+from identity_table import IdentityTable
+from scoring import (
+    DEFAULT_CHUNK_SIZE,
+    add_initials_flags,
+    identity_columns,
+    iter_scored_chunks,
+    score_batch,
+    score_triangle_rows,
+)
+
+# Shards per worker: more shards than workers keeps the pool busy when
+# some shards turn out slower than others.
+SHARDS_PER_WORKER = 4
+
+# Set once per worker process by _init_worker(), so the identity table is
+# pickled once per worker instead of once per task.
+_TABLE: IdentityTable | None = None
+_COLUMNS = None
+_PAIRS = None
+
+
+def triangle_shards(n: int, shards: int):
+    """
+    Split the upper-triangle rows 0..n-2 into ``shards`` contiguous
+    (start, stop) row ranges holding roughly the same number of pairs.
+
+    Row i has n-1-i pairs, so early shards get fewer rows. The split only
+    depends on ``n`` and ``shards``, so it is the same on every run.
+    """
+    if n < 2:
+        return []
+    total = n * (n - 1) // 2
+    per_shard = total / max(1, shards)
+    bounds = [0]
+    seen = 0
+    for i in range(n - 1):
+        seen += n - 1 - i
+        if seen >= per_shard * len(bounds) and len(bounds) < shards:
+            bounds.append(i + 1)
+    if bounds[-1] != n - 1:
+        bounds.append(n - 1)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def pair_shards(count: int, shards: int):
+    """Split ``count`` candidate pairs into ``shards`` contiguous (start, stop) slices."""
+    if count == 0:
+        return []
+    size = -(-count // max(1, shards))
+    return [(a, min(a + size, count)) for a in range(0, count, size)]
+
+
+def _init_worker(table, pairs):
+    global _TABLE, _COLUMNS, _PAIRS
+    _TABLE = table
+    _COLUMNS = identity_columns(table)
+    _PAIRS = pairs
+
+
+def _score_shard(task):
+    kind, start, stop, cutoff, chunk_size = task
+    chunks = []
+    if kind == "triangle":
+        step = max(1, chunk_size // max(1, len(_TABLE)))
+        for row in range(start, stop, step):
+            scores = score_triangle_rows(
+                _TABLE, row, min(row + step, stop), cutoff, np.float64, _COLUMNS
+            )
+            chunks.append(add_initials_flags(_TABLE, scores))
+    else:
+        left, right = _PAIRS
+        for a in range(start, stop, chunk_size):
+            b = min(a + chunk_size, stop)
+            scores = score_batch(_TABLE, left[a:b], right[a:b], cutoff, np.float64, _COLUMNS)
+            chunks.append(add_initials_flags(_TABLE, scores))
+    return chunks
+
+
+def iter_scored_chunks_parallel(
+    table: IdentityTable,
+    pairs=None,
+    cutoff=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    cache=None,
+    pruned=None,
+):
+    """
+    Same chunks, in the same order, as scoring.iter_scored_chunks(), but
+    scored by a pool of ``workers`` processes.
+
+    Shards are fixed row ranges of the upper triangle (or slices of the
+    candidate pairs) and results are consumed in shard order, so the output
+    does not depend on which worker finishes first. A similarity ``cache``
+    is only consulted, and the ``pruned`` counts (see
+    scoring.score_batch()) only kept, by serial scoring (``workers`` <= 1).
+    """
+    if workers <= 1:
+        yield from iter_scored_chunks(table, pairs, cutoff, chunk_size, cache, pruned)
+        return
+
+    shards = workers * SHARDS_PER_WORKER
+    if pairs is None:
+        tasks = [
+            ("triangle", a, b, cutoff, chunk_size) for a, b in triangle_shards(len(table), shards)
+        ]
+    else:
+        pairs = tuple(np.asarray(ids, dtype=np.int64) for ids in pairs)
+        tasks = [("pairs", a, b, cutoff, chunk_size) for a, b in pair_shards(len(pairs[0]), shards)]
+
+    with mp.get_context().Pool(workers, initializer=_init_worker, initargs=(table, pairs)) as pool:
+        for chunks in pool.imap(_score_shard, tasks):
+            yield from chunks
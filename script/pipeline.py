@@ -0,0 +1,454 @@
+# pipeline.py
+"""
+The dedup pipeline as importable stages.
+
+    stats = mine(repos)                  # devs.csv, devs_provenance.csv, devs_activity.csv
+    devs = load_devs()
+    reps, exact = exact_prepass(devs)    # optional: devs_exact_matches.csv, then score(reps)
+    outfiles = score(devs, thresholds=[0.72, 0.8])
+    sweep([0.72, 0.8])                   # devs_threshold_sweep.csv
+    cluster(devs, outfiles[0.8])         # devs_clusters.csv, devs_cluster_canonical.csv
+    result, df = evaluate()              # improved_rule against the manual labels
+
+Importing this module is cheap: pandas, numpy, rapidfuzz and PyDriller are
+only imported by the stages that use them. Every stage takes an optional
+StageMetrics and records itself there.
+"""
+
+import csv
+import os
+from contextlib import ExitStack
+
+from config import (
+    DEFAULT_MAX_BLOCK_SIZE,
+    DEFAULT_THRESHOLD,
+    LABELED_XLSX,
+    OUTPUT_DIR,
+    REPO_URL,
+)
+
+
+def _metrics(metrics):
+    if metrics is None:
+        from metrics import StageMetrics
+
+        metrics = StageMetrics()
+    return metrics
+
+
+def mine(
+    repos=(REPO_URL,),
+    output_dir=OUTPUT_DIR,
+    checkpoint: bool = True,
+    clone_cache=None,
+    workers: int = 8,
+    backend="pydriller",
+    metrics=None,
+):
+    """
+    Mine ``repos`` and write devs.csv, devs_provenance.csv and
+    devs_activity.csv to ``output_dir``. Returns the per-identity stats.
+    """
+    import mining
+
+    metrics = _metrics(metrics)
+    os.makedirs(output_dir, exist_ok=True)
+    # Mine only commits newer than the last run's checkpoint (if any)
+    checkpoint_dir = os.path.join(output_dir, "checkpoints") if checkpoint else None
+
+    print("Mining repositories:", ", ".join(repos))
+    with metrics.stage("mining") as counts:
+        stats, provenance, commit_counts = mining.mine_repositories(
+            repos, checkpoint_dir, clone_cache, workers, backend
+        )
+        counts.update(
+            repos=len(repos), commits=sum(commit_counts.values()), identities=len(provenance)
+        )
+    for repo, commits in commit_counts.items():
+        print(f"Commits traversed in {repo}: {commits}")
+
+    print(f"Total raw (name,email) pairs collected: {len(provenance)}")
+
+    with metrics.stage("write_identities") as counts:
+        devs_csv_path = os.path.join(output_dir, "devs.csv")
+        with open(devs_csv_path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile, delimiter=",", quotechar='"')
+            writer.writerow(["name", "email"])
+            for name, email in sorted(provenance):
+                writer.writerow([name, email])
+
+        # Which repositories each identity was seen in
+        provenance_csv_path = os.path.join(output_dir, "devs_provenance.csv")
+        with open(provenance_csv_path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile, delimiter=",", quotechar='"')
+            writer.writerow(["name", "email", "repo"])
+            for (name, email), identity_repos in sorted(provenance.items()):
+                for repo in identity_repos:
+                    writer.writerow([name, email, repo])
+
+        # Commit counts and first/last-seen dates per identity
+        activity_csv_path = os.path.join(output_dir, "devs_activity.csv")
+        with open(activity_csv_path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile, delimiter=",", quotechar='"')
+            writer.writerow(["name", "email", "commits", "first_seen", "last_seen"])
+            for (name, email), identity_stats in sorted(stats.items()):
+                commits, first_seen, last_seen = identity_stats.as_list()
+                writer.writerow(
+                    [name, email, commits, mining.iso_date(first_seen), mining.iso_date(last_seen)]
+                )
+        counts["identities"] = len(provenance)
+
+    print(f"Wrote unique developers to {devs_csv_path}")
+    return stats
+
+
+def load_devs(output_dir=OUTPUT_DIR, metrics=None):
+    """The developer list of devs.csv, as the pair files are scored from it."""
+    metrics = _metrics(metrics)
+    # Reload developer list from CSV so we have a clean list
+    with metrics.stage("reload_identities") as counts:
+        devs = []
+        with open(os.path.join(output_dir, "devs.csv"), "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f, delimiter=",")
+            next(reader)  # skip header
+            for row in reader:
+                devs.append(row)
+
+        # First element is header, skip (defensive)
+        devs = devs[1:]
+        counts["identities"] = len(devs)
+    return devs
+
+
+def threshold_path(output_dir, t) -> str:
+    return os.path.join(output_dir, f"devs_similarity_t={t}.csv")
+
+
+def exact_prepass(devs, output_dir=OUTPUT_DIR, metrics=None):
+    """
+    Match identities sharing an exact email, GitHub noreply id/login or full
+    name, write them to devs_exact_matches.csv and return (one representative
+    per group, the file's path), so only the representatives get scored.
+    """
+    from exact_match import ExactMatches, write_matches
+
+    metrics = _metrics(metrics)
+    path = os.path.join(output_dir, "devs_exact_matches.csv")
+    with metrics.stage("exact_prepass") as counts:
+        matches = ExactMatches(devs)
+        representatives = matches.collapsed()
+        counts.update(matches.reason_counts())
+        counts.update(pairs=write_matches(path, matches), representatives=len(representatives))
+    print(f"Exact matches: {len(matches)}  identities to score: {len(representatives)}")
+    print("Wrote:", path)
+    return representatives, path
+
+
+def score(
+    devs,
+    output_dir=OUTPUT_DIR,
+    thresholds=None,
+    *,
+    blocking: bool = False,
+    workers: int = 1,
+    full_dump: bool = True,
+    pair_store=None,
+    incremental: bool = False,
+    metrics=None,
+    sim_cache=None,
+    lsh=None,
+    exact_prepass: bool = False,
+    max_block_size=DEFAULT_MAX_BLOCK_SIZE,
+):
+    """
+    Score the pairs of ``devs`` and write devs_similarity_t=<T>.csv for every
+    threshold (default: 0.8) plus, with ``full_dump``, devs_similarity.csv.
+    With ``incremental``, the pair files of the last run are patched when it
+    wrote the same files and scored every pair of the same kind of list
+    (``exact_prepass``: representatives only); otherwise everything is scored.
+    ``sim_cache`` is the path of a similarity cache (see sim_cache.py) for
+    candidate-pair scoring; ``lsh`` a (bands, rows) pair that adds MinHash/LSH
+    candidates (see minhash_lsh.py); ``max_block_size`` caps the blocks of
+    ``blocking`` (None: no cap). Returns {threshold: path}.
+    """
+    from incremental import (
+        incremental_update,
+        read_devs,
+        read_run_state,
+        write_devs,
+        write_run_state,
+    )
+
+    metrics = _metrics(metrics)
+    thresholds = sorted(set(thresholds or [DEFAULT_THRESHOLD]))
+    print("Threshold:", ", ".join(str(t) for t in thresholds))
+
+    outfiles = {t: threshold_path(output_dir, t) for t in thresholds}
+    # Save the full unfiltered pairs (optional, for traceability)
+    full_dump = os.path.join(output_dir, "devs_similarity.csv") if full_dump else None
+
+    # The developer list the current pair files were scored from, and which
+    # files that run wrote and how it chose its pairs
+    scored_devs_path = os.path.join(output_dir, "state", "scored_devs.csv")
+    run_state_path = os.path.join(output_dir, "state", "scored_run.json")
+    pair_files = dict.fromkeys([full_dump] if full_dump else [])
+    pair_files.update({path: t for t, path in outfiles.items()})
+    mode = {"blocking": blocking, "lsh": list(lsh) if lsh else None, "exact_prepass": exact_prepass}
+    files = sorted(os.path.basename(path) for path in pair_files)
+    last_run = read_run_state(run_state_path)
+    can_patch = (
+        last_run == {"files": files, "mode": mode}
+        # blocking keys and LSH buckets depend on the whole list, so only an
+        # all-pairs run can be patched pair by pair
+        and not (blocking or lsh)
+        and os.path.exists(scored_devs_path)
+        and all(map(os.path.exists, pair_files))
+    )
+    if pair_store and incremental:
+        print("--pair-store needs a full run: --incremental ignored")
+    if pair_store:
+        can_patch = False  # the store is only written by a full run
+
+    cache = None
+    if sim_cache and workers > 1:
+        print("Similarity cache not used with --workers > 1")
+    elif sim_cache and not (blocking or lsh or (incremental and can_patch)):
+        # all-pairs scoring goes through the dense triangle blocks, not pair lists
+        print(
+            "Similarity cache not used without candidate pairs (--blocking, --lsh, --incremental)"
+        )
+    elif sim_cache:
+        from sim_cache import SimilarityCache
+
+        cache = SimilarityCache(sim_cache)
+
+    try:
+        if incremental and can_patch:
+            with metrics.stage("incremental") as counts:
+                added, removed, scored = incremental_update(
+                    devs, read_devs(scored_devs_path), pair_files, workers=workers, cache=cache
+                )
+                counts.update(added=len(added), removed=len(removed), pairs_scored=scored)
+            print(f"Identities added: {len(added)}  removed: {len(removed)}")
+            print("New pairs scored:", scored)
+            for path in sorted(pair_files):
+                print("Patched:", path)
+        else:
+            if incremental:
+                print("Pair files not patchable (different files or scoring mode): scoring all")
+            score_all(
+                devs,
+                outfiles,
+                full_dump=full_dump,
+                blocking=blocking,
+                workers=workers,
+                pair_store=pair_store,
+                metrics=metrics,
+                cache=cache,
+                lsh=lsh,
+                max_block_size=max_block_size,
+            )
+    finally:
+        if cache is not None:
+            # writing new scores back is part of the cache's cost
+            with metrics.stage("sim_cache") as counts:
+                cache.close()
+                counts.update(cache.stats())
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"Similarity cache: {stats['lookups']} lookups, hit rate {stats['hit_rate']:.1%}"
+            f" ({stats['hits_memory']} memory, {stats['hits_disk']} disk), "
+            f"{stats['evicted']} evicted" + (", invalidated" if stats["invalidated"] else "")
+        )
+
+    write_devs(scored_devs_path, devs)
+    write_run_state(run_state_path, files, mode)
+    return outfiles
+
+
+def score_all(
+    devs,
+    outfiles,
+    *,
+    full_dump=None,
+    blocking=False,
+    workers=1,
+    pair_store=None,
+    metrics=None,
+    cache=None,
+    lsh=None,
+    max_block_size=DEFAULT_MAX_BLOCK_SIZE,
+):
+    """
+    Score every (or every blocked) pair of ``devs`` once and write the pair
+    files: ``outfiles`` maps each threshold to its devs_similarity_t= file.
+    ``cache`` (a SimilarityCache) is consulted for blocked pairs, whose
+    blocks hold at most ``max_block_size`` identities. With
+    ``lsh`` = (bands, rows), MinHash/LSH candidates are scored as well as
+    (or, without ``blocking``, instead of) the blocked ones.
+    """
+    from blocking import BlockingIndex
+    from identity_table import IdentityTable
+    from metrics import timed
+    from pair_store import PairStoreWriter
+    from pair_writer import write_threshold_files
+    from parallel_scoring import iter_scored_chunks_parallel
+
+    metrics = _metrics(metrics)
+    # --- Normalize every developer once, indexed by integer id ---
+    with metrics.stage("normalization") as counts:
+        identities = IdentityTable(devs)
+        counts["identities"] = len(identities)
+
+    # --- Candidate pairs: all pairs, or only those sharing a blocking key ---
+    if blocking:
+        with metrics.stage("blocking") as counts:
+            index = BlockingIndex(identities, max_block_size=max_block_size)
+            pairs = index.candidate_arrays()
+            counts["candidate_pairs"] = len(pairs[0])
+            counts["skipped_blocks"] = len(index.skipped_blocks())
+        print(f"Candidate pairs after blocking: {len(pairs[0])}")
+    else:
+        pairs = None  # every pair, in combinations() order
+
+    # --- Approximate candidates for fuzzy names/prefixes that share no key ---
+    if lsh:
+        from minhash_lsh import MinHashLSH, union_pairs
+
+        with metrics.stage("lsh") as counts:
+            found = MinHashLSH(identities, *lsh).candidate_arrays()
+            counts["lsh_pairs"] = len(found[0])
+            pairs = found if pairs is None else union_pairs(len(identities), pairs, found)
+            counts["candidate_pairs"] = len(pairs[0])
+        print(f"Candidate pairs after LSH {lsh[0]}x{lsh[1]}: {len(pairs[0])}")
+
+    # --- Score pairs chunk by chunk and stream them to disk ---
+    # Without the full dump, ratios below the lowest t can be abandoned early.
+    # Candidate pairs that provably miss it are pruned before any ratio.
+    pruned = {}
+    with metrics.stage("scoring_and_writing") as counts:
+        chunks = iter_scored_chunks_parallel(
+            identities,
+            pairs,
+            cutoff=None if full_dump or pair_store else min(outfiles),
+            workers=workers,
+            cache=cache,
+            pruned=pruned,
+        )
+        # time spent producing chunks = Levenshtein scoring; the rest is writing
+        chunks = timed(chunks, counts, "scoring_s")
+        with ExitStack() as stack:
+            store = None
+            if pair_store:
+                store = stack.enter_context(PairStoreWriter(pair_store, identities))
+            scored, kept = write_threshold_files(identities, chunks, outfiles, full_dump, store)
+        counts["pairs_scored"] = scored
+        counts.update({f"pairs_kept_t={t}": n for t, n in kept.items()})
+        counts.update({f"pruned_{bound}": n for bound, n in pruned.items()})
+
+    if pruned:
+        print("Pairs pruned by bound:", ", ".join(f"{b} {n}" for b, n in pruned.items()))
+    if full_dump:
+        print("Pairs in full dump:", scored)
+    for t, outfile in outfiles.items():
+        print(f"Pairs after thresholding at {t}:", kept[t])
+        print("Wrote:", outfile)
+    if pair_store:
+        print("Wrote pair store:", pair_store)
+
+
+def sweep(thresholds=None, labels=LABELED_XLSX, output_dir=OUTPUT_DIR, metrics=None):
+    """
+    Precision/recall/F1 of every threshold on the labelled pairs, printed and
+    written to devs_threshold_sweep.csv. Returns the table rows.
+    """
+    from threshold_sweep import (
+        DEFAULT_THRESHOLDS,
+        print_sweep,
+        read_labels,
+        sweep_metrics,
+        write_sweep_report,
+    )
+
+    metrics = _metrics(metrics)
+    thresholds = sorted(set(thresholds or DEFAULT_THRESHOLDS))
+    sweep_path = os.path.join(output_dir, "devs_threshold_sweep.csv")
+    with metrics.stage("threshold_sweep") as counts:
+        keys, is_tp = read_labels(labels)
+        rows = sweep_metrics(keys, is_tp, thresholds)
+        counts.update(labelled_pairs=len(keys), thresholds=len(thresholds))
+    print_sweep(rows)
+    write_sweep_report(sweep_path, rows)
+    print("Wrote:", sweep_path)
+    return rows
+
+
+def commit_weights(devs, output_dir=OUTPUT_DIR):
+    """Commit count per identity from devs_activity.csv, or None without one."""
+    from clustering import read_commit_weights
+
+    activity_csv = os.path.join(output_dir, "devs_activity.csv")
+    return read_commit_weights(activity_csv, devs) if os.path.exists(activity_csv) else None
+
+
+def cluster(
+    devs,
+    pair_file,
+    output_dir=OUTPUT_DIR,
+    *,
+    weights=None,
+    accept=None,
+    metrics=None,
+    exact_matches=None,
+    pair_store=None,
+    threshold=DEFAULT_THRESHOLD,
+):
+    """
+    Group identities linked by a pair of ``pair_file`` (or of the
+    ``exact_matches`` file) into people and write devs_clusters.csv and
+    devs_cluster_canonical.csv. Returns the cluster ids.
+
+    With ``pair_store`` (a store written by score(), see pair_store.py), the
+    pairs passing ``threshold`` are read from its id and score columns
+    instead of parsing ``pair_file``, unless an ``accept`` column is asked for.
+    """
+    from clustering import cluster_pairs, read_pair_chunks, store_pair_ids, write_clusters
+
+    metrics = _metrics(metrics)
+    store = None
+    if pair_store and accept is None:
+        if os.path.exists(os.path.join(pair_store, "meta.json")):
+            from pair_store import PairStore
+
+            store = PairStore(pair_store)
+        else:
+            print("No pair store in", pair_store, "- reading", pair_file)
+    with metrics.stage("clustering") as counts:
+        linked = read_pair_chunks(exact_matches) if exact_matches else ()
+        if store is not None:
+            ids = store_pair_ids(devs, store, threshold)
+            clusters = cluster_pairs(devs, (), linked_chunks=linked, id_chunks=ids)
+        else:
+            clusters = cluster_pairs(devs, read_pair_chunks(pair_file, accept), accept, linked)
+        paths = write_clusters(output_dir, devs, clusters, weights)
+        counts.update(identities=len(devs), clusters=int(clusters.max(initial=-1)) + 1)
+    for path in paths:
+        print("Wrote:", path)
+    return clusters
+
+
+def evaluate(labels=LABELED_XLSX, metrics=None):
+    """
+    improved_rule against the manual labels: (confusion counts and
+    precision/recall/F1, the labelled pairs with the rule's features).
+    """
+    from label_store import load_labels
+    from score_improved_rule import add_rule_predictions, evaluate_rule
+
+    metrics = _metrics(metrics)
+    with metrics.stage("evaluate") as counts:
+        df = add_rule_predictions(load_labels(labels))
+        result = evaluate_rule(df)
+        counts.update(labelled_pairs=result["labeled"])
+    return result, df
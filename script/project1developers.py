@@ -1,217 +1,121 @@
-import csv
+import argparse
 import os
-import string
-import unicodedata
-from itertools import combinations
 
-import pandas as pd
-from Levenshtein import ratio as sim
-from pydriller import Repository
-
-# === CONFIG ===
-REPO_URL = "https://github.com/public-apis/public-apis"
-OUTPUT_DIR = "project1devs"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-DEVS = set()
-
-print("Mining repository:", REPO_URL)
-for commit in Repository(REPO_URL).traverse_commits():
-    # author
-    DEVS.add((commit.author.name, commit.author.email))
-    # committer (can be different person)
-    DEVS.add((commit.committer.name, commit.committer.email))
-
-print(f"Total raw (name,email) pairs collected: {len(DEVS)}")
-
-devs_csv_path = os.path.join(OUTPUT_DIR, "devs.csv")
-with open(devs_csv_path, "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile, delimiter=",", quotechar='"')
-    writer.writerow(["name", "email"])
-    for name, email in sorted(DEVS):
-        writer.writerow([name, email])
-
-print(f"Wrote unique developers to {devs_csv_path}")
-
-# Reload developer list from CSV so we have a clean list
-DEVS = []
-with open(devs_csv_path, "r", newline="", encoding="utf-8") as csvfile:
-    reader = csv.reader(csvfile, delimiter=",")
-    next(reader)  # skip header
-    for row in reader:
-        DEVS.append(row)
-
-# First element is header, skip (defensive)
-DEVS = DEVS[1:]
-
-
-# --- Helper: normalize a developer (name/email) ---
-def process(dev):
-    """
-    Takes a dev row [name, email] and returns:
-    normalized full name,
-    first name,
-    last name,
-    first initial,
-    last initial,
-    original email,
-    email prefix (before @)
-    """
-    name: str = dev[0]
-
-    # Remove punctuation
-    trans = name.maketrans("", "", string.punctuation)
-    name = name.translate(trans)
-
-    # Remove accents/diacritics
-    name = unicodedata.normalize("NFKD", name)
-    name = "".join([c for c in name if not unicodedata.combining(c)])
+import pipeline
+from cli import add_mining_arguments, add_scoring_arguments, repo_list, resolve_output_paths
+from config import LABELED_XLSX, OUTPUT_DIR
+from metrics import StageMetrics, profiled
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mine developers and apply the Bird heuristic.")
+    add_mining_arguments(parser)
+    add_scoring_arguments(parser)
+    parser.add_argument(
+        "--labels",
+        default=LABELED_XLSX,
+        metavar="XLSX",
+        help="with --thresholds, write precision/recall/F1 per T on these labelled pairs "
+        "to devs_threshold_sweep.csv (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cluster",
+        action="store_true",
+        help="group the thresholded pairs into people (devs_clusters.csv, "
+        "devs_cluster_canonical.csv)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="JSON",
+        help="write per-stage timings, peak memory and counts here "
+        f"(default: {OUTPUT_DIR}/run_metrics.json)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PROF",
+        help="run under cProfile, save the stats to PROF and print the top entries",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="also record the peak Python allocation of each stage (slower)",
+    )
+    args = parser.parse_args(argv)
+    resolve_output_paths(args, OUTPUT_DIR)
+    return args
 
-    # Lowercase
-    name = name.casefold()
 
-    # Collapse whitespace
-    name = " ".join(name.split())
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    # Split into first / last
-    parts = name.split(" ")
-    if len(parts) == 2:
-        first, last = parts
-    elif len(parts) == 1:
-        first, last = name, ""
+    metrics = StageMetrics(trace_memory=args.tracemalloc)
+    if args.profile:
+        with profiled(args.profile):
+            run(args, metrics)
     else:
-        first, last = parts[0], " ".join(parts[1:])
-
-    # initials
-    i_first = first[0] if len(first) > 1 else ""
-    i_last = last[0] if len(last) > 1 else ""
-
-    # email + prefix
-    email: str = dev[1]
-    prefix = email.split("@")[0]
-
-    return name, first, last, i_first, i_last, email, prefix
-
-
-# --- Build all pairwise similarity rows ---
-SIMILARITY = []
-for dev_a, dev_b in combinations(DEVS, 2):
-    # Pre-process both developers
-    (
-        name_a,
-        first_a,
-        last_a,
-        i_first_a,
-        i_last_a,
-        email_a,
-        prefix_a,
-    ) = process(dev_a)
-
-    (
-        name_b,
-        first_b,
-        last_b,
-        i_first_b,
-        i_last_b,
-        email_b,
-        prefix_b,
-    ) = process(dev_b)
-
-    # Bird-style heuristic similarity signals
-    c1 = sim(name_a, name_b)  # full normalized name similarity
-    c2 = sim(prefix_b, prefix_a)  # email prefix similarity
-    c31 = sim(first_a, first_b)  # first name similarity
-    c32 = sim(last_a, last_b)  # last name similarity
-
-    # Boolean heuristic checks based on initials in email usernames
-    c4 = c5 = c6 = c7 = False
-
-    # If we have enough info, check if email prefix embeds initials + lastname, etc.
-    if i_first_a != "" and last_a != "":
-        c4 = i_first_a in prefix_b and last_a in prefix_b
-    if i_last_a != "":
-        c5 = i_last_a in prefix_b and first_a in prefix_b
-    if i_first_b != "" and last_b != "":
-        c6 = i_first_b in prefix_a and last_b in prefix_a
-    if i_last_b != "":
-        c7 = i_last_b in prefix_a and first_b in prefix_a
-
-    # Save row (use ORIGINAL names/emails for labeling)
-    SIMILARITY.append(
-        [
-            dev_a[0],
-            email_a,
-            dev_b[0],
-            email_b,
-            c1,
-            c2,
-            c31,
-            c32,
-            c4,
-            c5,
-            c6,
-            c7,
-        ]
+        run(args, metrics)
+    metrics.close()
+
+    metrics_path = args.metrics or os.path.join(OUTPUT_DIR, "run_metrics.json")
+    metrics.write_json(metrics_path)
+    metrics.print_summary()
+    print("Wrote:", metrics_path)
+
+
+def run(args, metrics: StageMetrics):
+    """The pipeline itself; every stage is recorded in ``metrics``."""
+    stats = pipeline.mine(
+        repo_list(args),
+        OUTPUT_DIR,
+        args.checkpoint,
+        args.clone_cache,
+        args.mine_workers,
+        args.backend,
+        metrics,
+    )
+    devs = pipeline.load_devs(OUTPUT_DIR, metrics)
+
+    # --- Identities sharing an exact key need no fuzzy scoring among themselves ---
+    scored_devs, exact_matches = devs, None
+    if args.exact_prepass:
+        scored_devs, exact_matches = pipeline.exact_prepass(devs, OUTPUT_DIR, metrics)
+
+    # --- Thresholding phase for manual labeling set ---
+    outfiles = pipeline.score(
+        scored_devs,
+        OUTPUT_DIR,
+        args.thresholds,
+        blocking=args.blocking,
+        workers=args.workers,
+        full_dump=args.full_dump,
+        pair_store=args.pair_store,
+        incremental=args.incremental,
+        metrics=metrics,
+        sim_cache=args.sim_cache,
+        lsh=args.lsh,
+        exact_prepass=args.exact_prepass,
+        max_block_size=args.max_block_size or None,
     )
 
-# --- Build dataframe of all pairs ---
-cols = [
-    "name_1",
-    "email_1",
-    "name_2",
-    "email_2",
-    "c1",
-    "c2",
-    "c3.1",
-    "c3.2",
-    "c4",
-    "c5",
-    "c6",
-    "c7",
-]
-df = pd.DataFrame(SIMILARITY, columns=cols)
-
-# Save the full unfiltered pairs (optional, for traceability)
-df.to_csv(
-    os.path.join(OUTPUT_DIR, "devs_similarity.csv"),
-    index=False,
-    header=True,
-)
-
-# --- Thresholding phase for manual labeling set ---
-t = 0.8
-print("Threshold:", t)
-
-# High-confidence checks (numerical scores)
-df["c1_check"] = df["c1"] >= t
-df["c2_check"] = df["c2"] >= t
-df["c3_check"] = (df["c3.1"] >= t) & (df["c3.2"] >= t)
-
-# For manual labeling:
-# Only keep strong similarity matches (c1/c2/c3),
-# and IGNORE the looser heuristics c4..c7 here.
-df = df[df[["c1_check", "c2_check", "c3_check"]].any(axis=1)]
-
-# Drop helper columns before saving final CSV
-df = df[
-    [
-        "name_1",
-        "email_1",
-        "name_2",
-        "email_2",
-        "c1",
-        "c2",
-        "c3.1",
-        "c3.2",
-        "c4",
-        "c5",
-        "c6",
-        "c7",
-    ]
-]
-
-print("Pairs after thresholding:", len(df))
-
-outfile = os.path.join(OUTPUT_DIR, f"devs_similarity_t={t}.csv")
-df.to_csv(outfile, index=False, header=True)
-print("Wrote:", outfile)
+    # --- Precision/recall of every threshold on the labelled pairs ---
+    if args.thresholds and os.path.exists(args.labels):
+        pipeline.sweep(list(outfiles), args.labels, OUTPUT_DIR, metrics)
+
+    # --- Identities linked by a thresholded pair belong to one person ---
+    if args.cluster:
+        weights = [stats[tuple(dev)].commits for dev in devs]
+        pipeline.cluster(
+            devs,
+            outfiles[max(outfiles)],
+            OUTPUT_DIR,
+            weights=weights,
+            metrics=metrics,
+            exact_matches=exact_matches,
+            pair_store=args.pair_store,
+            threshold=max(outfiles),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# pruning.py
+"""
+Exact upper bounds on the Levenshtein ratio, for pruning before scoring.
+
+The ratio of strings a and b is 2 * LCS(a, b) / (len(a) + len(b)) (1.0 for
+two empty strings), and the longest common subsequence is at most
+    min(len(a), len(b))                    the length bound
+    sum over c of min(a.count(c), b.count(c))   the bag bound
+The bag bound is computed on character counts folded into BUCKETS buckets,
+which can only raise it, so it stays an upper bound. A pair is pruned when
+the bounds show that c1, c2 and (c3.1 and c3.2) are all below the
+threshold: such a pair cannot pass, so pruning never changes the
+thresholded output. The c4..c7 flags are not involved.
+"""
+
+import numpy as np
+from identity_table import IdentityTable
+
+BUCKETS = 32
+# bounds are compared with a little slack, so rounding in rapidfuzz's
+# 1 - distance / total can never turn a kept score into a pruned one
+_SLACK = 1e-9
+BOUND_NAMES = ("length", "bag")
+
+
+def _bucket_counts(strings) -> tuple[np.ndarray, np.ndarray]:
+    """(lengths, n x BUCKETS character counts by code point % BUCKETS) of ``strings``."""
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    codes = np.frombuffer("".join(strings).encode("utf-32-le"), dtype=np.uint32)
+    owner = np.repeat(np.arange(len(strings), dtype=np.int64), lengths)
+    counts = np.bincount(owner * BUCKETS + codes % BUCKETS, minlength=len(strings) * BUCKETS)
+    dtype = np.uint8 if counts.max(initial=0) <= np.iinfo(np.uint8).max else np.uint16
+    return lengths, counts.reshape(len(strings), BUCKETS).astype(dtype)
+
+
+def _ratio_bound(common, total):
+    """2 * common / total, with 1.0 where both strings are empty."""
+    return np.where(total == 0, 1.0, 2 * common / np.maximum(total, 1))
+
+
+class BoundsIndex:
+    """Lengths and bucketed character counts of the four scored fields of a table."""
+
+    def __init__(self, table: IdentityTable):
+        self.size = len(table)
+        # same strings and order as scoring.identity_columns(): c1, c2, c3.1, c3.2
+        fields = (table.names, table.prefixes, table.firsts, table.lasts)
+        self.lengths, self.counts = zip(*map(_bucket_counts, fields))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def length_bound(self, field: int, left, right):
+        a, b = self.lengths[field][left], self.lengths[field][right]
+        return _ratio_bound(np.minimum(a, b), a + b)
+
+    def bag_bound(self, field: int, left, right):
+        counts = self.counts[field]
+        common = np.minimum(counts[left], counts[right]).sum(axis=1, dtype=np.int64)
+        return _ratio_bound(common, self.lengths[field][left] + self.lengths[field][right])
+
+    def prune(self, left, right, t: float, counts=None) -> np.ndarray:
+        """
+        Mask of the pairs (left[k], right[k]) that may still pass the check
+        at ``t``. ``counts``, if given, gets the number of pairs each bound
+        eliminated added to its "length" and "bag" entries.
+        """
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        t = t - _SLACK
+        # 1. length bounds: plain integer arithmetic on all pairs
+        fits = [self.length_bound(f, left, right) >= t for f in range(4)]
+        keep = fits[0] | fits[1] | (fits[2] & fits[3])
+        rows = np.flatnonzero(keep)
+
+        # 2. bag bounds on the survivors, field by field, each only where
+        # the pair is not yet known to be possible
+        maybe = np.zeros(len(rows), dtype=bool)
+        todo = np.arange(len(rows))
+        for field in (0, 1):
+            todo = todo[fits[field][rows[todo]]]
+            ids = rows[todo]
+            maybe[todo[self.bag_bound(field, left[ids], right[ids]) >= t]] = True
+            todo = np.flatnonzero(~maybe)
+        todo = todo[fits[2][rows[todo]] & fits[3][rows[todo]]]
+        for field in (2, 3):
+            ids = rows[todo]
+            todo = todo[self.bag_bound(field, left[ids], right[ids]) >= t]
+        maybe[todo] = True
+        keep[rows[~maybe]] = False
+
+        if counts is not None:
+            counts["length"] = counts.get("length", 0) + len(left) - len(rows)
+            counts["bag"] = counts.get("bag", 0) + len(rows) - int(maybe.sum())
+        return keep
+
+
+def bounds_for(table: IdentityTable) -> BoundsIndex:
+    """The table's BoundsIndex, (re)built when missing or identities were appended since."""
+    if table.bounds is None or len(table.bounds) != len(table):
+        table.bounds = BoundsIndex(table)
+    return table.bounds
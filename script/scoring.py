@@ -0,0 +1,277 @@
+# scoring.py
+import numpy as np
+from identity_table import IdentityTable
+from initials_index import FLAG_COLUMNS, index_for  # noqa: F401 - FLAG_COLUMNS re-exported
+from pruning import bounds_for
+from rapidfuzz.distance import Indel
+from rapidfuzz.process import cdist, cpdist
+
+# Levenshtein.ratio is rapidfuzz's normalized Indel similarity
+_SCORER = Indel.normalized_similarity
+# rapidfuzz turns the cutoff into an integer distance bound, which can drop
+# scores that land exactly on it (0.8 for a 4/5 match), so prefilter with a
+# little slack and apply the real threshold to the exact rescored values.
+_CUTOFF_SLACK = 1e-6
+
+SCORE_COLUMNS = ("c1", "c2", "c3.1", "c3.2")
+SCORE_DTYPE = np.float32
+DEFAULT_CHUNK_SIZE = 200_000
+
+
+def _prefilter_cutoff(cutoff):
+    return None if cutoff is None else max(0.0, cutoff - _CUTOFF_SLACK)
+
+
+def _ratios(a, b, cutoff=None):
+    """Element-wise Levenshtein ratio of two equal-length string sequences."""
+    if len(a) == 0:
+        return np.zeros(0, dtype=np.float64)
+    return cpdist(a, b, scorer=_SCORER, score_cutoff=cutoff, dtype=np.float64)
+
+
+def _matrix(a, b, cutoff=None):
+    """Levenshtein ratio of every string in ``a`` against every string in ``b``."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    return cdist(a, b, scorer=_SCORER, score_cutoff=cutoff, dtype=np.float64)
+
+
+def passes(c1, c2, c31, c32, t):
+    """The thresholding check: c1 >= t, c2 >= t, or c3.1 >= t and c3.2 >= t."""
+    return (c1 >= t) | (c2 >= t) | ((c31 >= t) & (c32 >= t))
+
+
+def identity_columns(table: IdentityTable):
+    """name/prefix/first/last as object arrays, so id arrays can gather strings."""
+    return (
+        np.asarray(table.names, dtype=object),
+        np.asarray(table.prefixes, dtype=object),
+        np.asarray(table.firsts, dtype=object),
+        np.asarray(table.lasts, dtype=object),
+    )
+
+
+def _finish(scores, cutoff, dtype):
+    """Keep the rows passing ``cutoff`` (if any) and cast the score columns to ``dtype``."""
+    if cutoff is not None:
+        keep = passes(scores["c1"], scores["c2"], scores["c3.1"], scores["c3.2"], cutoff)
+        scores = {key: values[keep] for key, values in scores.items()}
+    for col in SCORE_COLUMNS:
+        scores[col] = scores[col].astype(dtype, copy=False)
+    return scores
+
+
+def _exact_scores(columns, left, right, cutoff, dtype):
+    names, prefixes, firsts, lasts = columns
+    scores = {
+        "left": left,
+        "right": right,
+        "c1": _ratios(names[left], names[right]),  # full normalized name similarity
+        "c2": _ratios(prefixes[right], prefixes[left]),  # email prefix similarity
+        "c3.1": _ratios(firsts[left], firsts[right]),  # first name similarity
+        "c3.2": _ratios(lasts[left], lasts[right]),  # last name similarity
+    }
+    return _finish(scores, cutoff, dtype)
+
+
+def _cached_scores(columns, left, right, cutoff, dtype, cache):
+    """
+    _exact_scores() with every ratio looked up in ``cache`` before it is
+    computed. Under a cutoff, c3.2 is only needed where c1, c2 or c3.1 reach it.
+    """
+    names, prefixes, firsts, lasts = columns
+    c1 = cache.ratios(names[left], names[right])
+    c2 = cache.ratios(prefixes[right], prefixes[left])
+    c31 = cache.ratios(firsts[left], firsts[right])
+    if cutoff is not None:
+        maybe = (c1 >= cutoff) | (c2 >= cutoff) | (c31 >= cutoff)
+        left, right, c1, c2, c31 = (values[maybe] for values in (left, right, c1, c2, c31))
+    scores = {"left": left, "right": right, "c1": c1, "c2": c2, "c3.1": c31}
+    scores["c3.2"] = cache.ratios(lasts[left], lasts[right])
+    return _finish(scores, cutoff, dtype)
+
+
+def score_batch(
+    table: IdentityTable,
+    left,
+    right,
+    cutoff=None,
+    dtype=SCORE_DTYPE,
+    columns=None,
+    cache=None,
+    pruned=None,
+):
+    """
+    Score a chunk of candidate pairs (``left[k]``, ``right[k]``) in one go.
+
+    Returns a dict with the "left"/"right" id arrays and the c1, c2, c3.1 and
+    c3.2 scores as arrays of ``dtype``.
+
+    With ``cutoff`` set, only pairs that pass the thresholding check are
+    returned. Pairs whose length/character-bag bounds (pruning.py) rule
+    them out are dropped first, counted into ``pruned`` if given. Ratios
+    below the cutoff are abandoned early, c3.2 is only computed where c3.1
+    passes, and the survivors are rescored exactly so the returned values
+    match the unfiltered ones.
+
+    ``cache`` is an optional sim_cache.SimilarityCache consulted for every
+    ratio before it is computed; the early-abandoning prefilter is skipped
+    then, since only exact scores can be cached.
+    """
+    left = np.asarray(left, dtype=np.int64)
+    right = np.asarray(right, dtype=np.int64)
+    columns = columns if columns is not None else identity_columns(table)
+    names, prefixes, firsts, lasts = columns
+
+    if cutoff is not None:
+        keep = bounds_for(table).prune(left, right, cutoff, pruned)
+        left, right = left[keep], right[keep]
+    if cache is not None:
+        return _cached_scores(columns, left, right, cutoff, dtype, cache)
+    if cutoff is not None:
+        pre = _prefilter_cutoff(cutoff)
+        c1 = _ratios(names[left], names[right], pre)
+        c2 = _ratios(prefixes[right], prefixes[left], pre)
+        c31 = _ratios(firsts[left], firsts[right], pre)
+        c3_rows = np.flatnonzero(c31 > 0)
+        c32 = np.zeros(len(left), dtype=np.float64)
+        c32[c3_rows] = _ratios(lasts[left[c3_rows]], lasts[right[c3_rows]], pre)
+        keep = passes(c1, c2, c31, c32, pre)
+        left, right = left[keep], right[keep]
+
+    return _exact_scores(columns, left, right, cutoff, dtype)
+
+
+def score_triangle_rows(
+    table: IdentityTable, start: int, stop: int, cutoff=None, dtype=SCORE_DTYPE, columns=None
+):
+    """
+    Score every pair (i, j) with start <= i < stop and j > i.
+
+    Same result as score_batch() over those pairs, in combinations() order,
+    but each column is computed as one dense block against the rest of the
+    table, which lets rapidfuzz preprocess every string only once.
+    """
+    columns = columns if columns is not None else identity_columns(table)
+    n = len(table)
+    stop = min(stop, n - 1)
+    if start >= stop:
+        empty = np.zeros(0, dtype=np.int64)
+        return _exact_scores(columns, empty, empty, cutoff, dtype)
+
+    # local (row, col) -> ids (start + row, start + 1 + col), kept where col >= row
+    rows, cols = np.triu_indices(stop - start, k=0, m=n - start - 1)
+    left = rows.astype(np.int64) + start
+    right = cols.astype(np.int64) + start + 1
+
+    pre = _prefilter_cutoff(cutoff)
+    names, prefixes, firsts, lasts = columns
+    block = slice(start, stop)
+    rest = slice(start + 1, n)
+    c1 = _matrix(names[block], names[rest], pre)[rows, cols]
+    c2 = _matrix(prefixes[rest], prefixes[block], pre).T[rows, cols]
+    c31 = _matrix(firsts[block], firsts[rest], pre)[rows, cols]
+    c32 = _matrix(lasts[block], lasts[rest], pre)[rows, cols]
+
+    if cutoff is None:
+        # no cutoff: the dense blocks already hold the exact values
+        scores = {"left": left, "right": right, "c1": c1, "c2": c2, "c3.1": c31, "c3.2": c32}
+        for col in SCORE_COLUMNS:
+            scores[col] = scores[col].astype(dtype, copy=False)
+        return scores
+
+    keep = passes(c1, c2, c31, c32, pre)
+    return _exact_scores(columns, left[keep], right[keep], cutoff, dtype)
+
+
+def all_pairs(n: int):
+    """Upper-triangle (left, right) id arrays in combinations() order."""
+    return np.triu_indices(n, k=1)
+
+
+def rows_per_block(n: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Number of triangle rows whose pairs fit (roughly) into one chunk."""
+    return max(1, chunk_size // max(1, n))
+
+
+def iter_scored_chunks(
+    table: IdentityTable,
+    pairs=None,
+    cutoff=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    cache=None,
+    pruned=None,
+):
+    """
+    Yield score dicts (float64, so written values do not change) chunk by chunk.
+
+    ``pairs`` is an optional (left, right) pair of id sequences; without it
+    every pair of the table is scored, block of triangle rows by block.
+    ``cache`` and ``pruned`` (see score_batch()) only apply to ``pairs``:
+    the dense triangle blocks are cheaper to compute than to look up or
+    to bound first.
+    """
+    columns = identity_columns(table)
+    if pairs is None:
+        n = len(table)
+        step = rows_per_block(n, chunk_size)
+        for start in range(0, n - 1, step):
+            yield score_triangle_rows(table, start, start + step, cutoff, np.float64, columns)
+        return
+
+    left, right = (np.asarray(ids, dtype=np.int64) for ids in pairs)
+    for start in range(0, len(left), chunk_size):
+        yield score_batch(
+            table,
+            left[start : start + chunk_size],
+            right[start : start + chunk_size],
+            cutoff,
+            np.float64,
+            columns,
+            cache,
+            pruned,
+        )
+
+
+def add_initials_flags(table: IdentityTable, scores):
+    """Add the boolean c4..c7 columns of every pair in ``scores`` (in place)."""
+    scores.update(index_for(table).flags(scores["left"], scores["right"]))
+    return scores
+
+
+def chunk_rows(table: IdentityTable, scores):
+    """Expand a score dict into the same rows as identity_table.score_pair()."""
+    if "c4" not in scores:
+        add_initials_flags(table, scores)
+    for a, b, c1, c2, c31, c32, c4, c5, c6, c7 in zip(
+        scores["left"].tolist(),
+        scores["right"].tolist(),
+        scores["c1"].tolist(),
+        scores["c2"].tolist(),
+        scores["c3.1"].tolist(),
+        scores["c3.2"].tolist(),
+        scores["c4"].tolist(),
+        scores["c5"].tolist(),
+        scores["c6"].tolist(),
+        scores["c7"].tolist(),
+    ):
+        yield [
+            table.raw_names[a],
+            table.emails[a],
+            table.raw_names[b],
+            table.emails[b],
+            c1,
+            c2,
+            c31,
+            c32,
+            c4,
+            c5,
+            c6,
+            c7,
+        ]
+
+
+def score_rows(table: IdentityTable, pairs=None, cutoff=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Rows as produced by identity_table.score_pair(), via the batch kernel."""
+    for scores in iter_scored_chunks(table, pairs, cutoff, chunk_size):
+        yield from chunk_rows(table, scores)
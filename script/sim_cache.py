@@ -0,0 +1,241 @@
+# sim_cache.py
+"""
+Persistent cache of string similarities.
+
+Scores are keyed by the metric and the order-independent pair of
+normalized strings, so the same two names met again (in another chunk, on
+another candidate pair, or in a later run over an overlapping developer
+list) are not rescored. Entries live in an SQLite file, indexed by a 64-bit
+hash of the key, with a bounded in-memory LRU in front of it. Each row also
+stores the key itself, checked on read, so a hash collision is a miss and
+never a wrong score.
+
+The file records a version derived from process() and the scorer; when
+either changes, the stored scores may no longer correspond to the strings
+the table produces and the cache starts over. The file is capped at
+``max_entries`` rows; the entries least recently used (counted in runs)
+are evicted first.
+"""
+
+import hashlib
+import inspect
+import os
+import sqlite3
+from collections import OrderedDict
+
+import numpy as np
+import rapidfuzz
+from config import SIM_CACHE_PATH
+from identity_table import process
+
+SCHEMA_VERSION = 2
+INDEL = "indel_ratio"  # Levenshtein.ratio, the metric behind c1..c3.2
+DEFAULT_MAX_ENTRIES = 5_000_000
+DEFAULT_MEMORY_ENTRIES = 500_000
+_SQL_BATCH = 50_000
+
+
+def cache_version() -> str:
+    """Digest of everything a cached score depends on besides the strings."""
+    parts = (str(SCHEMA_VERSION), rapidfuzz.__version__, inspect.getsource(process))
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _indel_ratios(a, b):
+    from scoring import _ratios
+
+    return _ratios(np.asarray(a, dtype=object), np.asarray(b, dtype=object))
+
+
+METRICS = {INDEL: _indel_ratios}
+
+
+def _digest(key) -> int:
+    """Signed 64-bit hash of a (metric, a, b) key, the SQLite row key."""
+    digest = hashlib.blake2b("\0".join(key).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class SimilarityCache:
+    """
+    SQLite-backed similarity cache with an LRU front.
+
+    ``path=None`` keeps everything in memory (nothing persists). Use it as
+    a context manager, or call close(), so new scores are written back.
+    """
+
+    def __init__(
+        self,
+        path=SIM_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        version: str | None = None,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.version = version or cache_version()
+        self.memory: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self.hits_memory = self.hits_disk = self.misses = self.evicted = 0
+        self.invalidated = False
+        self._pending: dict[tuple[str, str, str], float] = {}
+        self._touched: set[tuple[str, str, str]] = set()
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path or ":memory:")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if self._meta("version") != self.version:
+            self.invalidated = self._meta("version") is not None
+            self.db.execute("DROP TABLE IF EXISTS sims")
+            self._set_meta("version", self.version)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sims "
+            "(key INTEGER PRIMARY KEY, metric TEXT, a TEXT, b TEXT, score REAL, used INTEGER)"
+        )
+        self.db.execute("CREATE TEMP TABLE wanted (key INTEGER PRIMARY KEY)")
+        # recency clock for eviction: one tick per run
+        self.run = int(self._meta("run") or 0) + 1
+        self._set_meta("run", str(self.run))
+        self.db.commit()
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def key(metric: str, a: str, b: str) -> tuple[str, str, str]:
+        return (metric, a, b) if a <= b else (metric, b, a)
+
+    def _remember(self, key, score):
+        self.memory[key] = score
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _select(self, sql, hashes, params=()):
+        """Run ``sql`` (which reads the temp table "wanted") for ``hashes``, batch by batch."""
+        for start in range(0, len(hashes), _SQL_BATCH):
+            self.db.execute("DELETE FROM wanted")
+            batch = hashes[start : start + _SQL_BATCH]
+            self.db.executemany("INSERT OR IGNORE INTO wanted VALUES (?)", ((h,) for h in batch))
+            yield from self.db.execute(sql, params)
+
+    def _lookup_disk(self, keys):
+        """{key: score} of ``keys`` found in the SQLite file."""
+        by_hash = {_digest(key): key for key in keys}
+        sql = "SELECT s.key, s.metric, s.a, s.b, s.score FROM wanted w JOIN sims s ON s.key = w.key"
+        return {
+            by_hash[h]: score
+            for h, *stored, score in self._select(sql, list(by_hash))
+            if tuple(stored) == by_hash[h]  # not another key stored under the same hash
+        }
+
+    def get_many(self, metric: str, keys) -> list:
+        """Cached scores of ``keys`` (from key()), None where not cached."""
+        scores = [None] * len(keys)
+        missing = []
+        for k, key in enumerate(keys):
+            score = self.memory.get(key)
+            if score is not None:
+                self.memory.move_to_end(key)
+            else:
+                score = self._pending.get(key)
+            if score is None:
+                missing.append(k)
+            scores[k] = score
+        self.hits_memory += len(keys) - len(missing)
+        if missing:
+            found = self._lookup_disk([keys[k] for k in missing])
+            for k in missing:
+                score = found.get(keys[k])
+                if score is not None:
+                    scores[k] = score
+                    self._remember(keys[k], score)
+            self._touched.update(found)
+            self.hits_disk += len(found)
+            self.misses += len(missing) - len(found)
+        return scores
+
+    def put_many(self, keys, scores) -> None:
+        for key, score in zip(keys, scores):
+            self._pending[key] = score
+            self._remember(key, score)
+
+    def ratios(self, a, b, metric: str = INDEL) -> np.ndarray:
+        """
+        Element-wise ``metric`` of two equal-length string sequences, as
+        float64: repeated pairs are scored once and cached pairs not at all.
+        """
+        keys = [self.key(metric, x, y) for x, y in zip(a, b)]
+        distinct = list(dict.fromkeys(keys))
+        scores = self.get_many(metric, distinct)
+        todo = [k for k, score in enumerate(scores) if score is None]
+        if todo:
+            computed = METRICS[metric](
+                [distinct[k][1] for k in todo], [distinct[k][2] for k in todo]
+            )
+            computed = computed.tolist()
+            for k, score in zip(todo, computed):
+                scores[k] = score
+            self.put_many([distinct[k] for k in todo], computed)
+        lookup = dict(zip(distinct, scores))
+        return np.fromiter((lookup[key] for key in keys), dtype=np.float64, count=len(keys))
+
+    def sim(self, a: str, b: str) -> float:
+        """Cached Levenshtein ratio of two strings, usable as identity_table.score_pair()'s sim."""
+        key = self.key(INDEL, a, b)
+        score = self.memory.get(key)
+        if score is None:
+            return float(self.ratios([a], [b])[0])
+        self.memory.move_to_end(key)
+        self.hits_memory += 1
+        return score
+
+    def flush(self) -> None:
+        """Write new scores and recency to the file and evict down to ``max_entries``."""
+        rows = ((_digest(key), *key, score, self.run) for key, score in self._pending.items())
+        self.db.executemany("INSERT OR REPLACE INTO sims VALUES (?, ?, ?, ?, ?, ?)", rows)
+        sql = "UPDATE sims SET used = ? WHERE key IN (SELECT key FROM wanted)"
+        for _ in self._select(sql, [_digest(key) for key in self._touched], (self.run,)):
+            pass
+        self._pending.clear()
+        self._touched.clear()
+        excess = self.db.execute("SELECT COUNT(*) FROM sims").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.db.execute(
+                "DELETE FROM sims WHERE key IN (SELECT key FROM sims ORDER BY used LIMIT ?)",
+                (excess,),
+            )
+            self.evicted += excess
+        self.db.commit()
+
+    def __len__(self) -> int:
+        """Entries in the file, including ones not flushed yet."""
+        stored = self.db.execute("SELECT COUNT(*) FROM sims").fetchone()[0]
+        return stored + len(self._pending)
+
+    def stats(self) -> dict:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        hits = self.hits_memory + self.hits_disk
+        return {
+            "lookups": lookups,
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evicted": self.evicted,
+            "invalidated": self.invalidated,
+        }
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
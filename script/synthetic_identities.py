@@ -0,0 +1,142 @@
+# synthetic_identities.py
+"""
+Deterministic synthetic developer identities for benchmarks and tests.
+
+Each synthetic person gets a few (name, email) variants of the kinds seen
+in real commit logs: accents dropped or kept, initials, swapped name
+order, login-style names, GitHub noreply addresses, shared webmail
+domains and work domains. A share of identities are bot/CI accounts.
+"""
+
+import random
+import unicodedata
+
+# fmt: off
+FIRST_NAMES = (
+    "David", "Kyle", "Eric", "Zoe", "Cesar", "José", "Ana", "Björn", "Chloé", "Miguel",
+    "Nish", "Olga", "Pedro", "Renée", "Sanjay", "Tomás", "Uwe", "Wei", "Yusuf", "Zoë",
+    "Agnieszka", "Mateus", "Hiroshi", "Ingrid", "Jürgen", "Lukas", "Marta", "Noé", "Priya",
+    "Rafael", "Sofía", "Thomas", "Valentina", "William", "Xavier", "Amélie", "Łukasz",
+    "Mohammed", "Fatima", "Giulia", "Henrik", "Isabel", "Jan", "Kateřina", "Liam", "Maks",
+    "Markus", "Nora", "Oscar",
+)
+LAST_NAMES = (
+    "Britch", "White", "Torre", "Quinn", "de la Torre", "Núñez", "Silva", "Andersson",
+    "Dubois", "García", "Anil", "Ivanova", "Santos", "Lefèvre", "Gupta", "Müller", "Schmidt",
+    "Wang", "Yılmaz", "Kowalski", "Oliveira", "Tanaka", "Johansen", "Weiß", "Novak",
+    "Rossi", "Fernández", "Jensen", "Dvořák", "Nguyen", "O'Brien", "Smith", "Kim", "Lee",
+    "Costa", "Moreau", "Bianchi", "Hansen", "Popescu", "Horváth", "Ferreira", "Martin",
+)
+# fmt: on
+WEBMAIL_DOMAINS = ("gmail.com", "outlook.com", "hotmail.com", "yahoo.com", "protonmail.com")
+WORK_DOMAINS = ("microsoft.com", "xamarin.com", "contoso.com", "example.org", "acme.io")
+NOREPLY_DOMAIN = "users.noreply.github.com"
+# fmt: off
+BOT_NAMES = (
+    "dependabot[bot]", "github-actions[bot]", "renovate[bot]", "ci-bot", "build automation",
+    "travis-ci", "greenkeeper[bot]", "codecov-io", "snyk-bot", "azure-pipelines[bot]",
+)
+# fmt: on
+BOT_SHARE = 0.02
+# Share of names drawn from the lists above; the rest are built from
+# syllables so large corpora have realistically many distinct names
+LISTED_NAME_SHARE = 0.3
+# fmt: off
+SYLLABLES = (
+    "ka", "ren", "mi", "lo", "sen", "dar", "vi", "no", "ta", "bel", "ros", "an", "el", "ju",
+    "ma", "ri", "go", "len", "tor", "sa", "ni", "ber", "fa", "hu", "ko", "va", "lin", "da",
+    "mé", "zo", "ña", "pe", "ström", "ki", "ra", "wu", "jan", "sky", "ov", "ez",
+)
+# fmt: on
+
+
+def strip_accents(s: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+
+
+def _name(names, rng: random.Random) -> str:
+    if rng.random() < LISTED_NAME_SHARE:
+        return rng.choice(names)
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def _login(first: str, last: str, rng: random.Random) -> str:
+    first, last = strip_accents(first).lower(), strip_accents(last).lower().replace(" ", "")
+    last = "".join(c for c in last if c.isalnum())
+    style = rng.randrange(5)
+    if style == 0:
+        return first + last
+    if style == 1:
+        return first[0] + last
+    if style == 2:
+        return f"{first}.{last}"
+    if style == 3:
+        return f"{first}_{last}"
+    return first + str(rng.randrange(10, 99))
+
+
+def _name_variant(first: str, last: str, login: str, rng: random.Random) -> str:
+    style = rng.randrange(7)
+    if style == 0:
+        return f"{first} {last}"
+    if style == 1:
+        return strip_accents(f"{first} {last}")
+    if style == 2:
+        return f"{first[0]}. {last}"
+    if style == 3:
+        return f"{last} {first}"
+    if style == 4:
+        return f"{last}, {first}"
+    if style == 5:
+        return login
+    return f"{first} {last}".upper()
+
+
+def _email_variant(login: str, work: str, rng: random.Random) -> str:
+    style = rng.randrange(4)
+    if style == 0:
+        return f"{login}@{rng.choice(WEBMAIL_DOMAINS)}"
+    if style == 1:
+        return f"{rng.randrange(1_000_000, 99_999_999)}+{login}@{NOREPLY_DOMAIN}"
+    if style == 2:
+        return f"{login}@{NOREPLY_DOMAIN}"
+    return f"{login}@{work}"
+
+
+def _bot(rng: random.Random):
+    name = rng.choice(BOT_NAMES)
+    slug = "".join(c for c in name if c.isalnum() or c in "-[]")
+    if rng.random() < 0.5:
+        return name, f"{rng.randrange(10_000, 99_999_999)}+{slug}@{NOREPLY_DOMAIN}"
+    return name, f"{slug.strip('[]')}@{rng.choice(WORK_DOMAINS)}"
+
+
+def generate_identities(n: int, seed: int = 0, max_variants: int = 4):
+    """
+    ``n`` distinct (name, email) identities, sorted like devs.csv, and the
+    synthetic person each one belongs to (the ground truth for clustering).
+    Returns (devs, person_ids). The same ``n`` and ``seed`` always give the
+    same identities.
+    """
+    rng = random.Random(seed)
+    identities: dict[tuple[str, str], int] = {}
+    person = 0
+    while len(identities) < n:
+        if rng.random() < BOT_SHARE:
+            identities.setdefault(_bot(rng), person)
+            person += 1
+            continue
+        first, last = _name(FIRST_NAMES, rng), _name(LAST_NAMES, rng)
+        work = rng.choice(WORK_DOMAINS)
+        login = _login(first, last, rng)
+        for _ in range(rng.randint(1, max_variants)):
+            if len(identities) == n:
+                break
+            dev = (
+                _name_variant(first, last, login, rng),
+                _email_variant(login, work, rng),
+            )
+            identities.setdefault(dev, person)
+        person += 1
+    devs = sorted(identities)
+    return [list(dev) for dev in devs], [identities[dev] for dev in devs]
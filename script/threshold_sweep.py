@@ -0,0 +1,102 @@
+# threshold_sweep.py
+"""
+Precision/recall/F1 of the thresholding check at many thresholds at once.
+
+Usage:
+    python script/threshold_sweep.py [--labels devs_similarity_t=0.72_labeled.xlsx]
+                                     [--thresholds 0.65 0.72 0.8 ...]
+"""
+
+import argparse
+import csv
+
+import numpy as np
+from label_store import CACHE_DIR, LABELED_XLSX, load_labels
+from pair_writer import max_score_key
+
+SWEEP_COLUMNS = ["threshold", "tp", "fp", "fn", "precision", "recall", "f1"]
+DEFAULT_THRESHOLDS = [round(t, 2) for t in np.arange(0.70, 1.0001, 0.02)]
+
+
+def read_labels(path, cache_dir=CACHE_DIR):
+    """(max-score key, is TP) of every TP/FP-labelled pair in ``path``."""
+    lab = load_labels(path, cache_dir)
+    lab = lab[lab["label"].isin(["TP", "FP"])]
+    scores = {c: lab[c].to_numpy(np.float64) for c in ["c1", "c2", "c3.1", "c3.2"]}
+    return max_score_key(scores), lab["label"].eq("TP").to_numpy()
+
+
+def sweep_metrics(keys, is_tp, thresholds):
+    """
+    One row of SWEEP_COLUMNS per threshold, predicting "same person" for
+    key >= t. The keys are sorted once; each threshold is then a binary
+    search instead of another pass over the pairs.
+    """
+    keys = np.asarray(keys, dtype=np.float64)
+    is_tp = np.asarray(is_tp, dtype=bool)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    # pairs with key >= sorted_keys[i] are order[i:]; count TPs from the right
+    tp_from = np.concatenate([np.cumsum(is_tp[order][::-1])[::-1], [0]])
+    total_tp = int(is_tp.sum())
+    rows = []
+    for t in thresholds:
+        start = int(np.searchsorted(sorted_keys, t, side="left"))
+        tp = int(tp_from[start])
+        fp = len(keys) - start - tp
+        fn = total_tp - tp
+        precision = tp / (tp + fp) if (tp + fp) else float("nan")
+        recall = tp / (tp + fn) if (tp + fn) else float("nan")
+        f1 = (
+            (2 * precision * recall) / (precision + recall)
+            if (precision + recall)
+            else float("nan")
+        )
+        rows.append(
+            {
+                "threshold": t,
+                "tp": tp,
+                "fp": fp,
+                "fn": fn,
+                "precision": precision,
+                "recall": recall,
+                "f1": f1,
+            }
+        )
+    return rows
+
+
+def write_sweep_report(path, rows) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_sweep(rows) -> None:
+    print(f"{'t':>6} {'TP':>5} {'FP':>5} {'FN':>5} {'prec':>6} {'rec':>6} {'F1':>6}")
+    for row in rows:
+        print(
+            f"{row['threshold']:>6} {row['tp']:>5} {row['fp']:>5} {row['fn']:>5} "
+            f"{row['precision']:>6.3f} {row['recall']:>6.3f} {row['f1']:>6.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--labels", default=LABELED_XLSX)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--output", help="also write the table to this CSV")
+    args = parser.parse_args()
+
+    keys, is_tp = read_labels(args.labels)
+    print(f"Labelled pairs: {len(keys)} ({int(is_tp.sum())} TP)")
+    rows = sweep_metrics(keys, is_tp, sorted(args.thresholds))
+    print_sweep(rows)
+    if args.output:
+        write_sweep_report(args.output, rows)
+        print("Wrote:", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# tok_sim.py
+"""
+Name-token Jaccard similarity (tok_sim) for many pairs at once.
+
+Every distinct name becomes a row of a sparse identity x token incidence
+matrix (tokens from normalize.name_tokens). The intersection size of a
+pair is the dot product of its two rows, so scores for a list of
+candidate pairs, or each name's top-k partners, come from sparse
+products instead of per-pair set operations. Scores equal
+score_improved_rule.jaccard(): |A & B| / max(1, |A | B|), 0.0 for two
+empty token sets.
+"""
+
+import numpy as np
+import pandas as pd
+from normalize import name_tokens
+from scipy import sparse
+
+TOK_SIM_DTYPE = np.float32
+DEFAULT_CHUNK_SIZE = 1_000_000  # pairs per sparse gather
+DEFAULT_BLOCK_ROWS = 4096  # rows per block of the top-k product
+
+
+class TokenIncidence:
+    """Sparse (names x distinct tokens) 0/1 matrix and the token count of every name."""
+
+    def __init__(self, names):
+        vocabulary: dict[str, int] = {}
+        indptr, indices = [0], []
+        for name in names:
+            tokens = {vocabulary.setdefault(t, len(vocabulary)) for t in name_tokens(name)}
+            indices.extend(sorted(tokens))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int32)
+        shape = (len(indptr) - 1, max(1, len(vocabulary)))
+        self.matrix = sparse.csr_matrix((data, indices, indptr), shape=shape)
+        self.sizes = np.diff(np.asarray(indptr, dtype=np.int64))
+        self.vocabulary = vocabulary
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def _scores(self, left, right, common, dtype):
+        union = self.sizes[left] + self.sizes[right] - common
+        return (common / np.maximum(union, 1)).astype(dtype, copy=False)
+
+    def jaccard(self, left, right, dtype=TOK_SIM_DTYPE, chunk_size=DEFAULT_CHUNK_SIZE):
+        """tok_sim of the rows (left[k], right[k]), as a ``dtype`` array."""
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        common = np.zeros(len(left), dtype=np.int64)
+        for start in range(0, len(left), chunk_size):
+            rows = slice(start, start + chunk_size)
+            product = self.matrix[left[rows]].multiply(self.matrix[right[rows]])
+            common[rows] = np.asarray(product.sum(axis=1)).ravel()
+        return self._scores(left, right, common, dtype)
+
+    def top_k(self, k: int, dtype=TOK_SIM_DTYPE, block_rows=DEFAULT_BLOCK_ROWS):
+        """
+        (left, right, tok_sim) of every row's ``k`` best partners with a
+        token in common, best first, ties by lower id. Pairs are directed:
+        (a, b) and (b, a) can both appear.
+        """
+        transposed = self.matrix.T.tocsr()
+        parts = []
+        for start in range(0, len(self), block_rows):
+            product = (self.matrix[start : start + block_rows] @ transposed).tocoo()
+            left = product.row.astype(np.int64) + start
+            right = product.col.astype(np.int64)
+            other = left != right
+            left, right, common = left[other], right[other], product.data[other]
+            scores = self._scores(left, right, common, np.float64)
+            order = np.lexsort((right, -scores, left))
+            left, right, scores = left[order], right[order], scores[order]
+            # rank within each row's run of partners
+            starts = np.flatnonzero(np.r_[True, left[1:] != left[:-1]])
+            rank = np.arange(len(left)) - np.repeat(starts, np.diff(np.r_[starts, len(left)]))
+            best = rank < k
+            parts.append((left[best], right[best], scores[best].astype(dtype)))
+        if not parts:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, dtype)
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def tok_sim(names_1, names_2, dtype=TOK_SIM_DTYPE) -> np.ndarray:
+    """tok_sim of the name pairs (names_1[k], names_2[k]); each distinct name is tokenized once."""
+    names_1, names_2 = pd.Series(names_1, dtype=object), pd.Series(names_2, dtype=object)
+    codes, uniques = pd.factorize(
+        pd.concat([names_1, names_2], ignore_index=True), use_na_sentinel=False
+    )
+    incidence = TokenIncidence(uniques)
+    return incidence.jaccard(codes[: len(names_1)], codes[len(names_1) :], dtype)
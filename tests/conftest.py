@@ -3,3 +3,5 @@ from pathlib import Path
 
 # Add parent directory to path so tests can import dedupe_utils
 sys.path.insert(0, str(Path(__file__).parent.parent))
+# Scripts import their sibling modules directly (e.g. "from identity_table import ...")
+sys.path.insert(0, str(Path(__file__).parent.parent / "script"))
@@ -0,0 +1,72 @@
+from itertools import combinations
+
+import pytest
+from Levenshtein import ratio as sim
+
+from script.blocking import BlockingIndex, qgrams, recall_report
+from script.config import DEFAULT_MAX_BLOCK_SIZE
+from script.identity_table import IdentityTable
+from script.synthetic_identities import generate_identities
+
+DEVS = [
+    ["David Britch", "david@microsoft.com"],
+    ["David Britch", "d.britch@microsoft.com"],
+    ["Maks", "arenuzzz@mail.ru"],
+    ["Markus", "m.walther97@gmail.com"],
+    ["Kyle White", "kyle@xamarin.com"],
+    ["Zoe Quinn", "zq@example.org"],
+]
+
+
+def test_qgrams_short_strings_get_bigrams():
+    assert qgrams("ab") == {"ab", "~ab"}
+    assert "~ma" in qgrams("maks") and "~ma" in qgrams("markus")
+    assert not any(g.startswith("~") for g in qgrams("christopher"))
+
+
+def test_candidate_pairs_sorted_and_skip_unrelated():
+    pairs = BlockingIndex(IdentityTable(DEVS)).candidate_pairs()
+    assert pairs == sorted(pairs)
+    assert (0, 1) in pairs
+    assert (2, 3) in pairs  # maks / markus share a bigram
+    assert all(5 not in pair for pair in pairs)
+
+
+def test_max_block_size_skips_large_blocks():
+    index = BlockingIndex(IdentityTable(DEVS), max_block_size=1)
+    assert index.candidate_pairs() == []
+    assert index.skipped_blocks()
+
+
+def test_candidate_arrays_match_block_combinations():
+    table = IdentityTable(generate_identities(400, seed=1)[0])
+    for cap in (None, DEFAULT_MAX_BLOCK_SIZE, 5):
+        index = BlockingIndex(table, max_block_size=cap)
+        expected = set()
+        for ids in index.blocks.values():
+            if cap is None or len(ids) <= cap:
+                expected.update(combinations(ids, 2))
+        left, right = index.candidate_arrays()
+        assert list(zip(left.tolist(), right.tolist())) == sorted(expected)
+    assert BlockingIndex(table).max_block_size == DEFAULT_MAX_BLOCK_SIZE
+
+
+def test_unknown_family_rejected():
+    with pytest.raises(ValueError):
+        BlockingIndex(IdentityTable(DEVS), families=("nope",))
+
+
+def test_recall_report_full_enumeration_has_full_recall():
+    table = IdentityTable(DEVS)
+    report = recall_report(
+        table,
+        combinations(range(len(table)), 2),
+        sim,
+        0.8,
+        labeled_tp=[
+            ("David Britch", "d.britch@microsoft.com", "David Britch", "david@microsoft.com")
+        ],
+    )
+    assert report["threshold_recall"] == 1.0
+    assert report["labeled_tp"] == 1 and report["labeled_tp_recall"] == 1.0
+    assert report["missed_pairs"] == []
@@ -0,0 +1,76 @@
+import csv
+import subprocess  # nosec B404
+import sys
+from pathlib import Path
+
+from script import cli, pipeline
+
+SCRIPT_DIR = Path(__file__).parent.parent / "script"
+
+DEVS = [
+    ["Alice Moreau", "alice@example.org"],
+    ["David Britch", "d.britch@microsoft.com"],
+    ["David Britch", "david@microsoft.com"],
+    ['Kyle "K" White', "kyle@xamarin.com"],
+    ["Kyle, White", "kwhite@xamarin.com"],
+    ["Zoe Quinn", "zq@example.org"],
+]
+
+
+def write_devs(directory):
+    with open(directory / "devs.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "email"])
+        writer.writerows(DEVS)
+
+
+def test_importing_the_api_and_help_skip_heavy_modules():
+    code = (
+        "import sys; import cli, pipeline, project1developers\n"
+        "try:\n    cli.main(['--help'])\nexcept SystemExit:\n    pass\n"
+        "print(sorted({'pandas', 'numpy', 'rapidfuzz', 'pydriller'} & set(sys.modules)))"
+    )
+    out = subprocess.run(  # nosec B603
+        [sys.executable, "-c", code], cwd=SCRIPT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip().splitlines()[-1] == "[]"
+
+
+def test_cli_score_matches_the_pipeline_called_in_process(tmp_path):
+    (tmp_path / "api").mkdir()
+    (tmp_path / "cli").mkdir()
+    write_devs(tmp_path / "api")
+    write_devs(tmp_path / "cli")
+
+    devs = pipeline.load_devs(tmp_path / "api")
+    assert devs == DEVS[1:]  # the first row is skipped, as in every pipeline run
+    outfiles = pipeline.score(devs, tmp_path / "api", [0.8, 0.72], full_dump=False)
+    assert list(outfiles) == [0.72, 0.8]
+
+    cli.main(["score", "--output-dir", str(tmp_path / "cli"), "--thresholds", "0.72", "0.8"])
+    for name in ("devs_similarity_t=0.72.csv", "devs_similarity_t=0.8.csv"):
+        assert (tmp_path / "api" / name).read_bytes() == (tmp_path / "cli" / name).read_bytes()
+    assert (tmp_path / "cli" / "devs_similarity.csv").exists()
+
+
+def test_cli_cluster_groups_thresholded_pairs(tmp_path):
+    write_devs(tmp_path)
+    cli.main(["score", "--output-dir", str(tmp_path), "--no-full-dump"])
+    cli.main(["cluster", "--output-dir", str(tmp_path)])
+    with open(tmp_path / "devs_clusters.csv", newline="", encoding="utf-8") as f:
+        clusters = {(row["name"], row["email"]): row["cluster_id"] for row in csv.DictReader(f)}
+    assert len(clusters) == len(DEVS) - 1
+    assert (
+        clusters[("David Britch", "d.britch@microsoft.com")]
+        == clusters[("David Britch", "david@microsoft.com")]
+    )
+
+
+def test_bare_path_flags_default_into_the_output_dir(tmp_path):
+    write_devs(tmp_path)
+    cli.main(["score", "--output-dir", str(tmp_path), "--blocking", "--pair-store", "--sim-cache"])
+    assert (tmp_path / "pairs" / "meta.json").exists()
+    assert (tmp_path / "state" / "sim_cache.sqlite").exists()
+    args = cli.build_parser().parse_args(["mine", "--output-dir", str(tmp_path)])
+    cli.resolve_output_paths(args, args.output_dir)
+    assert args.clone_cache == str(tmp_path / "clones")
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from script import pipeline
+from script.clustering import (
+    UnionFind,
+    canonical_identities,
+    cluster_ids,
+    cluster_pairs,
+    read_pair_chunks,
+    store_pair_ids,
+)
+from script.pair_store import PairStore
+
+DEVS = [
+    ["David Britch", "d.britch@microsoft.com"],
+    ["David Britch", "david@microsoft.com"],
+    ["Kyle White", "kyle@xamarin.com"],
+    ["David B", "davidb@users.noreply.github.com"],
+    ["Kyle, White", "kwhite@xamarin.com"],
+    ["Zoe Quinn", "zq@example.org"],
+]
+
+
+def test_union_find_scalar_and_batched_agree():
+    rng = np.random.default_rng(0)
+    left, right = rng.integers(0, 200, 150), rng.integers(0, 200, 150)
+    scalar, batched = UnionFind(200), UnionFind(200)
+    for a, b in zip(left.tolist(), right.tolist()):
+        scalar.union(a, b)
+    batched.union_many(left[:70], right[:70])
+    batched.union_many(left[70:], right[70:])
+    expected = cluster_ids([scalar.find(i) for i in range(200)])
+    assert (cluster_ids(batched.roots()) == expected).all()
+
+
+def test_union_many_keeps_rank_an_upper_bound_on_height():
+    forest = UnionFind(6)
+    forest.union(4, 5)  # rank[4] = 1
+    forest.union_many([0, 1, 3, 2], [1, 2, 4, 2])
+    assert forest.rank[[0, 3]].tolist() == [1, 1]  # roots with members
+    root = forest.union(0, 3)  # equal ranks: 3's root hooks under 0, rank grows
+    assert root == 0 and forest.rank[0] == 2
+    assert cluster_ids(forest.roots()).tolist() == [0] * 6
+
+
+def test_cluster_ids_follow_smallest_member():
+    assert cluster_ids([4, 4, 2, 4, 2, 5]).tolist() == [0, 0, 1, 0, 1, 2]
+
+
+def test_cluster_pairs_with_accept_column(tmp_path):
+    pairs = pd.DataFrame(
+        [
+            [*DEVS[0], *DEVS[1], "TP"],
+            [*DEVS[1], *DEVS[3], "TP"],
+            [*DEVS[2], *DEVS[4], "TP"],
+            [*DEVS[4], *DEVS[5], "FP"],
+            ["Someone", "else@example.org", *DEVS[5], "TP"],  # unknown identity
+        ],
+        columns=["name_1", "email_1", "name_2", "email_2", "rule_pred"],
+    )
+    pairs.to_csv(tmp_path / "pairs.csv", index=False)
+    chunks = read_pair_chunks(tmp_path / "pairs.csv", "rule_pred", chunk_size=2)
+    assert cluster_pairs(DEVS, chunks, "rule_pred").tolist() == [0, 0, 1, 0, 1, 2]
+
+
+def test_canonical_identities_prefer_heaviest_then_alphabetical():
+    clusters = np.array([0, 0, 1, 0, 1, 2])
+    canonical = canonical_identities(DEVS, clusters, weights=[2, 2, 1, 3, 1, 1])
+    assert canonical.values.tolist() == [
+        [0, "David Britch", "davidb@users.noreply.github.com", 3],
+        [1, "Kyle White", "kwhite@xamarin.com", 2],
+        [2, "Zoe Quinn", "zq@example.org", 1],
+    ]
+
+
+def test_clusters_from_pair_store_match_the_csv(tmp_path):
+    devs = sorted(DEVS)
+    outfiles = pipeline.score(devs, tmp_path, [0.65], pair_store=tmp_path / "pairs")
+    from_csv = pipeline.cluster(devs, outfiles[0.65], tmp_path)
+    store = PairStore(tmp_path / "pairs")
+    from_store = cluster_pairs(devs, (), id_chunks=store_pair_ids(devs, store, 0.65, 4))
+    assert from_csv.tolist() == from_store.tolist()
+    assert from_csv.max() < len(devs) - 1  # some identities were linked
+    clusters = pipeline.cluster(devs, None, tmp_path, pair_store=tmp_path / "pairs", threshold=0.65)
+    assert clusters.tolist() == from_csv.tolist()
@@ -0,0 +1,59 @@
+import csv
+
+from script.clustering import cluster_pairs, read_pair_chunks
+from script.exact_match import ExactMatches, write_matches
+
+DEVS = [
+    ["0x0is1", "0x0is1@protonmail.com"],
+    ["Not Your Surya", "0x0is1@ProtonMail.com"],
+    ["APILayer", "75280960+apilayer-admin@users.noreply.github.com"],
+    ["apilayer", "75280960+apilayer@users.noreply.github.com"],
+    ["Sent", "sent@users.noreply.github.com"],
+    ["sent", "66543853+sent@users.noreply.github.com"],
+    ["Zoë Quinn", "zq@example.org"],
+    ["Zoe Quinn", "zoe@example.com"],
+    ["Daniel", "danielarezdiaz@gmail.com"],
+    ["Daniel", "danzanzu@gmail.com"],
+]
+
+
+def test_groups_by_email_noreply_and_full_name():
+    matches = ExactMatches(DEVS)
+    assert matches.pairs == {
+        (0, 1): ["email"],
+        (2, 3): ["noreply_id"],
+        (4, 5): ["noreply_login"],
+        (6, 7): ["name"],
+    }
+    # single-token names are not a key, so the two Daniels stay apart
+    assert matches.groups.tolist() == [0, 0, 2, 2, 4, 4, 6, 6, 8, 9]
+    assert matches.collapsed() == [DEVS[i] for i in (0, 2, 4, 6, 8, 9)]
+    assert matches.reason_counts() == {
+        "email": 1,
+        "noreply_id": 1,
+        "noreply_login": 1,
+        "name": 1,
+    }
+
+
+def test_chained_keys_collapse_to_the_smallest_id():
+    devs = [
+        ["Kyle White", "kyle@xamarin.com"],
+        ["K White", "kwhite@xamarin.com"],
+        ["Kyle White", "kw@example.org"],
+        ["kw", "KW@example.org"],
+    ]
+    matches = ExactMatches(devs)
+    assert matches.pairs == {(0, 2): ["name"], (2, 3): ["email"]}
+    assert matches.groups.tolist() == [0, 1, 0, 0]
+    assert matches.collapsed() == devs[:2]
+
+
+def test_written_matches_link_clusters(tmp_path):
+    path = tmp_path / "devs_exact_matches.csv"
+    assert write_matches(path, ExactMatches(DEVS)) == 4
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[1] == [*DEVS[0], *DEVS[1], "email"]
+    clusters = cluster_pairs(DEVS, [], linked_chunks=read_pair_chunks(path))
+    assert clusters.tolist() == [0, 0, 1, 1, 2, 2, 3, 3, 4, 5]
@@ -0,0 +1,36 @@
+from Levenshtein import ratio as sim
+
+from script.identity_table import IdentityTable, process, score_pair
+
+
+def test_process_normalizes_name_and_splits_email():
+    assert process(["Ándre O'Neil-Silva", "andre.silva@example.com"]) == (
+        "andre oneilsilva",
+        "andre",
+        "oneilsilva",
+        "a",
+        "o",
+        "andre.silva@example.com",
+        "andre.silva",
+    )
+
+
+def test_process_single_and_multi_part_names():
+    assert process(["nish", "nish@x.com"])[:5] == ("nish", "nish", "", "n", "")
+    assert process(["Cesar De La Torre", "c@x.com"])[1:3] == ("cesar", "de la torre")
+
+
+def test_identity_table_matches_process_per_row():
+    devs = [["David Britch", "david@microsoft.com"], ["Kyle White", "k.white@other.com"]]
+    table = IdentityTable(devs)
+    assert len(table) == 2
+    for i, dev in enumerate(devs):
+        assert table.row(i) == process(dev)
+
+
+def test_score_pair_uses_original_names_and_initials_checks():
+    table = IdentityTable([["David Britch", "db@x.com"], ["D. Britch", "dbritch@x.com"]])
+    row = score_pair(table, 0, 1, sim)
+    assert row[:4] == ["David Britch", "db@x.com", "D. Britch", "dbritch@x.com"]
+    assert row[7] == 1.0  # same last name
+    assert row[8] is True  # c4: "d" + "britch" in "dbritch"
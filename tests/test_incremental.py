@@ -0,0 +1,97 @@
+from itertools import combinations
+
+from script import pipeline
+from script.identity_table import IdentityTable
+from script.incremental import (
+    diff_identities,
+    incremental_update,
+    new_pairs,
+    read_run_state,
+)
+from script.metrics import StageMetrics
+from script.pair_writer import write_pair_files
+from script.scoring import iter_scored_chunks
+
+DEVS = [
+    ["David Britch", "d.britch@microsoft.com"],
+    ["David Britch", "david@microsoft.com"],
+    ['Kyle "K" White', "kyle@xamarin.com"],
+    ["Kyle, White", "kwhite@xamarin.com"],
+    ["Zoe Quinn", "zq@example.org"],
+    ["zoe quinn", "zoe.quinn@example.org"],
+]
+
+
+def write_files(devs, directory):
+    table = IdentityTable(devs)
+    directory.mkdir(exist_ok=True)
+    write_pair_files(
+        table,
+        iter_scored_chunks(table),
+        0.8,
+        directory / "devs_similarity_t=0.8.csv",
+        directory / "devs_similarity.csv",
+    )
+
+
+def test_diff_identities():
+    added, removed = diff_identities(DEVS[:4], DEVS[2:])
+    assert added == [tuple(DEVS[4]), tuple(DEVS[5])]
+    assert removed == [tuple(DEVS[0]), tuple(DEVS[1])]
+
+
+def test_new_pairs_cover_every_pair_with_a_new_id_once_in_order():
+    left, right = new_pairs(7, [5, 2, 3])
+    expected = [(a, b) for a, b in combinations(range(7), 2) if {a, b} & {2, 3, 5}]
+    assert list(zip(left.tolist(), right.tolist())) == expected
+
+
+def test_new_pairs_without_new_ids_is_empty():
+    left, right = new_pairs(4, [])
+    assert len(left) == len(right) == 0
+
+
+def test_patched_files_match_full_run(tmp_path):
+    previous = sorted(DEVS[:2] + DEVS[3:5])
+    current = sorted(DEVS[1:3] + DEVS[4:])  # two added, two removed
+    write_files(previous, tmp_path / "patched")
+    write_files(current, tmp_path / "full")
+
+    pair_files = {
+        str(tmp_path / "patched" / "devs_similarity_t=0.8.csv"): 0.8,
+        str(tmp_path / "patched" / "devs_similarity.csv"): None,
+    }
+    added, removed, scored = incremental_update(current, previous, pair_files, chunk_size=2)
+
+    assert sorted(added) == sorted([tuple(DEVS[2]), tuple(DEVS[5])])
+    assert sorted(removed) == sorted([tuple(DEVS[0]), tuple(DEVS[3])])
+    assert scored == len(new_pairs(len(current), [1, 3])[0])  # positions of the added devs
+    for name in ("devs_similarity.csv", "devs_similarity_t=0.8.csv"):
+        patched = (tmp_path / "patched" / name).read_bytes()
+        assert patched == (tmp_path / "full" / name).read_bytes()
+
+
+def test_score_only_patches_the_files_and_mode_of_the_last_run(tmp_path):
+    devs = sorted(DEVS)
+    current = sorted(DEVS[1:] + [["Kyle White", "kyle@x.com"]])
+    pipeline.score(devs, tmp_path, [0.65])
+    stale = (tmp_path / "devs_similarity_t=0.65.csv").read_bytes()
+    pipeline.score(sorted(DEVS[1:]), tmp_path, [0.8])
+    metrics = StageMetrics()
+    pipeline.score(current, tmp_path, [0.8], incremental=True, metrics=metrics)
+    assert [s["stage"] for s in metrics.stages] == ["incremental"]
+    assert (tmp_path / "devs_similarity_t=0.65.csv").read_bytes() == stale
+
+    full = tmp_path / "full"
+    full.mkdir()
+    pipeline.score(current, full, [0.8])
+    for name in ("devs_similarity.csv", "devs_similarity_t=0.8.csv"):
+        assert (tmp_path / name).read_bytes() == (full / name).read_bytes()
+
+    # a blocked run is never patched: its candidate pairs depend on the whole list
+    pipeline.score(current, tmp_path, [0.8], blocking=True)
+    pipeline.score(devs, tmp_path, [0.8], blocking=True, incremental=True)
+    assert read_run_state(tmp_path / "state" / "scored_run.json")["mode"]["blocking"]
+    pipeline.score(devs, full, [0.8], blocking=True)
+    for name in ("devs_similarity.csv", "devs_similarity_t=0.8.csv"):
+        assert (tmp_path / name).read_bytes() == (full / name).read_bytes()
@@ -0,0 +1,59 @@
+import numpy as np
+
+from script.blocking import DEFAULT_FAMILIES, BlockingIndex
+from script.identity_table import IdentityTable, initials_checks
+from script.initials_index import InitialsIndex, index_for
+from script.synthetic_identities import generate_identities
+
+DEVS = [
+    ["David Britch", "dbritch@microsoft.com"],
+    ["David Britch", "david@microsoft.com"],
+    ["Britch", "britchd@example.org"],
+    ["Cesar de la Torre", "cdela torre@example.org"],
+    ["Kyle White", "kwhite@xamarin.com"],
+    ["K", "kyle@xamarin.com"],
+    ["", "nobody@example.org"],
+    ["Zoë Quinn", "ZQuinn@example.org"],
+]
+
+
+def brute_force(table):
+    left, right = np.triu_indices(len(table), 1)
+    flags = [initials_checks(table, a, b) for a, b in zip(left.tolist(), right.tolist())]
+    return left, right, np.asarray(flags, dtype=bool).reshape(-1, 4)
+
+
+def test_flags_match_initials_checks():
+    for devs in (DEVS, generate_identities(400, seed=5)[0]):
+        table = IdentityTable(devs)
+        left, right, expected = brute_force(table)
+        flags = InitialsIndex(table).flags(left, right)
+        for k, column in enumerate(("c4", "c5", "c6", "c7")):
+            assert flags[column].tolist() == expected[:, k].tolist()
+
+
+def test_matches_enumerate_every_flagged_partner():
+    table = IdentityTable(generate_identities(300, seed=2)[0])
+    index = InitialsIndex(table)
+    left, right, expected = brute_force(table)
+    flagged = expected.any(axis=1)
+    for x in range(len(table)):
+        partners = np.concatenate([right[flagged & (left == x)], left[flagged & (right == x)]])
+        assert index.matches(x).tolist() == sorted(partners.tolist())
+    assert index.candidate_pairs() == list(zip(left[flagged].tolist(), right[flagged].tolist()))
+
+
+def test_index_is_cached_on_the_table_and_rebuilt_after_append():
+    table = IdentityTable(DEVS[:4])
+    index = index_for(table)
+    assert index_for(table) is index
+    table.append(DEVS[4])
+    assert len(index_for(table)) == 5
+
+
+def test_initials_blocking_family_adds_flagged_pairs():
+    table = IdentityTable(DEVS)
+    plain = set(BlockingIndex(table).candidate_pairs())
+    with_initials = set(BlockingIndex(table, DEFAULT_FAMILIES + ("initials",)).candidate_pairs())
+    assert set(InitialsIndex(table).candidate_pairs()) <= with_initials
+    assert plain <= with_initials
@@ -0,0 +1,85 @@
+import os
+
+import pandas as pd
+
+from script.label_store import _cache_paths, join_labels, load_labels, pair_key, pair_keys
+
+LABELED = [
+    ["name_1", "email_1", "name_2", "email_2", "c1", "label", "reason"],
+    ["José Núñez", "jose@example.org", "jose", "JOSE@example.org ", 0.5, "tp", "same email"],
+    ["Kyle White", "kyle@xamarin.com", "K White", "kw@xamarin.com", 0.8, "FALSE", ""],
+    ["Zoe Quinn", "zq@example.org", "Zoe Q", "zoe@example.org", 0.75, None, None],
+]
+
+
+def write_labels(path, rows=LABELED):
+    frame = pd.DataFrame(rows[1:], columns=rows[0])
+    # the shipped xlsx repeats its header as the first data row
+    pd.concat([pd.DataFrame([rows[0]], columns=rows[0]), frame]).to_excel(path, index=False)
+
+
+def test_pair_key_is_order_independent_and_normalized():
+    key = pair_key("José Núñez", "jose@example.org", "jose", "jose@example.org")
+    assert key == pair_key("jose", "JOSE@example.org ", "Jose  Nunez", "jose@example.org")
+    assert key != pair_key("José Núñez", "jose@example.org", "jose", "jose@example.com")
+
+
+def test_load_labels_normalizes_and_caches(tmp_path):
+    xlsx, cache = tmp_path / "labeled.xlsx", tmp_path / "cache"
+    write_labels(xlsx)
+    labels = load_labels(xlsx, cache)
+    assert labels["label"].tolist() == ["TP", "FP", ""]
+    assert labels["c1"].tolist() == [0.5, 0.8, 0.75]
+    csv_path, _ = _cache_paths(xlsx, cache)
+    assert os.path.exists(csv_path)
+
+    cached = load_labels(xlsx, cache)
+    pd.testing.assert_frame_equal(cached, labels, check_dtype=False)
+
+    # touched but unchanged: served from the cache, meta refreshed
+    os.utime(xlsx, ns=(0, 0))
+    os.utime(csv_path, ns=(1, 1))
+    load_labels(xlsx, cache)
+    assert os.stat(csv_path).st_mtime_ns == 1
+
+
+def test_load_labels_rebuilds_after_the_xlsx_changes(tmp_path):
+    xlsx, cache = tmp_path / "labeled.xlsx", tmp_path / "cache"
+    write_labels(xlsx)
+    load_labels(xlsx, cache)
+    rows = [row[:] for row in LABELED]
+    rows[3][5] = "TP"
+    write_labels(xlsx, rows)
+    assert load_labels(xlsx, cache)["label"].tolist() == ["TP", "FP", "TP"]
+
+
+def test_same_named_label_files_do_not_share_a_cache(tmp_path):
+    cache = tmp_path / "cache"
+    first, second = tmp_path / "a" / "labeled.xlsx", tmp_path / "b" / "labeled.xlsx"
+    for xlsx in (first, second):
+        xlsx.parent.mkdir()
+    write_labels(first)
+    rows = [row[:] for row in LABELED]
+    rows[3][5] = "TP"
+    write_labels(second, rows)
+    assert load_labels(first, cache)["label"].tolist() == ["TP", "FP", ""]
+    assert load_labels(second, cache)["label"].tolist() == ["TP", "FP", "TP"]
+    assert load_labels(first, cache)["label"].tolist() == ["TP", "FP", ""]
+
+
+def test_join_labels_matches_swapped_pairs(tmp_path):
+    xlsx = tmp_path / "labeled.xlsx"
+    write_labels(xlsx)
+    labels = load_labels(xlsx, tmp_path / "cache")
+    pairs = pd.DataFrame(
+        {
+            "name_1": ["jose", "Kyle White", "New Person"],
+            "email_1": ["jose@example.org", "kyle@xamarin.com", "new@example.org"],
+            "name_2": ["Jose Nunez", "K White", "Zoe Quinn"],
+            "email_2": ["jose@example.org", "kw@xamarin.com", "zq@example.org"],
+        }
+    )
+    joined = join_labels(pairs, labels)
+    assert joined["label"].tolist() == ["TP", "FP", ""]
+    assert joined["reason"].tolist() == ["same email", "", ""]
+    assert pair_keys(pairs).dtype == "int64"
@@ -0,0 +1,53 @@
+import json
+import time
+
+from script.metrics import StageMetrics, peak_rss_mb, timed
+
+
+def test_stage_records_time_memory_and_counts(tmp_path):
+    metrics = StageMetrics(trace_memory=True)
+    with metrics.stage("build") as counts:
+        data = [str(i) for i in range(50_000)]
+        counts["items"] = len(data)
+    with metrics.stage("empty"):
+        pass
+    metrics.close()
+
+    build, empty = metrics.stages
+    assert (build["stage"], build["counts"]) == ("build", {"items": 50_000})
+    assert build["wall_s"] >= 0 and build["cpu_s"] >= 0
+    assert build["traced_peak_mb"] >= 2 and "traced_peak_mb" in empty
+    assert 0 < build["process_peak_rss_mb"] <= empty["process_peak_rss_mb"] <= peak_rss_mb()
+    assert build["peak_rss_growth_mb"] >= 0 and empty["peak_rss_growth_mb"] >= 0
+
+    metrics.write_json(tmp_path / "m.json")
+    report = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+    assert [s["stage"] for s in report["stages"]] == ["build", "empty"]
+
+
+def test_stage_is_recorded_when_the_block_fails():
+    metrics = StageMetrics()
+    try:
+        with metrics.stage("boom"):
+            raise ValueError
+    except ValueError:
+        pass
+    assert metrics.stages[0]["stage"] == "boom"
+
+
+def test_timed_counts_only_time_spent_in_the_iterable():
+    def slow():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    counts = {}
+    items = []
+    start = time.perf_counter()
+    for item in timed(slow(), counts, "producer_s"):
+        time.sleep(0.02)  # consumer time is not counted
+        items.append(item)
+    elapsed = time.perf_counter() - start
+    assert items == [0, 1, 2]
+    assert counts["producer_s"] >= 0.03
+    assert counts["producer_s"] < elapsed - 0.05  # the three 0.02 s consumer sleeps
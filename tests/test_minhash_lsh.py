@@ -0,0 +1,74 @@
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+
+from script.identity_table import IdentityTable
+from script.minhash_lsh import (
+    MinHashLSH,
+    bucket_pairs,
+    collision_probability,
+    recall_speed_report,
+    union_pairs,
+)
+from script.synthetic_identities import generate_identities
+
+DEVS = [
+    ["David Britch", "david@microsoft.com"],
+    ["David Britch", "dbritch@example.org"],
+    ["Dave Britch", "britch@contoso.com"],
+    ["Zoe Quinn", "zq@example.org"],
+    ["", "nobody@example.org"],
+    ["Markus Walther", "m.walther97@gmail.com"],
+]
+
+
+def test_bucket_pairs_match_brute_force():
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 40, size=300).astype(np.uint64)
+    ids = np.arange(300) * 7
+    for max_bucket_size in (None, 6):
+        buckets = defaultdict(list)
+        for key, i in zip(keys.tolist(), ids.tolist()):
+            buckets[key].append(i)
+        expected = sorted(
+            pair
+            for members in buckets.values()
+            if max_bucket_size is None or len(members) <= max_bucket_size
+            for pair in combinations(members, 2)
+        )
+        left, right = bucket_pairs(keys, ids, max_bucket_size)
+        assert sorted(zip(left.tolist(), right.tolist())) == expected
+
+
+def test_identical_strings_always_collide_and_empty_never_do():
+    table = IdentityTable(DEVS + [["", "nobody@example.com"]])
+    pairs = MinHashLSH(table, bands=4, rows=8).candidate_pairs()
+    assert pairs == sorted(set(pairs))
+    assert (0, 1) in pairs  # same normalized name
+    assert (4, 6) in pairs  # same email prefix
+    by_name = MinHashLSH(table, bands=4, rows=8, fields=("name",)).candidate_pairs()
+    assert (0, 1) in by_name and all(4 not in pair for pair in by_name)
+
+
+def test_candidates_are_deterministic_and_tunable():
+    table = IdentityTable(generate_identities(500, seed=9)[0])
+    wide = MinHashLSH(table, bands=16, rows=2).candidate_pairs()
+    assert wide == MinHashLSH(table, bands=16, rows=2).candidate_pairs()
+    narrow = MinHashLSH(table, bands=16, rows=8).candidate_pairs()
+    assert len(narrow) < len(wide)
+    assert collision_probability(0.8, 16, 2) > collision_probability(0.8, 16, 8)
+
+
+def test_union_pairs_sorts_and_deduplicates():
+    left, right = union_pairs(10, ([0, 3], [5, 4]), ([0, 1], [5, 2]))
+    assert list(zip(left.tolist(), right.tolist())) == [(0, 5), (1, 2), (3, 4)]
+
+
+def test_recall_report_against_exhaustive_scoring():
+    table = IdentityTable(generate_identities(300, seed=2)[0])
+    rows = recall_speed_report(table, params=[(16, 2)], thresholds=[0.8])
+    assert rows[0]["method"] == "exhaustive" and rows[0]["candidates"] == 300 * 299 // 2
+    assert rows[1]["method"] == "lsh 16x2"
+    assert 0.5 < rows[1]["recall_t=0.8"] <= 1.0
+    assert rows[1]["candidates"] < rows[0]["candidates"]
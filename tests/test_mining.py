@@ -0,0 +1,143 @@
+import subprocess
+
+import pytest
+
+from script.mining import (
+    checkpoint_path,
+    load_checkpoint,
+    mine_repositories,
+    mine_repository,
+    read_repo_list,
+)
+
+
+def git(path, *args, name="Dev", email="dev@example.com"):
+    env_args = ["-c", f"user.name={name}", "-c", f"user.email={email}"]
+    subprocess.run(["git", "-C", str(path), *env_args, *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q")
+    git(path, "commit", "-q", "--allow-empty", "-m", "one", name="Ann", email="ann@x.com")
+    git(path, "commit", "-q", "--allow-empty", "-m", "two", name="Bob", email="bob@x.com")
+    return path
+
+
+def test_mine_without_checkpoint(repo):
+    identities, commits = mine_repository(str(repo))
+    assert set(identities) == {("Ann", "ann@x.com"), ("Bob", "bob@x.com")}
+    assert commits == 2
+
+
+def test_checkpoint_only_traverses_new_commits(repo, tmp_path):
+    checkpoint = checkpoint_path(tmp_path / "checkpoints", str(repo))
+    _, commits = mine_repository(str(repo), checkpoint)
+    assert commits == 2
+
+    identities, commits = mine_repository(str(repo), checkpoint)
+    assert commits == 0
+    assert len(identities) == 2
+
+    git(repo, "commit", "-q", "--allow-empty", "-m", "three", name="Cy", email="cy@x.com")
+    identities, commits = mine_repository(str(repo), checkpoint)
+    assert commits == 1
+    assert ("Cy", "cy@x.com") in identities and ("Ann", "ann@x.com") in identities
+
+    last_commit, saved = load_checkpoint(checkpoint, str(repo))
+    head = subprocess.run(
+        ["git", "-C", str(repo), "rev-parse", "HEAD"], capture_output=True, text=True
+    ).stdout.strip()
+    assert last_commit == head and saved == identities
+    assert identities[("Ann", "ann@x.com")].commits == 1
+
+
+def test_rewritten_history_triggers_full_mine(repo, tmp_path):
+    checkpoint = checkpoint_path(tmp_path / "checkpoints", str(repo))
+    mine_repository(str(repo), checkpoint)
+    git(repo, "reset", "-q", "--hard", "HEAD~1")
+    git(repo, "commit", "-q", "--amend", "--allow-empty", "-m", "x", name="Di", email="di@x.com")
+    git(repo, "gc", "-q", "--prune=now")
+    git(repo, "reflog", "expire", "--expire=now", "--all")
+    git(repo, "gc", "-q", "--prune=now")
+    identities, commits = mine_repository(str(repo), checkpoint)
+    assert commits == 1
+    assert ("Bob", "bob@x.com") not in identities
+
+
+def test_file_url_is_cloned(repo):
+    identities, commits = mine_repository(repo.as_uri())
+    assert commits == 2 and len(identities) == 2
+
+
+def test_checkpoint_for_other_repo_is_ignored(repo, tmp_path):
+    checkpoint = checkpoint_path(tmp_path, "other")
+    mine_repository(str(repo), checkpoint)
+    assert load_checkpoint(checkpoint, "different-repo") == (None, {})
+
+
+def test_clone_cache_fetches_on_later_runs(repo, tmp_path):
+    cache = tmp_path / "cache"
+    url = repo.as_uri()
+    identities, _ = mine_repository(url, cache_dir=str(cache))
+    assert len(identities) == 2
+    clones = list(cache.iterdir())
+    assert len(clones) == 1
+
+    git(repo, "commit", "-q", "--allow-empty", "-m", "three", name="Cy", email="cy@x.com")
+    identities, commits = mine_repository(url, cache_dir=str(cache))
+    assert commits == 3 and ("Cy", "cy@x.com") in identities
+    assert list(cache.iterdir()) == clones
+
+
+def test_mine_repositories_merges_with_provenance(repo, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    git(other, "init", "-q")
+    git(other, "commit", "-q", "--allow-empty", "-m", "o", name="Ann", email="ann@x.com")
+    git(other, "commit", "-q", "--allow-empty", "-m", "p", name="Eve", email="eve@x.com")
+
+    repos_file = tmp_path / "repos.txt"
+    repos_file.write_text(f"# repos\n{repo.as_uri()}\n\n{other.as_uri()}  # second\n")
+    repos = read_repo_list(repos_file)
+    assert repos == [repo.as_uri(), other.as_uri()]
+
+    stats, provenance, commit_counts = mine_repositories(
+        repos, checkpoint_dir=str(tmp_path / "cp"), cache_dir=str(tmp_path / "cache"), workers=2
+    )
+    assert commit_counts == {repo.as_uri(): 2, other.as_uri(): 2}
+    assert provenance[("Ann", "ann@x.com")] == sorted(repos)
+    assert provenance[("Eve", "eve@x.com")] == [other.as_uri()]
+    assert set(provenance) == {("Ann", "ann@x.com"), ("Bob", "bob@x.com"), ("Eve", "eve@x.com")}
+    assert stats[("Ann", "ann@x.com")].commits == 2
+
+
+def test_gitlog_backend_matches_pydriller(repo, tmp_path):
+    git(repo, "commit", "-q", "--allow-empty", "-m", "ü", name="Zoë Ünïcode", email="zoe@x.com")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "same", name="Ann", email="ann@x.com")
+    git(repo, "checkout", "-q", "-b", "side", "HEAD~2")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "side", name="Sid", email="sid@x.com")
+    git(repo, "checkout", "-q", "-")
+    git(repo, "merge", "-q", "--no-ff", "-m", "merge", "side", name="Bob", email="bob@x.com")
+
+    by_pydriller, count_pydriller = mine_repository(str(repo), backend="pydriller")
+    by_gitlog, count_gitlog = mine_repository(str(repo), backend="gitlog")
+    assert count_gitlog == count_pydriller == 6
+    assert by_gitlog == by_pydriller
+    assert by_gitlog[("Ann", "ann@x.com")].commits == 2
+    assert ("Zoë Ünïcode", "zoe@x.com") in by_gitlog
+
+
+def test_gitlog_backend_with_checkpoint(repo, tmp_path):
+    checkpoint = checkpoint_path(tmp_path, str(repo))
+    mine_repository(str(repo), checkpoint, backend="gitlog")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "three", name="Cy", email="cy@x.com")
+    identities, commits = mine_repository(str(repo), checkpoint, backend="gitlog")
+    assert commits == 1 and len(identities) == 3
+
+
+def test_unknown_backend_rejected(repo):
+    with pytest.raises(ValueError):
+        mine_repository(str(repo), backend="svn")
@@ -0,0 +1,35 @@
+from script.normalize import (
+    cache_stats,
+    clear_caches,
+    email_parts,
+    is_generic_alias,
+    raw_surname,
+    split_name,
+    surname,
+)
+
+
+def test_repeated_values_hit_the_cache():
+    clear_caches()
+    for _ in range(3):
+        surname("Cesar De La Torre")
+        email_parts("Cesar@Microsoft.com")
+    stats = cache_stats()
+    assert (stats["name_tokens"].hits, stats["name_tokens"].misses) == (2, 1)
+    assert (stats["email_parts"].hits, stats["email_parts"].misses) == (2, 1)
+
+
+def test_split_name_returns_a_fresh_list():
+    split_name("Eric Torre").append("x")
+    assert split_name("Eric Torre") == ["eric", "torre"]
+
+
+def test_cache_keeps_types_apart():
+    assert email_parts(1) == email_parts(1.0) == ("", "")
+    assert split_name(1) == ["1"] and split_name(1.0) == ["1", "0"]
+
+
+def test_rule_variants():
+    assert raw_surname("José Núñez") != surname("José Núñez") == "nunez"
+    assert is_generic_alias("build-bot@example.com")
+    assert not is_generic_alias("dana@example.com")
@@ -0,0 +1,55 @@
+import numpy as np
+
+from script.dedupe_utils import improved_rule_vectorized
+from script.identity_table import IdentityTable
+from script.pair_frame import IdentityCodes, expand, pair_frame, threshold_frame
+from script.pair_writer import max_score_key
+from script.scoring import add_initials_flags, iter_scored_chunks
+from script.synthetic_identities import generate_identities
+
+DEVS = [
+    ["David Britch", "david@microsoft.com"],
+    ["David Britch", "d.britch@microsoft.com"],
+    ['Kyle "K" White', "kyle@xamarin.com"],
+    ["Kyle, White", "kwhite@xamarin.com"],
+    ["Zoë Quinn", "zq@example.org"],
+    ["zq", "zq@example.org"],
+]
+
+
+def scored(devs):
+    table = IdentityTable(devs)
+    scores = next(iter_scored_chunks(table, chunk_size=10**6))
+    return table, add_initials_flags(table, scores)
+
+
+def test_pair_frame_is_compact_and_decodes_to_the_identities():
+    table, scores = scored(DEVS)
+    frame = pair_frame(IdentityCodes.from_table(table), scores)
+    assert frame["left"].dtype == np.int32 and frame["c1"].dtype == np.float32
+    assert frame["name_1"].dtype == "category" and frame["c7"].dtype == bool
+    names = np.asarray(table.raw_names, dtype=object)
+    emails = np.asarray(table.emails, dtype=object)
+    plain = expand(frame)
+    assert plain["name_1"].tolist() == names[scores["left"]].tolist()
+    assert plain["email_2"].tolist() == emails[scores["right"]].tolist()
+
+
+def test_threshold_frame_matches_the_float64_check():
+    table, scores = scored(generate_identities(200, seed=3)[0])
+    frame = pair_frame(IdentityCodes.from_table(table), scores)
+    for t in (0.65, 0.72, 0.8):
+        kept = threshold_frame(frame, t)
+        expected = np.flatnonzero(max_score_key(scores) >= t)
+        assert kept.index.tolist() == expected.tolist()
+
+
+def test_rule_gives_the_same_result_on_compact_and_plain_frames():
+    table, scores = scored(generate_identities(200, seed=3)[0])
+    frame = pair_frame(IdentityCodes.from_table(table), scores)
+    frame["tok_sim"] = frame["c1"]
+    plain = expand(frame)
+    plain["tok_sim"] = scores["c1"]  # float64, as the labelled pairs have them
+    assert improved_rule_vectorized(frame).equals(improved_rule_vectorized(plain))
+    deep = frame.memory_usage(deep=True).sum()
+    assert plain.memory_usage(deep=True).sum() > 4 * deep
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from script.identity_table import IdentityTable
+from script.label_store import pair_key
+from script.pair_store import PairStore, PairStoreWriter, pack_flags, unpack_flags
+from script.pair_writer import write_pair_files
+from script.scoring import iter_scored_chunks
+
+DEVS = [
+    ["David Britch", "david@microsoft.com"],
+    ["David Britch", "d.britch@microsoft.com"],
+    ['Kyle "K" White', "kyle@xamarin.com"],
+    ["Kyle, White", "kwhite@xamarin.com"],
+    ["Zoë Quinn", "zq@example.org"],
+    ["zq", "zq@example.org"],
+]
+
+
+def write_store(path, table, **kwargs):
+    with PairStoreWriter(path, table, **kwargs) as store:
+        for scores in iter_scored_chunks(table, chunk_size=4):
+            store.append(scores)
+    return PairStore(path)
+
+
+def test_float64_store_exports_the_same_csv(tmp_path):
+    table = IdentityTable(DEVS)
+    store = write_store(tmp_path / "store", table, score_dtype=np.float64)
+    write_pair_files(table, iter_scored_chunks(table), 0.8, tmp_path / "t.csv", tmp_path / "f.csv")
+    assert store.export_csv(tmp_path / "export.csv") == len(store) == 15
+    assert (tmp_path / "export.csv").read_bytes() == (tmp_path / "f.csv").read_bytes()
+
+
+def test_columns_are_compact_and_memory_mapped(tmp_path):
+    table = IdentityTable(DEVS)
+    store = write_store(tmp_path / "store", table)
+    reference = next(iter_scored_chunks(table))
+    assert store.column("left").dtype == np.int32 and store.column("c1").dtype == np.float32
+    assert isinstance(store.column("c2"), np.memmap)
+    np.testing.assert_array_equal(store.column("right"), reference["right"])
+    np.testing.assert_array_equal(store.column("c3.1"), reference["c3.1"].astype(np.float32))
+    assert list(store.names) == table.raw_names and list(store.emails) == table.emails
+
+    frame = store.to_frame(["name_1", "email_2", "c1", "c7"], mask=store.column("c1") >= 0.8)
+    assert list(frame.columns) == ["name_1", "email_2", "c1", "c7"]
+    assert frame["c7"].dtype == bool and (frame["c1"] >= 0.8).all()
+
+
+def test_flags_round_trip():
+    flags = {
+        c: np.random.default_rng(i).random(50) < 0.5 for i, c in enumerate("c4 c5 c6 c7".split())
+    }
+    packed = pack_flags({"left": np.zeros(50), **flags})
+    assert packed.dtype == np.uint8
+    for column, values in unpack_flags(packed).items():
+        np.testing.assert_array_equal(values, flags[column])
+
+
+def test_empty_store(tmp_path):
+    table = IdentityTable(DEVS[:1])
+    store = write_store(tmp_path / "store", table)
+    assert len(store) == 0 and len(store.column("c1")) == 0
+    assert store.export_csv(tmp_path / "e.csv") == 0
+
+
+def test_export_xlsx_carries_over_labels(tmp_path):
+    table = IdentityTable(DEVS)
+    store = write_store(tmp_path / "store", table)
+    labels = pd.DataFrame(
+        {"pair_key": [pair_key("zq", "zq@example.org", "Zoe Quinn", "ZQ@example.org")]}
+    ).assign(label="TP", reason="same email")
+    store.export_xlsx(tmp_path / "export.xlsx", labels=labels)
+    exported = pd.read_excel(tmp_path / "export.xlsx", keep_default_na=False)
+    assert len(exported) == len(store)
+    labelled = exported[exported["label"] != ""]
+    assert labelled[["name_1", "name_2", "reason"]].values.tolist() == [
+        ["Zoë Quinn", "zq", "same email"]
+    ]
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from script.identity_table import IdentityTable
+from script.pair_writer import PAIR_COLUMNS, write_pair_files, write_threshold_files
+from script.scoring import chunk_rows, iter_scored_chunks
+
+DEVS = [
+    ["David Britch", "david@microsoft.com"],
+    ["David Britch", "d.britch@microsoft.com"],
+    ['Kyle "K" White', "kyle@xamarin.com"],
+    ["Kyle, White", "kwhite@xamarin.com"],
+    ["Zoe Quinn", "zq@example.org"],
+]
+
+
+def test_streamed_files_match_dataframe_to_csv(tmp_path):
+    table = IdentityTable(DEVS)
+    rows = [row for scores in iter_scored_chunks(table) for row in chunk_rows(table, scores)]
+    df = pd.DataFrame(rows, columns=PAIR_COLUMNS)
+    df.to_csv(tmp_path / "expected_full.csv", index=False, header=True)
+    keep = (df["c1"] >= 0.8) | (df["c2"] >= 0.8) | ((df["c3.1"] >= 0.8) & (df["c3.2"] >= 0.8))
+    df[keep].to_csv(tmp_path / "expected_t.csv", index=False, header=True)
+
+    scored, kept = write_pair_files(
+        table,
+        iter_scored_chunks(table, chunk_size=3),
+        0.8,
+        tmp_path / "t.csv",
+        tmp_path / "full.csv",
+    )
+    assert (scored, kept) == (len(df), int(keep.sum()))
+    assert (tmp_path / "full.csv").read_bytes() == (tmp_path / "expected_full.csv").read_bytes()
+    assert (tmp_path / "t.csv").read_bytes() == (tmp_path / "expected_t.csv").read_bytes()
+
+
+def test_without_full_dump_cutoff_chunks_give_same_threshold_file(tmp_path):
+    table = IdentityTable(DEVS)
+    write_pair_files(table, iter_scored_chunks(table), 0.8, tmp_path / "a.csv", tmp_path / "f.csv")
+    write_pair_files(table, iter_scored_chunks(table, cutoff=0.8), 0.8, tmp_path / "b.csv")
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+
+def test_threshold_files_match_separate_runs(tmp_path):
+    table = IdentityTable(DEVS)
+    thresholds = {t: tmp_path / f"sweep_{t}.csv" for t in (0.5, 0.8, 1.0)}
+    # ratios below the lowest t may be dropped before writing
+    _, kept = write_threshold_files(table, iter_scored_chunks(table, cutoff=0.5), thresholds)
+    for t, path in thresholds.items():
+        single = tmp_path / f"single_{t}.csv"
+        assert write_pair_files(table, iter_scored_chunks(table), t, single)[1] == kept[t]
+        assert path.read_bytes() == single.read_bytes()
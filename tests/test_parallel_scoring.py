@@ -0,0 +1,54 @@
+import csv
+from pathlib import Path
+
+from script.identity_table import IdentityTable
+from script.parallel_scoring import iter_scored_chunks_parallel, pair_shards, triangle_shards
+from script.scoring import chunk_rows, iter_scored_chunks
+
+DEVS_CSV = Path(__file__).parent.parent / "project1devs" / "devs.csv"
+
+
+def load_table(count):
+    with open(DEVS_CSV, "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile, delimiter=",")
+        next(reader)  # skip header
+        return IdentityTable(list(reader)[1 : count + 1])
+
+
+def rows_of(table, chunks):
+    return [row for scores in chunks for row in chunk_rows(table, scores)]
+
+
+def test_triangle_shards_cover_all_rows_once():
+    for n, shards in [(2, 4), (10, 3), (100, 8), (101, 1)]:
+        ranges = triangle_shards(n, shards)
+        rows = [i for a, b in ranges for i in range(a, b)]
+        assert rows == list(range(n - 1))
+        assert len(ranges) <= shards
+    assert triangle_shards(1, 4) == []
+
+
+def test_triangle_shards_balance_pairs():
+    n = 400
+    sizes = [sum(n - 1 - i for i in range(a, b)) for a, b in triangle_shards(n, 4)]
+    assert max(sizes) - min(sizes) < n
+
+
+def test_pair_shards_are_contiguous():
+    assert pair_shards(10, 3) == [(0, 4), (4, 8), (8, 10)]
+    assert pair_shards(0, 3) == []
+
+
+def test_parallel_output_identical_to_serial():
+    table = load_table(80)
+    serial = rows_of(table, iter_scored_chunks(table, chunk_size=500))
+    parallel = rows_of(table, iter_scored_chunks_parallel(table, chunk_size=500, workers=2))
+    assert parallel == serial
+
+
+def test_parallel_candidate_pairs_and_cutoff_identical_to_serial():
+    table = load_table(80)
+    pairs = ([0, 0, 3, 10, 20], [1, 5, 7, 11, 79])
+    serial = rows_of(table, iter_scored_chunks(table, pairs, cutoff=0.3))
+    parallel = rows_of(table, iter_scored_chunks_parallel(table, pairs, cutoff=0.3, workers=2))
+    assert parallel == serial
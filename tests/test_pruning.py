@@ -0,0 +1,43 @@
+import numpy as np
+from Levenshtein import ratio as sim
+
+from script.identity_table import IdentityTable
+from script.pruning import BoundsIndex, bounds_for
+from script.scoring import all_pairs, identity_columns, passes, score_batch
+from script.synthetic_identities import generate_identities
+
+
+def test_bounds_are_upper_bounds_of_the_ratio():
+    table = IdentityTable(generate_identities(120, seed=6)[0] + [["", ""], ["Ωmega", "ω@x.org"]])
+    index = BoundsIndex(table)
+    left, right = all_pairs(len(table))
+    for field, strings in enumerate(identity_columns(table)):
+        exact = np.array([sim(strings[a], strings[b]) for a, b in zip(left, right)])
+        bag = index.bag_bound(field, left, right)
+        assert (bag >= exact - 1e-12).all()
+        assert (index.length_bound(field, left, right) >= bag - 1e-12).all()
+
+
+def test_pruning_keeps_every_passing_pair_and_counts_each_bound():
+    table = IdentityTable(generate_identities(300, seed=8)[0])
+    left, right = all_pairs(len(table))
+    full = score_batch(table, left, right, dtype=np.float64)
+    for t in (0.65, 0.8, 1.0):
+        counts = {}
+        keep = bounds_for(table).prune(left, right, t, counts)
+        passing = passes(full["c1"], full["c2"], full["c3.1"], full["c3.2"], t)
+        assert not (passing & ~keep).any()
+        assert counts["length"] + counts["bag"] == len(left) - keep.sum()
+        assert counts["length"] > 0 and counts["bag"] > 0
+
+
+def test_pruned_batch_equals_thresholded_full_batch():
+    table = IdentityTable(generate_identities(300, seed=8)[0])
+    left, right = all_pairs(len(table))
+    full = score_batch(table, left, right, dtype=np.float64)
+    mask = passes(full["c1"], full["c2"], full["c3.1"], full["c3.2"], 0.8)
+    pruned = {}
+    scores = score_batch(table, left, right, 0.8, np.float64, pruned=pruned)
+    for key in ("left", "right", "c1", "c2", "c3.1", "c3.2"):
+        assert np.array_equal(scores[key], full[key][mask])
+    assert sum(pruned.values()) > len(left) // 2
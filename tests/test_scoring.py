@@ -0,0 +1,57 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+from Levenshtein import ratio as sim
+
+from script.identity_table import IdentityTable, score_pair
+from script.scoring import all_pairs, iter_scored_chunks, score_batch, score_rows
+
+DATA = Path(__file__).parent.parent / "project1devs"
+
+
+def load_devs():
+    with open(DATA / "devs.csv", "r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile, delimiter=",")
+        next(reader)  # skip header
+        return list(reader)[1:]  # same rows as project1developers.py
+
+
+def test_batch_matches_per_pair_loop():
+    table = IdentityTable(load_devs()[:150])
+    left, right = all_pairs(len(table))
+    scores = score_batch(table, left, right, dtype=np.float64)
+    for k in range(0, len(left), 97):
+        row = score_pair(table, int(left[k]), int(right[k]), sim)
+        assert [scores[c][k] for c in ("c1", "c2", "c3.1", "c3.2")] == row[4:8]
+
+
+def test_default_dtype_is_float32():
+    table = IdentityTable(load_devs()[:20])
+    scores = score_batch(table, [0, 1], [2, 3])
+    assert scores["c1"].dtype == np.float32
+
+
+def test_triangle_blocks_equal_plain_rows():
+    table = IdentityTable(load_devs()[:120])
+    left, right = all_pairs(len(table))
+    expected = [score_pair(table, a, b, sim) for a, b in zip(left.tolist(), right.tolist())]
+    assert list(score_rows(table, chunk_size=1000)) == expected
+    assert list(score_rows(table, pairs=(left, right), chunk_size=1000)) == expected
+
+
+def test_cutoff_reproduces_shipped_threshold_file():
+    table = IdentityTable(load_devs())
+    rows = list(score_rows(table, cutoff=0.8))
+    with open(DATA / "devs_similarity_t=0.8.csv", "r", newline="", encoding="utf-8") as f:
+        shipped = list(csv.reader(f))[1:]
+    assert len(rows) == len(shipped)
+    for row, expected in zip(rows, shipped):
+        assert [str(v) for v in row] == expected
+
+
+def test_cutoff_on_candidate_pairs_keeps_scores_at_exactly_threshold():
+    # "maks" vs "markus" is exactly 0.8
+    table = IdentityTable([["Maks", "a@x.com"], ["Markus", "zzz@y.com"]])
+    kept = next(iter_scored_chunks(table, pairs=([0], [1]), cutoff=0.8))
+    assert kept["c1"].tolist() == [0.8]
@@ -0,0 +1,75 @@
+import numpy as np
+from Levenshtein import ratio as sim
+
+from script.identity_table import IdentityTable
+from script.scoring import all_pairs, score_batch
+from script.sim_cache import SimilarityCache
+from script.synthetic_identities import generate_identities
+
+
+def test_scores_match_and_pairs_are_order_independent(tmp_path):
+    with SimilarityCache(tmp_path / "sims.sqlite") as cache:
+        got = cache.ratios(["kyle", "white", "kyle"], ["kyle w", "kyle", "white"])
+        assert got.tolist() == [sim("kyle", "kyle w"), sim("white", "kyle"), sim("kyle", "white")]
+        assert cache.stats()["misses"] == 2  # ("kyle", "white") scored once
+        assert cache.sim("white", "kyle") == sim("white", "kyle")
+        assert cache.stats()["hits_memory"] == 1
+
+
+def test_batch_scores_are_unchanged_and_reused_across_runs(tmp_path):
+    table = IdentityTable(generate_identities(150, seed=4)[0])
+    left, right = all_pairs(len(table))
+    expected = score_batch(table, left, right, dtype=np.float64)
+    for run in range(2):
+        with SimilarityCache(tmp_path / "sims.sqlite") as cache:
+            scores = score_batch(table, left, right, dtype=np.float64, cache=cache)
+            stats = cache.stats()
+        for column in ("c1", "c2", "c3.1", "c3.2"):
+            assert np.array_equal(scores[column], expected[column])
+    assert stats["misses"] == 0 and stats["hits_disk"] > 0 and stats["hit_rate"] == 1.0
+
+
+def test_version_change_invalidates(tmp_path):
+    path = tmp_path / "sims.sqlite"
+    with SimilarityCache(path, version="a") as cache:
+        cache.ratios(["ann"], ["anna"])
+    with SimilarityCache(path, version="a") as cache:
+        assert len(cache) == 1 and not cache.invalidated
+    with SimilarityCache(path, version="b") as cache:
+        assert len(cache) == 0 and cache.invalidated
+
+
+def test_size_bound_evicts_least_recently_used_runs(tmp_path):
+    path = tmp_path / "sims.sqlite"
+    with SimilarityCache(path, max_entries=2) as cache:
+        cache.ratios(["a", "b"], ["x", "y"])
+    with SimilarityCache(path, max_entries=2) as cache:
+        cache.ratios(["a"], ["x"])  # used again in this run
+        cache.ratios(["c"], ["z"])
+    assert cache.evicted == 1
+    with SimilarityCache(path, max_entries=2, memory_entries=0) as cache:
+        cache.ratios(["a", "c", "b"], ["x", "z", "y"])
+        assert cache.stats()["hits_disk"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_cutoff_batch_looks_up_before_computing(tmp_path):
+    table = IdentityTable(generate_identities(150, seed=4)[0])
+    left, right = all_pairs(len(table))
+    expected = score_batch(table, left, right, 0.8, np.float64)
+    for run in range(2):
+        with SimilarityCache(tmp_path / "sims.sqlite") as cache:
+            scores = score_batch(table, left, right, 0.8, np.float64, cache=cache)
+            stats = cache.stats()
+        for column in ("left", "right", "c1", "c2", "c3.1", "c3.2"):
+            assert np.array_equal(scores[column], expected[column])
+    assert stats["lookups"] > 0 and stats["misses"] == 0
+
+
+def test_hash_collisions_are_misses(tmp_path, monkeypatch):
+    monkeypatch.setattr("script.sim_cache._digest", lambda key: 7)
+    path = tmp_path / "sims.sqlite"
+    with SimilarityCache(path) as cache:
+        cache.ratios(["ann"], ["anna"])
+    with SimilarityCache(path, memory_entries=0) as cache:
+        assert cache.ratios(["bob"], ["bobby"]).tolist() == [sim("bob", "bobby")]
+        assert cache.stats()["misses"] == 1
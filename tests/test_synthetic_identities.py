@@ -0,0 +1,38 @@
+from script.bench_suite import compare, run_size
+from script.synthetic_identities import NOREPLY_DOMAIN, generate_identities
+
+
+def test_generator_is_deterministic_and_distinct():
+    devs, persons = generate_identities(2000, seed=3)
+    assert devs == generate_identities(2000, seed=3)[0]
+    assert devs != generate_identities(2000, seed=4)[0]
+    assert len(devs) == len(persons) == len({tuple(dev) for dev in devs}) == 2000
+    assert devs == sorted(devs)
+
+
+def test_generator_produces_the_usual_variants():
+    devs, persons = generate_identities(2000)
+    names = [name for name, _ in devs]
+    emails = [email for _, email in devs]
+    assert any(email.endswith("@" + NOREPLY_DOMAIN) for email in emails)
+    assert any("[bot]" in name for name in names)
+    assert any("," in name for name in names)  # "Last, First"
+    assert any(name[1:3] == ". " for name in names)  # initials
+    assert any(not name.isascii() for name in names)  # accents kept
+    assert len(set(persons)) < len(devs)  # several identities per person
+
+
+def test_compare_flags_slower_stages_only():
+    baseline = {"results": [{"size": 10, "stage": "a", "wall_s": 1.0}]}
+    results = [
+        {"size": 10, "stage": "a", "wall_s": 1.2},
+        {"size": 10, "stage": "new", "wall_s": 5.0},
+    ]
+    assert compare(results, baseline, 0.25) == []
+    assert compare(results, baseline, 0.1) == [(10, "a", 1.0, 1.2)]
+
+
+def test_bench_suite_runs_without_candidate_pairs():
+    results = run_size(1, 0, 10)
+    assert {r["stage"]: r["items"] for r in results}["scoring_blocked"] == 0
+    assert results[-1]["stage"] == "clustering"
@@ -0,0 +1,30 @@
+import math
+
+import numpy as np
+
+from script.threshold_sweep import read_labels, sweep_metrics
+
+
+def test_sweep_metrics_match_per_threshold_counts():
+    rng = np.random.default_rng(0)
+    keys = rng.choice([0.6, 0.7, 0.75, 0.8, 0.9, 1.0], 200)
+    is_tp = rng.random(200) < 0.4
+    thresholds = [0.5, 0.7, 0.8, 0.85, 1.0, 1.1]
+    for row, t in zip(sweep_metrics(keys, is_tp, thresholds), thresholds):
+        predicted = keys >= t
+        tp = int((predicted & is_tp).sum())
+        fp = int((predicted & ~is_tp).sum())
+        fn = int((~predicted & is_tp).sum())
+        assert (row["threshold"], row["tp"], row["fp"], row["fn"]) == (t, tp, fp, fn)
+        if tp + fp:
+            assert row["precision"] == tp / (tp + fp)
+        else:
+            assert math.isnan(row["precision"])
+
+
+def test_labelled_set_sweep(tmp_path):
+    keys, is_tp = read_labels("project1devs/devs_similarity_t=0.72_labeled.xlsx", tmp_path)
+    assert (len(keys), int(is_tp.sum())) == (526, 108)
+    at_072, at_08 = sweep_metrics(keys, is_tp, [0.72, 0.8])
+    assert (at_072["tp"], at_072["fp"], at_072["recall"]) == (108, 418, 1.0)
+    assert (at_08["tp"], at_08["fp"], at_08["fn"]) == (102, 282, 6)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from script.normalize import name_tokens
+from script.score_improved_rule import jaccard
+from script.synthetic_identities import generate_identities
+from script.tok_sim import TokenIncidence, tok_sim
+
+NAMES = [
+    "David Britch",
+    "Britch, David",
+    "Dave Britch",
+    "",
+    "   ",
+    "Markus van der Walther",
+    "Walther Markus",
+    "David Britch",
+]
+
+
+def reference(names_1, names_2):
+    return [jaccard(name_tokens(a), name_tokens(b)) for a, b in zip(names_1, names_2)]
+
+
+def test_tok_sim_matches_jaccard_exactly():
+    names = NAMES + [name for name, _ in generate_identities(200, seed=4)[0]]
+    rng = np.random.default_rng(1)
+    left, right = rng.integers(0, len(names), size=(2, 3000))
+    names_1, names_2 = [names[i] for i in left], [names[i] for i in right]
+    expected = reference(names_1, names_2)
+    scores = tok_sim(names_1, names_2)
+    assert scores.dtype == np.float32
+    assert np.array_equal(scores, np.asarray(expected, dtype=np.float32))
+    assert tok_sim(names_1, names_2, dtype=np.float64).tolist() == expected
+
+
+def test_empty_token_sets_score_zero():
+    assert tok_sim(["", "x"], ["  ", ""]).tolist() == [0.0, 0.0]
+    assert tok_sim([], []).shape == (0,)
+
+
+def test_top_k_matches_brute_force():
+    names = NAMES + [name for name, _ in generate_identities(150, seed=5)[0]]
+    incidence = TokenIncidence(names)
+    left, right, scores = incidence.top_k(3, block_rows=16)
+    for a in range(len(names)):
+        ranked = sorted(
+            (-s, b)
+            for b, s in enumerate(reference([names[a]] * len(names), names))
+            if b != a and s > 0
+        )[:3]
+        mine = left == a
+        assert list(zip(right[mine].tolist(), scores[mine].tolist())) == [
+            (b, np.float32(-s).item()) for s, b in ranked
+        ]
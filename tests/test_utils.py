@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
 
-from script.dedupe_utils import email_parts, generic_alias, improved_rule, norm, split_name, surname
+from script.dedupe_utils import (
+    email_parts,
+    generic_alias,
+    improved_rule,
+    improved_rule_vectorized,
+    norm,
+    split_name,
+    surname,
+)
 
 
 def test_norm_accents_and_case():
@@ -69,3 +78,25 @@ def test_improved_rule_rejects_noreply():
     )
     # New rule: hard reject noreply emails (security concern) → False
     assert improved_rule(row) is False
+
+
+def test_improved_rule_vectorized_agrees_with_improved_rule():
+    lab = pd.read_excel("project1devs/devs_similarity_t=0.72_labeled.xlsx", engine="openpyxl")
+    lab = lab[lab["name_1"] != "name_1"]  # first row repeats the header
+    tricky = pd.DataFrame(
+        [
+            ["José Núñez", "jose@acme.io", "Jose Nunez", "jn@acme.io"],
+            ["  ", "a@x.org", "", "a@x.org"],
+            ["A B", "no-at-sign", "C B", "also-none"],
+            ["Dana Scully", "dana@Robotics.com", "Dana Scully", "dana@robotics.com"],
+            ["Eve Adams", "EVE@Example.com", "eve_adams", "eve@example.COM"],
+        ],
+        columns=["name_1", "email_1", "name_2", "email_2"],
+    )
+    df = pd.concat([lab, tricky], ignore_index=True)
+    rng = np.random.default_rng(0)
+    for tok_sim in (None, rng.choice([0.5, 0.7, 0.89, 0.9, 1.0, np.nan], len(df))):
+        if tok_sim is not None:
+            df["tok_sim"] = tok_sim
+        expected = df.apply(improved_rule, axis=1).astype(bool)
+        pd.testing.assert_series_equal(improved_rule_vectorized(df), expected)